@@ -1,9 +1,10 @@
 # streamlit_app.py
 import os
 import io
+import json
 import requests
 import streamlit as st
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Tuple
 from helper import render_files_card, render_files_table
 
 # -----------------------------
@@ -34,16 +35,74 @@ def api_create_project(project_name: str, git_url: Optional[str]) -> dict:
     res.raise_for_status()
     return res.json()
 
+def api_job_events(job_id: str) -> Iterator[Tuple[str, Dict]]:
+    """Yield (event, data) from the job's server-sent event stream."""
+    # Read timeout only bounds the gap between events, not the whole ingest
+    with requests.get(_url(f"/jobs/{job_id}/events"), stream=True, timeout=(10, TIMEOUT)) as res:
+        res.raise_for_status()
+        event, data = "message", []
+        for line in res.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if not line:
+                if data:
+                    yield event, json.loads("\n".join(data))
+                event, data = "message", []
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+
 def api_list_projects() -> List[Dict]:
     res = get_json("/projects")
     res.raise_for_status()
     return res.json()
 
-def api_get_project_files(project_id: str) -> List[Dict]:
-    res = get_json(f"/projects/{project_id}/files")
+def api_get_project_files(project_id: str, cursor: Optional[str] = None, page_size: int = 200) -> Dict:
+    """One cursor page of file names + summaries: {"items": [...], "next_cursor": str | None}."""
+    params = {"limit": page_size}
+    if cursor:
+        params["cursor"] = cursor
+    res = requests.get(_url(f"/projects/{project_id}/files"), params=params, timeout=TIMEOUT)
     res.raise_for_status()
     return res.json()
 
+def load_project_files(project_id: str, more: bool = False) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Files loaded so far for a project, kept in session state so reruns send
+    no requests. The first page is fetched on first use; `more` appends the
+    next one. Returns (files, next_cursor).
+    """
+    cache = st.session_state.setdefault("_files_cache", {})
+    entry = cache.get(project_id)
+    if entry is None:
+        page = api_get_project_files(project_id)
+        entry = cache[project_id] = {"items": page.get("items", []), "next_cursor": page.get("next_cursor")}
+    elif more and entry["next_cursor"]:
+        page = api_get_project_files(project_id, entry["next_cursor"])
+        entry["items"] = entry["items"] + page.get("items", [])
+        entry["next_cursor"] = page.get("next_cursor")
+    return entry["items"], entry["next_cursor"]
+
+def api_search_files(project_id: str, query: str, offset: int = 0, limit: int = 20) -> Dict:
+    """One page of ranked search hits (name, summary, snippet) from the backend index."""
+    params = {"q": query, "offset": offset, "limit": limit}
+    res = requests.get(_url(f"/projects/{project_id}/search"), params=params, timeout=TIMEOUT)
+    res.raise_for_status()
+    return res.json()
+
+def api_get_file_content(project_id: str, file_id: str) -> str:
+    """Fetch one file's code, revalidating the session copy with its ETag."""
+    cache = st.session_state.setdefault("_file_content_cache", {})
+    key = (project_id, file_id)
+    headers = {"If-None-Match": cache[key][0]} if key in cache else {}
+    res = requests.get(_url(f"/projects/{project_id}/files/{file_id}/content"), headers=headers, timeout=TIMEOUT)
+    if res.status_code == 304:
+        return cache[key][1]
+    res.raise_for_status()
+    cache[key] = (res.headers.get("ETag", ""), res.text)
+    return res.text
+
 def api_generate_readme(project_id: str) -> Dict:
     res = get_json(f"/projects/{project_id}/readme")
     res.raise_for_status()
@@ -73,8 +132,35 @@ if submitted:
         try:
             created = api_create_project(project_name.strip(), git_url.strip() or None)
             print(created)
-            st.success(f"Project created: {created.get('project_name', project_name)}")
+            job_id = created.get("job_id")
+            progress = st.progress(0.0, text="Queued…")
+            readme_live = st.empty()
+            streamed: List[str] = []
+            job = {"status": "queued"}
+            stage = "queued"
+            for event, data in (api_job_events(job_id) if job_id else []):
+                if event == "stage":
+                    stage = data.get("stage") or stage
+                    progress.progress(1.0 if stage in ("reduce", "compose") else 0.0, text=stage)
+                elif event == "progress":
+                    total = data.get("total") or 0
+                    done = data.get("done") or 0
+                    label = f"{stage} — {done}/{total} files"
+                    if data.get("path"):
+                        label += f" ({data['path']})"
+                    progress.progress(min(done / total, 1.0) if total else 0.0, text=label)
+                elif event == "token":
+                    streamed.append(data.get("text", ""))
+                    readme_live.markdown("".join(streamed))
+                elif event == "done":
+                    job = data
+            if job.get("status") == "failed":
+                st.error(f"Failed to create project: {job.get('error')}")
+            else:
+                progress.progress(1.0, text="Done")
+                st.success(f"Project created: {created.get('project_name', project_name)}")
             st.session_state["_projects_cache"] = None  # invalidate cache
+            st.session_state["_files_cache"] = {}
         except requests.HTTPError as e:
             msg = e.response.text if e.response is not None else str(e)
             st.error(f"Failed to create project: {msg}")
@@ -89,6 +175,7 @@ with colA:
 
 if "_projects_cache" not in st.session_state or refresh:
     st.session_state["_projects_cache"] = None
+    st.session_state["_files_cache"] = {}
 
 if st.session_state["_projects_cache"] is None:
     try:
@@ -126,7 +213,7 @@ st.subheader("3) Files & Summaries")
 files_placeholder = st.empty()
 
 try:
-    files = api_get_project_files(project_id)
+    files, next_cursor = load_project_files(project_id)
     if not isinstance(files, list):
         raise ValueError("Unexpected response shape for files")
     # if files:
@@ -142,10 +229,15 @@ try:
         st.info("No files found for this project.")
     else:
         view = st.radio("View", options=["Cards", "Table"], horizontal=True)
+        load_content = lambda file_id: api_get_file_content(project_id, file_id)
         if view == "Cards":
-            render_files_card(files)
+            search = lambda q, offset: api_search_files(project_id, q, offset)
+            render_files_card(files, load_content, search)
         else:
-            render_files_table(files)
+            render_files_table(files, load_content)
+        if next_cursor and st.button(f"Load more files ({len(files)} shown)"):
+            load_project_files(project_id, more=True)
+            st.rerun()
     
 except Exception as e:
     files_placeholder.error(f"Failed to load files: {e}")
@@ -1,15 +1,70 @@
 import io
 import pandas as pd
 import streamlit as st
+from typing import Callable
 
-def render_files_card(files: list[dict]):
-    q = st.text_input("Search files", placeholder="type to filter…")
-    if q:
+# Fetches a file's code on demand: file_id -> content
+ContentLoader = Callable[[str], str]
+# Backend full-text search: (query, offset) -> {"items": [...], "next_offset": int | None}
+FileSearcher = Callable[[str, int], dict]
+
+def _render_file_tabs(name: str, summ: str, file_id: str, load_content: ContentLoader, key: str):
+    t1, t2, t3 = st.tabs(["📝 Summary", "💻 Content", "⬇️ Download"])
+    with t1:
+        st.write(summ or "_No summary_")
+    loaded_key = f"_show_content_{key}"
+    with t2:
+        if st.button("Load content", key=f"load_{key}"):
+            st.session_state[loaded_key] = True
+        if st.session_state.get(loaded_key):
+            code = load_content(file_id)
+            lang = "markdown" if name.lower().endswith(".md") else ""
+            st.code(code, language=lang)
+    with t3:
+        if st.session_state.get(loaded_key):
+            st.download_button(
+                "Download file",
+                data=io.BytesIO(load_content(file_id).encode("utf-8")),
+                file_name=name,
+                mime="text/plain",
+                use_container_width=True,
+                key=f"download_{key}",
+            )
+        else:
+            st.caption("Load the content first to download it.")
+
+def _search_offset(q: str) -> int:
+    # Page offsets are remembered per query; a new query starts at the top
+    if st.session_state.get("_search_query") != q:
+        st.session_state["_search_query"] = q
+        st.session_state["_search_offsets"] = [0]
+    return st.session_state["_search_offsets"][-1]
+
+def _render_search_pager(next_offset: int | None):
+    offsets = st.session_state["_search_offsets"]
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if len(offsets) > 1 and st.button("← Previous results", key="search_prev"):
+            offsets.pop()
+            st.rerun()
+    with next_col:
+        if next_offset is not None and st.button("More results →", key="search_next"):
+            offsets.append(next_offset)
+            st.rerun()
+
+def render_files_card(files: list[dict], load_content: ContentLoader, search: FileSearcher | None = None):
+    q = st.text_input("Search files", placeholder="search names, summaries and code…")
+    next_offset = None
+    if q and search is not None:
+        # Ranked hits come from the backend index; no file content is downloaded to filter
+        page = search(q, _search_offset(q))
+        files, next_offset = page.get("items", []), page.get("next_offset")
+    elif q:
         ql = q.lower()
         files = [
             f for f in files
             if any(ql in (f.get(k, "") or "").lower()
-                   for k in ("file_name", "file_content", "file_summary"))
+                   for k in ("file_name", "file_summary"))
         ]
     if not files:
         st.info("No files match your search.")
@@ -18,23 +73,13 @@ def render_files_card(files: list[dict]):
     for i, f in enumerate(files, start=1):
         name = f.get("file_name") or f"file_{i}.txt"
         summ = f.get("file_summary") or ""
-        code = f.get("file_content") or ""
 
         with st.expander(f"📄 {name}", expanded=False):
-            t1, t2, t3 = st.tabs(["📝 Summary", "💻 Content", "⬇️ Download"])
-            with t1:
-                st.write(summ or "_No summary_")
-            with t2:
-                lang = "markdown" if name.lower().endswith(".md") else ""
-                st.code(code, language=lang)
-            with t3:
-                st.download_button(
-                    "Download file",
-                    data=io.BytesIO(code.encode("utf-8")),
-                    file_name=name,
-                    mime="text/plain",
-                    use_container_width=True,
-                )
+            if f.get("snippet"):
+                st.markdown(f["snippet"])
+            _render_file_tabs(name, summ, f.get("file_id"), load_content, key=f"card_{f.get('file_id')}")
+    if q and search is not None:
+        _render_search_pager(next_offset)
 
 def _preview(text: str | None, n: int = 140) -> str:
     if not text:
@@ -42,24 +87,23 @@ def _preview(text: str | None, n: int = 140) -> str:
     text = text.replace("\n", " ")
     return text[:n] + ("…" if len(text) > n else "")
 
-def render_files_table(files: list[dict]):
+def render_files_table(files: list[dict], load_content: ContentLoader):
     if not files:
         st.info("No files found for this project.")
         return
 
     df = pd.DataFrame([
         {
+            "file_id": f.get("file_id"),
             "file_name": f.get("file_name"),
             "summary_preview": _preview(f.get("file_summary")),
-            "content_preview": _preview(f.get("file_content")),
             "file_summary": f.get("file_summary"),
-            "file_content": f.get("file_content"),
         }
         for f in files
     ])
 
     st.dataframe(
-        df[["file_name", "summary_preview", "content_preview"]],
+        df[["file_name", "summary_preview"]],
         use_container_width=True,
         hide_index=True,
     )
@@ -71,16 +115,10 @@ def render_files_table(files: list[dict]):
             format_func=lambda i: df.iloc[i]["file_name"],
         )
         with st.expander(f"View: {df.iloc[idx]['file_name']}", expanded=True):
-            t1, t2, t3 = st.tabs(["📝 Summary", "💻 Content", "⬇️ Download"])
-            with t1:
-                st.write(df.iloc[idx]["file_summary"] or "_No summary_")
-            with t2:
-                st.code(df.iloc[idx]["file_content"] or "", language="")
-            with t3:
-                st.download_button(
-                    "Download file",
-                    data=io.BytesIO((df.iloc[idx]["file_content"] or "").encode("utf-8")),
-                    file_name=df.iloc[idx]["file_name"] or "file.txt",
-                    mime="text/plain",
-                    use_container_width=True,
-                )
\ No newline at end of file
+            _render_file_tabs(
+                df.iloc[idx]["file_name"] or "file.txt",
+                df.iloc[idx]["file_summary"],
+                df.iloc[idx]["file_id"],
+                load_content,
+                key=f"table_{df.iloc[idx]['file_id']}",
+            )
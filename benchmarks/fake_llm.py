@@ -0,0 +1,53 @@
+"""Deterministic stand-in for ChatOpenAI with configurable latency and request accounting."""
+import hashlib
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.llms import LLM
+from pydantic import PrivateAttr
+
+_PATH_LINE = re.compile(r"^PATH: (.+)$", re.MULTILINE)
+
+
+class FakeLLM(LLM):
+    """
+    Returns canned bullet lists derived from a hash of the prompt after
+    sleeping `latency` seconds (plus `per_kchar_latency` per 1,000 prompt
+    characters). Packed multi-file prompts get one `### <path>` section per
+    file, so the real parsing code paths are exercised.
+    """
+
+    latency: float = 0.05
+    per_kchar_latency: float = 0.0
+    model_name: str = "fake-llm"
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _counts: dict = PrivateAttr(default_factory=lambda: {"requests": 0, "prompt_chars": 0, "completion_chars": 0})
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        time.sleep(self.latency + self.per_kchar_latency * len(prompt) / 1000)
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+        bullets = "\n".join(f"- point {digest[i:i + 6]}" for i in range(0, 30, 6))
+        paths = _PATH_LINE.findall(prompt)
+        if len(paths) > 1:
+            text = "\n".join(f"### {p}\n{bullets}" for p in paths)
+        else:
+            text = bullets
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["prompt_chars"] += len(prompt)
+            self._counts["completion_chars"] += len(text)
+        return text
+
+    def reset_counters(self) -> dict:
+        """Return the counts since the last reset and start again from zero."""
+        with self._lock:
+            counts = dict(self._counts)
+            for k in self._counts:
+                self._counts[k] = 0
+        return counts
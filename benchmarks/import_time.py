@@ -0,0 +1,72 @@
+"""
+Import-time budget check for the API process:
+
+    python -m benchmarks.import_time                 # default budget
+    python -m benchmarks.import_time --budget 1.0
+
+Imports `src.main` in a fresh interpreter, fails (exit 1) if that takes
+longer than the budget or if a client SDK that should load lazily (on first
+use / in the FastAPI lifespan) was imported, and prints the slowest imports.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_SECONDS = 2.0
+# Heavy SDKs that must not be imported by `import src.main`
+LAZY_MODULES = ("langchain_openai", "openai", "supabase", "redis", "ijson")
+
+_PROBE = "import json, sys, src.main; print(json.dumps(sorted(sys.modules)))"
+
+
+def measure(module_probe: str = _PROBE):
+    """(wall seconds, imported module names, `-X importtime` lines) for one cold import."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", module_probe],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    timings = [line for line in proc.stderr.splitlines() if line.startswith("import time:")]
+    return elapsed, json.loads(proc.stdout.strip().splitlines()[-1]), timings
+
+
+def slowest(timings, n: int = 10):
+    """Top-level imports with the largest cumulative time, in microseconds."""
+    rows = []
+    for line in timings[1:]:   # first line is the header
+        _, cumulative_us, name = line.split("|", 2)
+        name = name[1:]   # nested imports are indented by two spaces per level
+        if not name.startswith(" "):
+            rows.append((int(cumulative_us), name))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the cold import time of the API")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="seconds allowed")
+    args = parser.parse_args(argv)
+
+    elapsed, modules, timings = measure()
+    eager = [m for m in LAZY_MODULES if m in modules]
+    print(f"import src.main: {elapsed:.2f}s (budget {args.budget:.2f}s), {len(modules)} modules")
+    for us, name in slowest(timings):
+        print(f"  {us / 1e6:6.3f}s  {name}")
+    ok = True
+    if elapsed > args.budget:
+        print("FAIL: import time over budget")
+        ok = False
+    if eager:
+        print(f"FAIL: imported at startup instead of lazily: {', '.join(eager)}")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
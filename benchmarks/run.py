@@ -0,0 +1,167 @@
+"""
+End-to-end pipeline benchmark against a synthetic repo, a deterministic fake
+LLM and a throwaway SQLite store (no network, no API keys).
+
+    python -m benchmarks.run --files 500 --latency 0.05 --save-baseline
+    python -m benchmarks.run --files 500 --latency 0.05 --compare
+
+Stages timed: clone_repo → aggregate_code → parse_blocks → summarize_files
+→ compose_readme. Each stage reports wall time, the process peak RSS so
+far, and the LLM requests and prompt characters it issued.
+"""
+import argparse
+import json
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.utility import llm_util
+from src.utility.file_crawler import aggregate_code
+from src.utility.git import clone_repo
+from src.utility.path import get_agg_file_path, get_git_repo_path, get_mirror_path, get_readme_output_path
+from src.utility.preprocess_file import parse_blocks
+from src.utility.storage.sqlite_store import SqliteStorage
+from src.utility.supabase import database
+from src.utility.supabase.models import Project
+
+from .fake_llm import FakeLLM
+from .synthetic_repo import RepoShape, create_synthetic_repo
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    def __init__(self, llm: FakeLLM):
+        self.llm = llm
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        self.llm.reset_counters()
+        start = time.perf_counter()
+        yield
+        wall = time.perf_counter() - start
+        counts = self.llm.reset_counters()
+        self.stages[name] = {
+            "wall_s": round(wall, 4),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "llm_requests": counts["requests"],
+            "prompt_chars": counts["prompt_chars"],
+        }
+        print(f"  {name:<16} {wall:8.3f}s  rss≤{self.stages[name]['peak_rss_mb']:7.1f}MB  requests={counts['requests']}")
+
+
+def run_benchmark(shape: RepoShape, latency: float, concurrency: int, keep: bool = False) -> dict:
+    project = f"bench-{uuid.uuid4().hex[:8]}"
+    workdir = Path(tempfile.mkdtemp(prefix="readme-bench-"))
+    llm = FakeLLM(latency=latency)
+    timer = StageTimer(llm)
+    # Summaries must come from the fake LLM every run, not from a warm cache
+    llm_util.SUMMARY_CACHE_ENABLED = False
+    database.set_storage(SqliteStorage(workdir / "bench.sqlite3"))
+
+    src_repo = create_synthetic_repo(workdir / "source", shape)
+    git_url = src_repo.as_uri()
+    print(f"Benchmark {project}: {shape.files} files, {shape.notebooks} notebooks, latency={latency}s")
+    try:
+        project_id = database.save_projects(Project(project_name=project))
+        with timer.stage("clone_repo"):
+            clone_repo(git_url, project)
+        with timer.stage("aggregate_code"):
+            files = aggregate_code(project)
+        with timer.stage("parse_blocks"):
+            blocks = parse_blocks(project)
+        with timer.stage("summarize_files"):
+            summary = llm_util.summarize_files(
+                llm, blocks, project, max_concurrency=concurrency, project_id=project_id
+            )
+        with timer.stage("compose_readme"):
+            llm_util.compose_readme(llm, summary)
+    finally:
+        if not keep:
+            shutil.rmtree(get_git_repo_path(project), ignore_errors=True)
+            shutil.rmtree(get_agg_file_path(project).parent, ignore_errors=True)
+            shutil.rmtree(get_readme_output_path(project).parent, ignore_errors=True)
+            shutil.rmtree(get_mirror_path(git_url), ignore_errors=True)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "shape": shape.to_dict(),
+        "latency_s": latency,
+        "concurrency": concurrency,
+        "files_aggregated": files,
+        "blocks": len(blocks),
+        "stages": timer.stages,
+        "total_wall_s": round(sum(s["wall_s"] for s in timer.stages.values()), 4),
+        "total_llm_requests": sum(s["llm_requests"] for s in timer.stages.values()),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print per-stage deltas; return True when any stage regressed beyond `threshold`."""
+    regressed = False
+    print(f"\n{'stage':<16} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for name, cur in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            print(f"{name:<16} {'-':>10} {cur['wall_s']:>10.3f}")
+            continue
+        delta = (cur["wall_s"] - base["wall_s"]) / base["wall_s"] if base["wall_s"] else 0.0
+        # Ignore noise on stages that take only a few milliseconds
+        flag = delta > threshold and cur["wall_s"] - base["wall_s"] > 0.05
+        regressed |= flag
+        print(f"{name:<16} {base['wall_s']:>10.3f} {cur['wall_s']:>10.3f} {delta:>+7.0%}{'  REGRESSION' if flag else ''}")
+    if current["total_llm_requests"] > baseline.get("total_llm_requests", current["total_llm_requests"]):
+        print(f"LLM requests increased: {baseline['total_llm_requests']} → {current['total_llm_requests']}")
+        regressed = True
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--median-bytes", type=int, default=2000)
+    parser.add_argument("--max-depth", type=int, default=4)
+    parser.add_argument("--notebooks", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM seconds per request")
+    parser.add_argument("--concurrency", type=int, default=llm_util.SUMMARY_MAX_CONCURRENCY)
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), default=None)
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), default=None)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown per stage (0.2 = 20%%)")
+    parser.add_argument("--output", help="write this run's JSON result here")
+    parser.add_argument("--keep", action="store_true", help="keep clones and outputs for inspection")
+    args = parser.parse_args(argv)
+
+    shape = RepoShape(
+        files=args.files, median_bytes=args.median_bytes, max_depth=args.max_depth,
+        notebooks=args.notebooks, seed=args.seed,
+    )
+    result = run_benchmark(shape, args.latency, args.concurrency, keep=args.keep)
+    print(f"\nTotal {result['total_wall_s']:.3f}s, {result['total_llm_requests']} LLM requests")
+
+    for target in filter(None, [args.output, args.save_baseline]):
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        Path(target).write_text(json.dumps(result, indent=2))
+        print(f"Saved results to {target}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(result, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
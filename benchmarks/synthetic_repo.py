@@ -0,0 +1,106 @@
+"""Generate synthetic git repositories of a configurable size and shape for benchmarks."""
+import json
+import random
+import subprocess
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List
+
+LANG_EXTS = [".py", ".js", ".ts", ".go", ".java", ".yml", ".sh"]
+
+
+@dataclass
+class RepoShape:
+    files: int = 200
+    median_bytes: int = 2_000          # file sizes follow a log-normal distribution
+    size_sigma: float = 1.2
+    max_bytes: int = 200_000
+    max_depth: int = 4                 # directory nesting
+    fanout: int = 5                    # sub-directories per directory
+    notebooks: int = 5                 # .ipynb files with image/dataframe outputs
+    seed: int = 7
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _python_file(rng: random.Random, size: int, module: str) -> str:
+    lines = [f'"""Synthetic module {module}."""', "import os", "from typing import List", ""]
+    i = 0
+    while sum(len(l) + 1 for l in lines) < size:
+        lines += [
+            f"def func_{i}(items: List[int]) -> int:",
+            f'    """Combine items with factor {rng.randint(1, 99)}."""',
+            "    total = 0",
+            "    for x in items:",
+            f"        total += x * {rng.randint(1, 9)}",
+            "    return total",
+            "",
+        ]
+        i += 1
+    return "\n".join(lines)
+
+
+def _generic_file(rng: random.Random, size: int, ext: str) -> str:
+    comment = "#" if ext in (".py", ".yml", ".sh") else "//"
+    out, i = [], 0
+    while sum(len(l) + 1 for l in out) < size:
+        out.append(f"{comment} line {i} value={rng.random():.6f}")
+        i += 1
+    return "\n".join(out)
+
+
+def _notebook(rng: random.Random) -> str:
+    cells = []
+    for i in range(8):
+        cells.append({"cell_type": "markdown", "metadata": {}, "source": [f"## Step {i}\n", "Explain the analysis.\n"]})
+        cells.append({
+            "cell_type": "code", "execution_count": i, "metadata": {"scrolled": True},
+            "source": [f"df_{i} = load({i})\n", f"df_{i}.describe()\n"],
+            "outputs": [
+                {"output_type": "display_data", "metadata": {},
+                 "data": {"image/png": "iVBORw0KGgo" + "A" * 20_000, "text/plain": ["<Figure>"]}},
+                {"output_type": "execute_result", "execution_count": i, "metadata": {},
+                 "data": {"text/plain": [f"{r} {rng.random():.4f}\n" for r in range(200)]}},
+            ],
+        })
+    return json.dumps({"cells": cells, "metadata": {"kernelspec": {"name": "python3"}}, "nbformat": 4, "nbformat_minor": 5})
+
+
+def _directories(shape: RepoShape, rng: random.Random) -> List[Path]:
+    dirs = [Path("")]
+    frontier = [Path("")]
+    for depth in range(shape.max_depth):
+        nxt = []
+        for d in frontier:
+            for k in range(rng.randint(1, shape.fanout)):
+                child = d / (f"pkg{k}" if depth == 0 else f"mod{depth}_{k}")
+                nxt.append(child)
+        dirs += nxt
+        frontier = nxt
+    return dirs
+
+
+def create_synthetic_repo(dest: Path, shape: RepoShape) -> Path:
+    """Write files per `shape` under `dest`, commit them, and return the repo path."""
+    rng = random.Random(shape.seed)
+    dest.mkdir(parents=True, exist_ok=True)
+    dirs = _directories(shape, rng)
+    for i in range(shape.files):
+        d = rng.choice(dirs)
+        ext = rng.choice(LANG_EXTS)
+        size = min(shape.max_bytes, int(rng.lognormvariate(0, shape.size_sigma) * shape.median_bytes))
+        path = dest / d / f"file_{i}{ext}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = _python_file(rng, size, path.stem) if ext == ".py" else _generic_file(rng, size, ext)
+        path.write_text(body, encoding="utf-8")
+    for i in range(shape.notebooks):
+        path = dest / rng.choice(dirs) / f"analysis_{i}.ipynb"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_notebook(rng), encoding="utf-8")
+
+    git = ["git", "-C", str(dest), "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    subprocess.run(["git", "init", "-q", str(dest)], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "synthetic"], check=True)
+    return dest
@@ -0,0 +1,75 @@
+"""
+Batch ingestion from the command line:
+
+    python -m src.batch repos.json            # [{"project_name": ..., "git_url": ...}, ...]
+    python -m src.batch repos.txt --refresh   # one "<project_name> <git_url>" per line
+    python -m src.batch repos.json --resume   # finish runs interrupted by a crash or outage
+
+Jobs run in this process on the same worker pool and fair LLM scheduler as
+the API; progress and throughput are printed until every job finishes.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from .models.request import RepoRequest
+from .utility.jobs import job_manager
+from .utility.pipeline import ingest_repo, refresh_project, resume_project
+from .utility.workspace import get_workspace_manager
+
+
+def load_repos(path: Path) -> List[RepoRequest]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        return [RepoRequest(**item) for item in json.loads(text)]
+    repos = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            name, url = line.split()[:2]
+            repos.append(RepoRequest(project_name=name, git_url=url))
+    return repos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest many repositories in one batch")
+    parser.add_argument("repos", type=Path, help="JSON list of {project_name, git_url} or a text file of '<name> <url>' lines")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--refresh", action="store_true", help="refresh existing projects instead of a full ingest")
+    mode.add_argument("--resume", action="store_true", help="resume interrupted runs from their checkpoints")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    repos = load_repos(args.repos)
+    # Long batches evict idle clones as they go instead of filling the disk
+    get_workspace_manager().start()
+    kind = "refresh" if args.refresh else "resume" if args.resume else "ingest"
+    run = {"ingest": ingest_repo, "refresh": refresh_project, "resume": resume_project}[kind]
+    batch = job_manager.submit_batch(
+        [(repo.project_name, lambda j, repo=repo: run(j, repo)) for repo in repos],
+        kind=kind,
+    )
+    print(f"Batch {batch.batch_id}: {batch.jobs_total} repos queued")
+    while True:
+        time.sleep(args.interval)
+        batch = job_manager.get_batch(batch.batch_id)
+        print(
+            f"[{batch.elapsed_seconds:7.1f}s] jobs {batch.jobs_succeeded + batch.jobs_failed}/{batch.jobs_total} "
+            f"(running {batch.jobs_running}, failed {batch.jobs_failed}) | "
+            f"files {batch.files_done}/{batch.files_total} ({batch.files_per_second:.1f}/s) | "
+            f"{batch.tokens_per_second:.0f} LLM tokens/s"
+        )
+        if batch.finished_at is not None:
+            break
+    for job_id in batch.job_ids:
+        job = job_manager.get(job_id)
+        if job is not None and job.status == "failed":
+            print(f"  {job.project_name}: {job.error}")
+    return 1 if batch.jobs_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,45 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import gzip
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from .models.request import RepoRequest
-from .utility.git import clone_repo
-from .utility.file_crawler import aggregate_code
-from .utility.preprocess_file import parse_blocks, get_readme_data
-from .utility.llm_util import generate_readme_file
-from .utility.supabase.models import Project
-from .utility.supabase.database import save_projects, save_readme, get_projects_list, get_project_files, get_readme
+from .models.request import BatchRequest, RepoRequest
+from .models.job import BatchStatus, JobStatus
+from .utility.pipeline import ingest_repo, refresh_project, resume_project
+from .utility.checkpoint import list_checkpoints
+from .utility.summary_cache import get_summary_cache
+from .utility.response_cache import response_cache
+from .utility.metrics import render_prometheus
+from .utility.rate_limiter import get_llm_scheduler
+from .utility.retry import get_circuit_breaker
+from .utility.jobs import JobConflict, job_manager
+from .utility.clients import init_clients, close_clients
+from .utility.workspace import get_workspace_manager
+from .utility.supabase.models import ProjectFilePage, FileSearchPage
+from .utility.supabase.database import get_projects_list, list_project_files, get_project_file, get_readme, search_project_files
 
-app = FastAPI()
+SSE_POLL_INTERVAL = 0.1  # seconds between event-log checks per connected client
+FILES_PAGE_DEFAULT = 50
+FILES_PAGE_MAX = 500
+SEARCH_PAGE_DEFAULT = 20
+SEARCH_PAGE_MAX = 100
+GZIP_MIN_BYTES = 1024    # smaller file bodies are sent uncompressed
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are built once here (off the event loop) instead of at import or per request
+    await asyncio.to_thread(init_clients)
+    get_workspace_manager().start()
+    yield
+    get_workspace_manager().stop()
+    close_clients()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # or ["http://localhost:3000"] for now keeping *
@@ -22,34 +52,184 @@ app.add_middleware(
 def home():
     return "The App is up and running"
 
-@app.post("/repo")
+def _submit_job(project_name: str, fn, kind: str = "ingest") -> JobStatus:
+    try:
+        return job_manager.submit(project_name, fn, kind=kind)
+    except JobConflict as e:
+        # The running job shares the clone and checkpoint; follow it instead of racing it
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job.job_id})
+
+@app.post("/repo", status_code=202)
 async def cloneAndGenerate(body: RepoRequest):
     print("body ", body)
-    
-    project = Project(project_name=body.project_name, git_url=body.git_url)
-    # Save the project info to the database.
-    save_projects(project)
-    # Clone the repository
-    clone_repo(body.git_url, body.project_name)
-    # Preprocess and aggregate code files
-    aggregate_code(body.project_name)    
-    ret = generate_readme_file(projectName=body.project_name) 
-    return {'message': "Success", 'isSuccess': True, 'statusCode': 201}
+    job = _submit_job(body.project_name, lambda j: ingest_repo(j, body))
+    return {'message': "Accepted", 'isSuccess': True, 'statusCode': 202, 'job_id': job.job_id}
+
+@app.post("/repo/refresh", status_code=202)
+async def refreshAndGenerate(body: RepoRequest):
+    """Re-ingest an existing project, re-summarizing only files changed since the last run."""
+    print("refresh body ", body)
+    job = _submit_job(body.project_name, lambda j: refresh_project(j, body), kind="refresh")
+    return {'message': "Accepted", 'isSuccess': True, 'statusCode': 202, 'job_id': job.job_id}
+
+@app.post("/repo/resume", status_code=202)
+async def resumeAndGenerate(body: RepoRequest):
+    """Finish an interrupted run, skipping files already summarized before it stopped."""
+    print("resume body ", body)
+    job = _submit_job(body.project_name, lambda j: resume_project(j, body), kind="resume")
+    return {'message': "Accepted", 'isSuccess': True, 'statusCode': 202, 'job_id': job.job_id}
+
+@app.get("/checkpoints")
+async def get_checkpoints():
+    """Projects with an unfinished run that POST /repo/resume can pick up."""
+    return list_checkpoints()
+
+@app.post("/repos/batch", status_code=202)
+async def batchIngest(body: BatchRequest, refresh: bool = False):
+    """Queue an ingest (or refresh) job per repo; follow them with GET /batches/{batch_id}."""
+    run = refresh_project if refresh else ingest_repo
+    batch = job_manager.submit_batch(
+        [(repo.project_name, lambda j, repo=repo: run(j, repo)) for repo in body.repos],
+        kind="refresh" if refresh else "ingest",
+    )
+    return {'message': "Accepted", 'isSuccess': True, 'statusCode': 202, 'batch_id': batch.batch_id, 'job_ids': batch.job_ids}
+
+@app.get("/batches/{batch_id}")
+async def get_batch(batch_id: str) -> BatchStatus:
+    batch = job_manager.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+@app.get("/scheduler")
+async def get_scheduler_stats():
+    """Requests waiting and granted per project in the shared LLM scheduler, and the circuit breaker state."""
+    return {**get_llm_scheduler().stats(), "circuit_breaker": get_circuit_breaker().stats()}
+
+@app.get("/jobs")
+async def list_jobs() -> List[JobStatus]:
+    return job_manager.list()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> JobStatus:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}/trace")
+async def get_job_trace(job_id: str) -> dict:
+    """Per-stage timings and every LLM call (tokens, cost) recorded for a job."""
+    trace = job_manager.trace(job_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return trace
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Server-sent events for a job: `status`, `stage`, `progress` (one per
+    summarized file), `token` (README text as it is generated) and a final
+    `done`. Reconnecting clients resume from the Last-Event-ID header.
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    last_event_id = request.headers.get("last-event-id", "-1")
+    try:
+        start = max(0, int(last_event_id) + 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an event id sent by this stream")
+
+    async def event_stream():
+        index = start
+        while True:
+            events = job_manager.events_since(job_id, index)
+            if events is None:
+                return
+            for name, data in events:
+                yield f"id: {index}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+                index += 1
+                if name == "done":
+                    return
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/projects")
-async def get_all_projects():
+def get_all_projects():
     print("Fetching all projects")
     returnlst = get_projects_list()
     return returnlst
 
 @app.get("/projects/{project_id}/files")
-async def get_file_data(project_id: str):
+def get_file_data(
+    project_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(FILES_PAGE_DEFAULT, ge=1, le=FILES_PAGE_MAX),
+) -> ProjectFilePage:
+    """Names and summaries only; fetch code per file from .../files/{file_id}/content."""
     print("Fetching files for project_id: ", project_id)
-    files = get_project_files(project_id)
-    return files
+    try:
+        return list_project_files(project_id, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/projects/{project_id}/search")
+def search_files(
+    project_id: str,
+    q: str = Query(..., min_length=1),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(SEARCH_PAGE_DEFAULT, ge=1, le=SEARCH_PAGE_MAX),
+) -> FileSearchPage:
+    """Files whose name, summary or content match every word of `q`, best first, with a snippet each."""
+    return search_project_files(project_id, q, offset, limit)
+
+@app.get("/projects/{project_id}/files/{file_id}/content")
+def get_file_content(project_id: str, file_id: str, request: Request):
+    project_file = get_project_file(project_id, file_id)
+    if project_file is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    body = project_file.file_content.encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="text/plain; charset=utf-8", headers=headers)
 
 
 @app.get("/projects/{project_id}/readme")
-async def get_readme_content(project_id: str) -> str:
+def get_readme_content(project_id: str) -> str:
     return get_readme(project_id)
-    
\ No newline at end of file
+
+@app.get("/cache/summaries")
+async def get_summary_cache_stats():
+    return get_summary_cache().stats()
+
+@app.get("/cache/responses")
+async def get_response_cache_stats():
+    return response_cache.stats()
+
+@app.get("/workspace")
+async def get_workspace_stats():
+    """Disk usage and last access per project under src/output, as of the last scan."""
+    return get_workspace_manager().stats()
+
+@app.post("/workspace/reclaim")
+async def reclaim_workspace():
+    """Rescan usage now and evict least recently used clones/aggregates if over quota."""
+    freed = await asyncio.to_thread(get_workspace_manager().reclaim)
+    return {"freed_bytes": freed, **get_workspace_manager().stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of stage, LLM and storage metrics."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class JobStatus(BaseModel):
+    job_id: str
+    project_name: str
+    kind: str = "ingest"
+    status: str = "queued"           # queued | running | succeeded | failed
+    stage: Optional[str] = None      # e.g. clone, aggregate, summarize, compose
+    files_done: int = 0
+    files_total: int = 0
+    error: Optional[str] = None
+    result: Optional[dict] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    batch_id: Optional[str] = None
+
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    job_ids: List[str]
+    created_at: float
+    finished_at: Optional[float] = None
+    jobs_total: int = 0
+    jobs_queued: int = 0
+    jobs_running: int = 0
+    jobs_succeeded: int = 0
+    jobs_failed: int = 0
+    files_done: int = 0
+    files_total: int = 0
+    llm_tokens: int = 0
+    elapsed_seconds: float = 0.0
+    files_per_second: float = 0.0
+    tokens_per_second: float = 0.0
@@ -1,5 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from typing import List
 
 class RepoRequest(BaseModel):
     project_name:str
     git_url:str
+
+    @field_validator("project_name")
+    @classmethod
+    def single_path_segment(cls, v: str) -> str:
+        # The name becomes a directory under src/output/{git,aggregate,readme,checkpoints}
+        v = v.strip()
+        if not v or v in (".", "..") or any(c in v for c in "/\\\0"):
+            raise ValueError("project_name must be a single path segment (no '/', '\\\\', '.' or '..')")
+        return v
+
+class BatchRequest(BaseModel):
+    repos: List[RepoRequest]
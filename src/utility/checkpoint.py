@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .path import get_checkpoint_dir
+
+STATE_FILE = "state.json"
+SUMMARIES_FILE = "summaries.jsonl"
+
+
+class Checkpoint:
+    """
+    Progress of one project's pipeline run, kept under output/checkpoints/<project>.
+    Every finished file summary is appended (and flushed) to summaries.jsonl
+    keyed by its summary-cache key, so a run that crashes or fails can be
+    resumed without paying for those files again; state.json records whether
+    the run is still going or was interrupted. Both are removed once the
+    README is written.
+    """
+
+    def __init__(self, projectName: str, checkpoint_dir: Optional[Path] = None):
+        self.project_name = projectName
+        self.dir = Path(checkpoint_dir) if checkpoint_dir else get_checkpoint_dir() / projectName
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, str] = {}
+        self._file = None
+        self.resumed = 0   # entries loaded from a previous run
+        self._load()
+
+    def _load(self) -> None:
+        path = self.dir / SUMMARIES_FILE
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._summaries[entry["key"]] = entry["summary"]
+                except (ValueError, KeyError):
+                    continue   # torn last line from a killed process
+        self.resumed = len(self._summaries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._summaries.get(key)
+
+    def add(self, key: str, path: str, summary: str) -> None:
+        with self._lock:
+            if self._summaries.get(key) == summary:
+                return
+            self._summaries[key] = summary
+            if self._file is None:
+                self.dir.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.dir / SUMMARIES_FILE, "a", encoding="utf-8")
+            self._file.write(json.dumps({"key": key, "path": path, "summary": summary}) + "\n")
+            self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def mark(self, status: str, error: Optional[str] = None) -> None:
+        """Record the run state ("running" or "interrupted") next to the summaries."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        state = {
+            "project_name": self.project_name,
+            "status": status,
+            "error": error,
+            "pid": os.getpid(),
+            "files_done": len(self),
+            "updated_at": time.time(),
+        }
+        tmp = self.dir / (STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.dir / STATE_FILE)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        """The run finished: drop its checkpoint."""
+        self.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def read_state(projectName: str) -> Optional[dict]:
+    """Saved run state of a project, with a "running" run from a dead process reported as interrupted."""
+    path = get_checkpoint_dir() / projectName / STATE_FILE
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if state.get("status") == "running" and state.get("pid") != os.getpid():
+        state["status"] = "interrupted"
+        state["error"] = state.get("error") or "process exited during the run"
+    return state
+
+
+def list_checkpoints() -> List[dict]:
+    """Every project with a saved (unfinished) run."""
+    root = get_checkpoint_dir()
+    states = []
+    for entry in sorted(root.iterdir()):
+        if entry.is_dir():
+            state = read_state(entry.name)
+            if state is not None:
+                states.append(state)
+    return states
@@ -0,0 +1,89 @@
+import os
+import threading
+
+from .config import LLM_MODEL_NAME, LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_TIMEOUT
+
+_env_loaded = False
+_lock = threading.Lock()
+_http_client = None
+_llm = None
+
+
+def load_env() -> None:
+    """Load .env into os.environ once per process (later calls are no-ops)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def getOpenAIKey():
+    load_env()
+    return os.getenv("OPENAI_API_KEY")
+
+
+def get_http_client():
+    """
+    Keep-alive connection pool shared by every LLM call in the process, sized
+    for all jobs' summary workers so requests reuse warm TLS connections.
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            import httpx
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS,
+                ),
+                timeout=LLM_HTTP_TIMEOUT,
+            )
+        return _http_client
+
+
+def get_llm_client():
+    """The process-wide ChatOpenAI client, created (and its SDK imported) on first use."""
+    global _llm
+    if _llm is not None:
+        return _llm
+    http_client = get_http_client()
+    key = getOpenAIKey()
+    with _lock:
+        if _llm is None:
+            from langchain_openai import ChatOpenAI
+            _llm = ChatOpenAI(
+                model=LLM_MODEL_NAME,
+                api_key=key,
+                temperature=0.3,
+                streaming=True,
+                http_client=http_client,
+                max_retries=0,   # retry.py is the only retry layer (backoff, breaker, metrics)
+            )
+        return _llm
+
+
+def init_clients() -> None:
+    """Create the shared clients up front (called from the FastAPI lifespan)."""
+    from .supabase.database import get_storage
+    try:
+        get_storage()
+    except Exception as e:
+        # Keep serving; the first request that needs storage reports the error
+        print("Storage not initialized at startup:", e)
+    try:
+        get_llm_client()
+    except Exception as e:
+        print("LLM client not initialized at startup:", e)
+
+
+def close_clients() -> None:
+    global _http_client, _llm
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _llm = None
@@ -1,6 +1,51 @@
-# Safety limits to keep prompts small (character-based, coarse control)
-MAX_FILES_TO_SUMMARIZE = 120           # cap number of files summarized
-MAX_CHARS_PER_FILE_SNIPPET = 6000      # truncate each file's content
+# Safety limits to keep prompts small (token-based, measured with the model's tokenizer)
+MAX_FILES_TO_SUMMARIZE = None          # optional cap on files summarized (None = whole repo, no ranking)
+MAX_TOKENS_PER_FILE_SNIPPET = 1500     # truncate each file's content
+
+LLM_MODEL_NAME = "gpt-4o-mini"
+LLM_PROMPT_COST_PER_1K = 0.00015       # USD per 1K prompt tokens (cost estimates only)
+LLM_COMPLETION_COST_PER_1K = 0.0006    # USD per 1K completion tokens
+LLM_HTTP_MAX_CONNECTIONS = 32          # shared keep-alive pool (SUMMARY_MAX_CONCURRENCY x JOB_WORKERS)
+LLM_HTTP_TIMEOUT = 120                 # seconds per LLM HTTP request
+
+# Hierarchical README reduce: file summaries are folded per directory, then per
+# top-level package, until everything fits in one compose prompt
+COMPOSE_TOKEN_BUDGET = 12000           # max summary tokens in any reduce/compose prompt
+
+# Pack small files into one summarization request
+SMALL_FILE_TOKENS = 400                # files at or below this are packable
+PACK_TOKEN_BUDGET = 3000               # max content tokens per packed request
+MAX_FILES_PER_PACK = 12
+
+# Large files are summarized from a skeleton (signatures, docstrings, routes) instead of truncated source
+SKELETON_ENABLED = True                # summarize large files from their structural skeleton
+SKELETON_MIN_TOKENS = 800              # files above this many tokens are skeletonized
+
+# Map-step concurrency and provider rate limits (None/0 disables a limit)
+SUMMARY_MAX_CONCURRENCY = 8            # parallel per-file summary calls
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 200_000
+SUMMARY_COMPLETION_TOKENS = 400        # expected output tokens per file summary
+
+# Transient LLM failures: retries with jittered exponential backoff, plus a
+# circuit breaker that pauses every caller while the provider is degraded
+LLM_MAX_RETRIES = 5                    # retries per call after the first attempt
+LLM_BACKOFF_BASE = 1.0                 # seconds; doubles per attempt (full jitter)
+LLM_BACKOFF_MAX = 60                   # cap on a single backoff sleep
+LLM_BREAKER_FAILURES = 5               # consecutive retryable failures that open the circuit
+LLM_BREAKER_COOLDOWN = 30              # seconds the circuit stays open before a trial call
+LLM_BREAKER_MAX_COOLDOWN = 300         # cooldown doubles on failed trials up to this
+
+# Per-file checkpoints so an interrupted run resumes without redoing finished files
+CHECKPOINT_ENABLED = True
+
+# On-disk per-file summary cache (LRU-evicted once it grows past the bound)
+SUMMARY_CACHE_ENABLED = True
+SUMMARY_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Duplicate detection: one summary per cluster of identical / near-identical files
+DEDUP_ENABLED = True
+DEDUP_NEAR_THRESHOLD = 0.85            # MinHash similarity at which files count as near duplicates
 
 # Configure which file extensions count as "programming language files"
 CODE_EXTS = {
@@ -21,5 +66,41 @@ DEFAULT_EXCLUDE_DIRS = {
     "build", "dist", "target", ".next", ".nuxt", ".pytest_cache", "out", ".toml", ".txt"
 }
 
+# Cloning: the pipeline only reads the working tree, so skip history and unused blobs
+CLONE_DEPTH = 1                        # None for full history
+CLONE_BLOB_FILTER = "blob:none"        # partial clone filter; None to disable
+CLONE_SPARSE = False                   # sparse checkout limited to CODE_EXTS paths
+USE_MIRROR_CACHE = True                # keep a local bare mirror per git_url under output/mirrors
+
+# Crawler
+CRAWL_WORKERS = None                   # threads for directory scans and file reads (None = cores + 4, max 32)
+CRAWL_RESPECT_GITIGNORE = True         # prune paths matched by the repo's .gitignore files
+CRAWL_SNIFF_BYTES = 8192               # header read to detect binary/minified/generated files
+CRAWL_MAX_LINE_LENGTH = 500            # average header line length above which a file counts as minified
+CRAWL_READ_MAX_BYTES = 1024 * 1024     # larger files are read up to this prefix only
+
+# Workspace (src/output): clones and aggregates are LRU-evicted once the quota is
+# exceeded; READMEs, checkpoints and stored summaries are kept
+WORKSPACE_MAX_BYTES = 20 * 1024**3     # quota for per-project output (None disables eviction)
+WORKSPACE_TARGET_RATIO = 0.8           # evict down to this fraction of the quota
+WORKSPACE_RECLAIM_INTERVAL = 300       # seconds between background usage scans
+
+# Streaming pipeline
+WRITE_AGGREGATE_FILE = True            # also write output/aggregate/<project>/aggregated_code.txt
+FILE_SAVE_BATCH_SIZE = 50              # file rows persisted per database write
+
+# Background ingest jobs
+JOB_WORKERS = 4                        # concurrent repo ingests (their LLM calls share one fair scheduler)
+JOB_HISTORY_LIMIT = 200                # finished jobs kept for GET /jobs/{id}
+
+# Database writes: file rows are upserted in chunks bounded by payload size and row count
+DB_WRITE_MAX_BYTES = 2 * 1024 * 1024
+DB_WRITE_MAX_ROWS = 200
+DB_WRITE_CONCURRENCY = 4
+
+# Read-through cache for /projects, file listings and README reads
+RESPONSE_CACHE_TTL = 60                # seconds; writes invalidate sooner
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
 PROJECT_TABLE = "projects"
 PROJECT_FILES_TABLE = "project_files"
\ No newline at end of file
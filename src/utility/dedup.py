@@ -0,0 +1,113 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .config import DEDUP_NEAR_THRESHOLD
+
+SHINGLE_SIZE = 5          # tokens per shingle
+NUM_PERMUTATIONS = 64     # MinHash signature length (bins)
+LSH_BANDS = 16            # NUM_PERMUTATIONS / LSH_BANDS rows per band
+MIN_SHINGLES = 20         # files smaller than this are only matched exactly
+MAX_TOKENS = 20000        # shingle at most this many tokens per file
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_MASK = (1 << 64) - 1
+
+Signature = Tuple[int, ...]
+
+
+def content_hash(code: str) -> str:
+    """Hash of the content with line endings normalized."""
+    return hashlib.sha256(code.replace("\r\n", "\n").encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def minhash_signature(code: str) -> Optional[Signature]:
+    """
+    MinHash over token shingles, or None when the file is too small to compare.
+    One-permutation hashing: each shingle is hashed once and lands in one of
+    NUM_PERMUTATIONS bins, whose minimum is that signature slot; empty bins
+    borrow the next non-empty bin's value (rotation densification). This
+    costs one hash per shingle instead of one per shingle and permutation.
+    """
+    tokens = _TOKEN.findall(code)[:MAX_TOKENS]
+    ids = {t: _token_hash(t) for t in set(tokens)}
+    seq = [ids[t] for t in tokens]
+    # Tuples of ints hash deterministically (no PYTHONHASHSEED salt), so signatures are stable across runs
+    shingles = set(map(hash, zip(*(seq[k:] for k in range(SHINGLE_SIZE)))))
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    bins: List[Optional[int]] = [None] * NUM_PERMUTATIONS
+    for h in shingles:
+        h &= _MASK
+        slot, value = h % NUM_PERMUTATIONS, h // NUM_PERMUTATIONS
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+    signature = []
+    for i in range(NUM_PERMUTATIONS):
+        j = 0
+        while bins[(i + j) % NUM_PERMUTATIONS] is None:
+            j += 1
+        # The offset keeps a borrowed value from matching the same value borrowed over another distance
+        signature.append(bins[(i + j) % NUM_PERMUTATIONS] + j)
+    return tuple(signature)
+
+
+def estimate_similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class DuplicateIndex:
+    """
+    Incremental duplicate detector. The first file of a cluster becomes its
+    representative; later files with identical content (exact) or a MinHash
+    similarity of at least `threshold` (near) are linked to it. Candidates
+    are found through LSH bands, so each check is roughly constant time.
+    """
+
+    def __init__(self, threshold: float = DEDUP_NEAR_THRESHOLD, near: bool = True):
+        self.threshold = threshold
+        self.near = near
+        self._exact: Dict[str, str] = {}                  # content hash -> representative path
+        self._signatures: Dict[str, Signature] = {}
+        self._bands: Dict[Tuple[int, Signature], List[str]] = {}
+        self.links: Dict[str, Tuple[str, bool]] = {}       # duplicate path -> (representative, exact)
+
+    def check(self, path: str, code: str, near: bool = True) -> Optional[Tuple[str, bool]]:
+        """
+        (representative, exact) if `path` duplicates an earlier file, else None
+        (it becomes a representative). With `near=False` only exact copies are
+        looked for and no signature is computed, e.g. when the file's summary
+        is already cached and matching it would save nothing.
+        """
+        digest = content_hash(code)
+        rep = self._exact.get(digest)
+        if rep is not None:
+            self.links[path] = (rep, True)
+            return rep, True
+        self._exact[digest] = path
+        if not (self.near and near):
+            return None
+
+        signature = minhash_signature(code)
+        if signature is None:
+            return None
+        rows = NUM_PERMUTATIONS // LSH_BANDS
+        keys = [(i, signature[i * rows:(i + 1) * rows]) for i in range(LSH_BANDS)]
+        seen = set()
+        for key in keys:
+            for cand in self._bands.get(key, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                if estimate_similarity(signature, self._signatures[cand]) >= self.threshold:
+                    self.links[path] = (cand, False)
+                    return cand, False
+        self._signatures[path] = signature
+        for key in keys:
+            self._bands.setdefault(key, []).append(path)
+        return None
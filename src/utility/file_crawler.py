@@ -1,8 +1,17 @@
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from .config import CODE_EXTS, DEFAULT_EXCLUDE_DIRS
+from .config import (
+    CODE_EXTS, DEFAULT_EXCLUDE_DIRS, CRAWL_WORKERS, CRAWL_RESPECT_GITIGNORE,
+    CRAWL_SNIFF_BYTES, CRAWL_MAX_LINE_LENGTH, CRAWL_READ_MAX_BYTES,
+)
+from .gitignore import GitIgnore, IgnoreChain, is_ignored
+from .notebook import read_notebook
 
 PROJECT_MARKERS = ("pyproject.toml", "setup.cfg", "setup.py", ".git", ".env")
 
@@ -19,67 +28,219 @@ def _sanitize_project_name(name: str) -> str:
     clean = Path(str(name).strip().strip('"\''))  # strip whitespace and quotes
     return clean.name  # last path segment only
 
-def aggregate_code(
-    project_name: str,
-    include_exts: Optional[Set[str]] = None,
-    exclude_dirs: Optional[Set[str]] = None,
-    max_bytes_per_file: Optional[int] = None,
-) -> int:
-    """
-    Read from <root>/output/git/<project_name> and write to
-    <root>/output/aggregate/<project_name>/aggregated_code.txt
-    """
-    project_root = get_project_root()
+def _resolve_repo_dir(project_name: str) -> Path:
     pname = _sanitize_project_name(project_name)
-
-    repo_dir = (project_root / "src" / "output" / "git" / pname).resolve()
-    out_dir  = (project_root / "src" / "output" / "aggregate" / pname).resolve()
-    out_path = out_dir / "aggregated_code.txt"
-
-    # --- helpful debug when things go wrong ---
-    # print(f"[aggregate_code] project_root={project_root}")
-    # print(f"[aggregate_code] project_name(raw)={repr(project_name)}  sanitized={pname}")
-    # print(f"[aggregate_code] repo_dir={repo_dir}  exists={repo_dir.exists()}")
-
+    repo_dir = (get_project_root() / "src" / "output" / "git" / pname).resolve()
     if not repo_dir.exists():
         raise FileNotFoundError(
             f"Repo directory not found: {repo_dir}\n"
             f"Expected structure: output/git/{pname}/\n"
             f"(Got project_name={repr(project_name)} → sanitized={pname})"
         )
+    return repo_dir
+
+def _crawl_workers(workers: Optional[int] = None) -> int:
+    return workers or CRAWL_WORKERS or min(32, (os.cpu_count() or 1) + 4)
 
-    out_dir.mkdir(parents=True, exist_ok=True)
+# Conventional generator headers, only on comment lines: `// Code generated by X. DO NOT EDIT.` (Go),
+# `# Generated by the protocol buffer compiler.  DO NOT EDIT!` (protoc), `@generated` (Meta tooling)
+_GENERATED_HEADER = re.compile(
+    rb"^[ \t]*(?://|#|/?\*+|--|;|<!--)[^\n]*?(?:@generated\b|\b(?i:generated)\b[^\n]*\bDO NOT EDIT\b)",
+    re.MULTILINE,
+)
+_MINIFIED_SUFFIXES = (".min.js", ".min.css", ".min.mjs", ".bundle.js", "-bundle.js", ".chunk.js")
 
-    include_exts = include_exts or CODE_EXTS
+def sniff_file(path: Path, sniff_bytes: int = CRAWL_SNIFF_BYTES) -> Optional[str]:
+    """
+    Read a small header and return why the file should be skipped
+    ("binary", "minified", "generated", "unreadable"), or None to keep it.
+    """
+    name = path.name.lower()
+    if name.endswith(_MINIFIED_SUFFIXES):
+        return "minified"
+    try:
+        with open(path, "rb") as f:
+            head = f.read(sniff_bytes)
+    except OSError:
+        return "unreadable"
+    if b"\0" in head:
+        return "binary"
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the header is fine
+        if e.start < len(head) - 4:
+            return "binary"
+    if _GENERATED_HEADER.search(head[:1024]):
+        return "generated"
+    # Notebooks carry long JSON/output lines; their cells are handled on read
+    if name.endswith(".ipynb"):
+        return None
+    lines = head.count(b"\n") + 1
+    if len(head) >= 1024 and len(head) / lines > CRAWL_MAX_LINE_LENGTH:
+        return "minified"
+    return None
+
+def _scan_dir(
+    dir_path: Path,
+    rel_dir: str,
+    chain: IgnoreChain,
+    include_exts: Set[str],
+    exclude_dirs_lower: Set[str],
+    use_gitignore: bool,
+) -> Tuple[List[Tuple[Path, str, IgnoreChain]], List[Tuple[str, Path, int]]]:
+    """List one directory: (subdirectories to descend into, candidate code files)."""
+    if use_gitignore:
+        ignore = GitIgnore.from_file(dir_path / ".gitignore")
+        if ignore is not None:
+            chain = chain + ((rel_dir, ignore),)
+    subdirs: List[Tuple[Path, str, IgnoreChain]] = []
+    files: List[Tuple[str, Path, int]] = []
+    try:
+        entries = list(os.scandir(dir_path))
+    except OSError:
+        return subdirs, files
+    for entry in entries:
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.lower() in exclude_dirs_lower or is_ignored(chain, rel, True):
+                    continue
+                subdirs.append((Path(entry.path), rel, chain))
+            elif entry.is_file():
+                if os.path.splitext(entry.name)[1].lower() not in include_exts or is_ignored(chain, rel, False):
+                    continue
+                files.append((rel, Path(entry.path), entry.stat().st_size))
+        except OSError:
+            continue
+    return subdirs, files
+
+def collect_code_files(
+    project_name: str,
+    include_exts: Optional[Set[str]] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    max_bytes_per_file: Optional[int] = None,
+    workers: Optional[int] = None,
+    use_gitignore: bool = CRAWL_RESPECT_GITIGNORE,
+) -> List[Tuple[str, Path]]:
+    """
+    Walk <root>/output/git/<project_name> and return (relative posix path,
+    absolute path) for every code file, sorted case-insensitively by path.
+    Directories are scanned in parallel with os.scandir, pruned by
+    DEFAULT_EXCLUDE_DIRS and the repo's .gitignore files; binary, minified
+    and generated files are dropped after sniffing a small header.
+    """
+    repo_dir = _resolve_repo_dir(project_name)
+    include_exts = {e.lower() for e in (include_exts or CODE_EXTS)}
     exclude_dirs = exclude_dirs or DEFAULT_EXCLUDE_DIRS
     exclude_dirs_lower = {d.lower() for d in exclude_dirs}
 
-    files_written = 0
-    candidate_files: list[Path] = []
-
-    for dirpath, dirnames, filenames in os.walk(repo_dir):
-        dirnames[:] = [d for d in dirnames if d.lower() not in exclude_dirs_lower]
-        for fname in filenames:
-            if Path(fname).suffix.lower() in include_exts:
-                candidate_files.append(Path(dirpath) / fname)
+    root_chain: IgnoreChain = ()
+    if use_gitignore:
+        # Repo-local excludes apply like a root .gitignore (loaded before it)
+        info_exclude = GitIgnore.from_file(repo_dir / ".git" / "info" / "exclude")
+        if info_exclude is not None:
+            root_chain = (("", info_exclude),)
+
+    candidates: List[Tuple[str, Path, int]] = []
+    with ThreadPoolExecutor(max_workers=_crawl_workers(workers)) as pool:
+        # Breadth-first: every directory of a level is scanned concurrently
+        level = [(repo_dir, "", root_chain)]
+        while level:
+            scans = list(pool.map(
+                lambda d: _scan_dir(d[0], d[1], d[2], include_exts, exclude_dirs_lower, use_gitignore), level
+            ))
+            level = [sub for subdirs, _ in scans for sub in subdirs]
+            for _, found in scans:
+                candidates.extend(
+                    c for c in found if max_bytes_per_file is None or c[2] <= max_bytes_per_file
+                )
+        verdicts = list(pool.map(lambda c: sniff_file(c[1]), candidates))
+
+    files: List[Tuple[str, Path]] = []
+    skipped: Dict[str, int] = {}
+    for (rel, fpath, _), reason in zip(candidates, verdicts):
+        if reason is None:
+            files.append((rel, fpath))
+        else:
+            skipped[reason] = skipped.get(reason, 0) + 1
+    if skipped:
+        print(f"Crawler skipped {sum(skipped.values())} files: {skipped}")
+    files.sort(key=lambda f: f[0].lower())
+    return files
+
+def read_code_file(fpath: Path, max_bytes: Optional[int] = CRAWL_READ_MAX_BYTES) -> Optional[str]:
+    """
+    File content as text (undecodable bytes dropped); only the first
+    `max_bytes` of larger files are read, since the summarizer sees a few
+    thousand tokens at most. Notebooks are reduced to their markdown and
+    code cells.
+    """
+    if fpath.suffix.lower() == ".ipynb":
+        text = read_notebook(fpath)
+        if text is not None:
+            return text
+    try:
+        with open(fpath, "rb") as f:
+            return f.read(-1 if max_bytes is None else max_bytes).decode("utf-8", errors="ignore")
+    except Exception:
+        return None
+
+def iter_code_blocks(
+    files: Iterable[Tuple[str, Path]],
+    side_output: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Read files on a thread pool and yield (relative path, code) in input
+    order. At most 2 × workers files are held in memory at once. When
+    `side_output` is given, each block is also appended to that aggregate
+    file as it is yielded.
+    """
+    workers = _crawl_workers(workers)
+    out = None
+    if side_output is not None:
+        side_output.parent.mkdir(parents=True, exist_ok=True)
+        out = side_output.open("w", encoding="utf-8", errors="ignore")
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            files_iter = iter(files)
+            while True:
+                for rel, fpath in islice(files_iter, 2 * workers - len(in_flight)):
+                    in_flight.append((rel, pool.submit(read_code_file, fpath)))
+                if not in_flight:
+                    break
+                rel, future = in_flight.popleft()
+                content = future.result()
+                if content is None:
+                    continue
+                if out is not None:
+                    out.write(f"Path - {rel}\n\n")
+                    out.write(content)
+                    if not content.endswith("\n"):
+                        out.write("\n")
+                    out.write("---\n")
+                yield rel, content
+    finally:
+        if out is not None:
+            out.close()
 
-    candidate_files.sort(key=lambda p: str(p.relative_to(repo_dir)).lower())
+def aggregate_code(
+    project_name: str,
+    include_exts: Optional[Set[str]] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    max_bytes_per_file: Optional[int] = None,
+) -> int:
+    """
+    Read from <root>/output/git/<project_name> and write to
+    <root>/output/aggregate/<project_name>/aggregated_code.txt
+    """
+    pname = _sanitize_project_name(project_name)
+    out_path = (get_project_root() / "src" / "output" / "aggregate" / pname).resolve() / "aggregated_code.txt"
 
-    with out_path.open("w", encoding="utf-8", errors="ignore") as out:
-        for fpath in candidate_files:
-            try:
-                if max_bytes_per_file is not None and fpath.stat().st_size > max_bytes_per_file:
-                    continue
-                rel = fpath.relative_to(repo_dir).as_posix()
-                content = fpath.read_text(encoding="utf-8", errors="ignore")
-
-                out.write(f"Path - {rel}\n\n")
-                out.write(content)
-                if not content.endswith("\n"):
-                    out.write("\n")
-                out.write("---\n")
-                files_written += 1
-            except Exception:
-                continue
-
-    return files_written
\ No newline at end of file
+    files = collect_code_files(project_name, include_exts, exclude_dirs, max_bytes_per_file)
+    files_written = 0
+    for _ in iter_code_blocks(files, side_output=out_path):
+        files_written += 1
+    return files_written
@@ -1,15 +1,162 @@
+import shutil
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Set
 from git import Repo
 
-def clone_repo(repo_url: str, project_name: str):
-    base_dir = Path(__file__).resolve().parent.parent  # go up to project root
-    clone_dir = base_dir / "output" / "git" / project_name
-    
-    print("Base dir : ", base_dir)
+from .config import CODE_EXTS, CLONE_DEPTH, CLONE_BLOB_FILTER, CLONE_SPARSE, USE_MIRROR_CACHE
+from .path import get_git_repo_path, get_mirror_path, get_output_dir
+from .workspace import get_workspace_manager
+
+_mirror_locks: Dict[str, threading.Lock] = {}
+_mirror_locks_guard = threading.Lock()
+
+def _mirror_lock(repo_url: str) -> threading.Lock:
+    with _mirror_locks_guard:
+        return _mirror_locks.setdefault(repo_url, threading.Lock())
+
+def _depth_args(depth: Optional[int]) -> List[str]:
+    return [f"--depth={depth}"] if depth else []
+
+def _clone_dir(project_name: str) -> Path:
+    """output/git/<project_name>, refusing names that resolve anywhere else (it may be deleted)."""
+    clone_dir = get_git_repo_path(project_name)
+    if clone_dir.parent != (get_output_dir() / "git").resolve():
+        raise ValueError(f"Invalid project name for a clone directory: {project_name!r}")
+    return clone_dir
+
+def update_mirror(repo_url: str, depth: Optional[int] = CLONE_DEPTH) -> Path:
+    """
+    Create or refresh the local bare mirror for `repo_url` and return its path.
+    Every project cloned from the same URL is then created by a local fetch.
+    The mirror holds only the default branch, at the same depth as the
+    clones, so creating it downloads no more than a direct clone would
+    (no other branches, tags or refs/pull/*). It keeps full blobs for that
+    depth: a blob-filtered mirror could not serve checkouts to its clones.
+    """
+    mirror_dir = get_mirror_path(repo_url)
+    # Pins the mirror to the running job so the workspace manager does not evict it mid-use
+    get_workspace_manager().use_mirror(mirror_dir)
+    with _mirror_lock(repo_url):
+        if mirror_dir.exists():
+            mirror = Repo(str(mirror_dir))
+            branch = mirror.git.symbolic_ref("HEAD")
+            mirror.git.fetch("--prune", *_depth_args(depth), "origin", f"+{branch}:{branch}")
+            print(f"Mirror updated: {mirror_dir}")
+        else:
+            mirror = Repo.clone_from(
+                repo_url, str(mirror_dir), bare=True, single_branch=True, multi_options=_depth_args(depth),
+            )
+            # Let shallow/filtered clones of the mirror negotiate a blob filter
+            with mirror.config_writer() as cw:
+                cw.set_value("uploadpack", "allowFilter", "true")
+            print(f"Mirror created: {mirror_dir}")
+    return mirror_dir
+
+def _sparse_patterns(include_exts: Optional[Set[str]] = None) -> List[str]:
+    # Non-cone patterns without a slash match at any depth
+    return [f"*{ext}" for ext in sorted(include_exts or CODE_EXTS)]
+
+def clone_repo(
+    repo_url: str,
+    project_name: str,
+    depth: Optional[int] = CLONE_DEPTH,
+    blob_filter: Optional[str] = CLONE_BLOB_FILTER,
+    sparse: bool = CLONE_SPARSE,
+    use_mirror: bool = USE_MIRROR_CACHE,
+):
+    """
+    Clone `repo_url` into output/git/<project_name>. By default this is a
+    shallow, blob-filtered clone taken from the local bare-mirror cache;
+    with `sparse` only CODE_EXTS paths are checked out.
+    """
+    clone_dir = _clone_dir(project_name)
     print("Clone dir : ", clone_dir)
 
-    try:
-        Repo.clone_from(repo_url, str(clone_dir))
-        print(f"Repository cloned into {clone_dir}")
-    except Exception as e:
-        print("Error cloning repository:", e)
+    source = repo_url
+    if use_mirror:
+        try:
+            # file:// (not a bare path) so git honours --depth/--filter locally
+            source = update_mirror(repo_url, depth).as_uri()
+        except Exception as e:
+            print("Mirror cache unavailable, cloning directly:", e)
+
+    options = {}
+    if depth:
+        options["depth"] = depth
+    if blob_filter:
+        options["filter"] = blob_filter
+    if sparse:
+        options["sparse"] = True
+
+    repo = Repo.clone_from(source, str(clone_dir), **options)
+    if sparse:
+        repo.git.sparse_checkout("set", "--no-cone", *_sparse_patterns())
+    print(f"Repository cloned into {clone_dir}")
+
+@dataclass
+class RepoChanges:
+    """
+    Result of refreshing a clone. `changed` holds added/modified paths and
+    `deleted` removed ones (repo-relative, posix). When `full` is True the repo
+    was freshly cloned and every file should be treated as changed.
+    """
+    changed: Set[str] = field(default_factory=set)
+    deleted: Set[str] = field(default_factory=set)
+    full: bool = False
+    old_head: Optional[str] = None
+    new_head: Optional[str] = None
+
+    @property
+    def has_changes(self) -> bool:
+        return self.full or bool(self.changed or self.deleted)
+
+def refresh_repo(repo_url: str, project_name: str) -> RepoChanges:
+    """
+    Fetch an existing clone and fast-forward it to the remote HEAD, returning
+    the files that differ between the old and new commits. Clones from
+    scratch when no local copy exists yet, or when the existing clone
+    tracks a different URL (the project was re-registered elsewhere).
+    """
+    clone_dir = _clone_dir(project_name)
+    if (clone_dir / ".git").exists():
+        repo = Repo(str(clone_dir))
+        origin = repo.remotes.origin
+        if origin.url not in (repo_url, get_mirror_path(repo_url).as_uri()):
+            print(f"Clone of {project_name} tracks {origin.url}, re-cloning from {repo_url}")
+            shutil.rmtree(clone_dir)
+    if not (clone_dir / ".git").exists():
+        shutil.rmtree(clone_dir, ignore_errors=True)   # leftovers of a failed clone
+        clone_repo(repo_url, project_name)
+        head = Repo(str(clone_dir)).head.commit.hexsha
+        return RepoChanges(full=True, new_head=head)
+
+    old_commit = repo.head.commit
+    if origin.url.startswith("file://") and get_mirror_path(repo_url).as_uri() == origin.url:
+        update_mirror(repo_url)
+    if CLONE_DEPTH:
+        origin.fetch(depth=CLONE_DEPTH)
+    else:
+        origin.fetch()
+
+    tracking = repo.active_branch.tracking_branch() if not repo.head.is_detached else None
+    new_commit = tracking.commit if tracking is not None else repo.commit("FETCH_HEAD")
+    repo.head.reset(new_commit, index=True, working_tree=True)
+
+    changes = RepoChanges(old_head=old_commit.hexsha, new_head=new_commit.hexsha)
+    if old_commit.hexsha == new_commit.hexsha:
+        return changes
+
+    for d in old_commit.diff(new_commit):
+        if d.change_type == "A":
+            changes.changed.add(d.b_path)
+        elif d.change_type == "D":
+            changes.deleted.add(d.a_path)
+        elif d.change_type == "R":
+            changes.deleted.add(d.a_path)
+            changes.changed.add(d.b_path)
+        else:  # M (modified), T (type change)
+            changes.changed.add(d.b_path or d.a_path)
+    print(f"Refreshed {project_name}: {len(changes.changed)} changed, {len(changes.deleted)} deleted")
+    return changes
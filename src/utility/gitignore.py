@@ -0,0 +1,105 @@
+import re
+from pathlib import Path
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+
+def _translate(pattern: str) -> str:
+    """Translate the glob part of a gitignore pattern into a regex body."""
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape("["))
+                i += 1
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """
+    Rules of one .gitignore file, matched against posix paths relative to
+    the directory holding it. Supports negation (`!`), directory-only rules
+    (trailing `/`), anchoring (a `/` anywhere but the end) and `**`.
+    """
+
+    def __init__(self, lines: Sequence[str]):
+        self.rules: List[Tuple[Pattern[str], bool, bool]] = []   # (regex, negate, dir_only)
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate(line.lstrip("/"))
+            regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+            self.rules.append((re.compile(regex), negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path) -> Optional["GitIgnore"]:
+        try:
+            lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        except OSError:
+            return None
+        ignore = cls(lines)
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a `!` rule, None if no rule applies."""
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+# (directory relative to the repo root, its rules); outer directories first
+IgnoreChain = Tuple[Tuple[str, GitIgnore], ...]
+
+
+def is_ignored(chain: IgnoreChain, rel_path: str, is_dir: bool) -> bool:
+    """Apply every .gitignore from the repo root down; deeper files win."""
+    ignored = False
+    for base, ignore in chain:
+        sub = rel_path[len(base) + 1:] if base else rel_path
+        verdict = ignore.match(sub, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
@@ -0,0 +1,255 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..models.job import BatchStatus, JobStatus
+from .config import JOB_WORKERS, JOB_HISTORY_LIMIT
+from .workspace import get_workspace_manager
+from . import metrics
+
+# (event name, payload)
+JobEvent = Tuple[str, dict]
+
+
+class JobConflict(Exception):
+    """A job for the same project is already queued or running (`job` is its status)."""
+
+    def __init__(self, job: JobStatus):
+        super().__init__(f"A {job.kind} job for {job.project_name} is already {job.status}: {job.job_id}")
+        self.job = job
+
+
+class Job:
+    """
+    Handle passed to a running pipeline so it can report stage and progress.
+    Every update is also appended to the job's event log, which the SSE
+    endpoint replays to clients. Stage transitions are timed into the
+    stage histogram and the job's trace.
+    """
+
+    def __init__(self, status: JobStatus, events: List[JobEvent], lock: threading.Lock):
+        self.status = status
+        self.events = events
+        self.trace = metrics.Trace()
+        self._lock = lock
+        self._stage_started: Optional[Tuple[float, float]] = None  # (wall, perf_counter)
+
+    @property
+    def job_id(self) -> str:
+        return self.status.job_id
+
+    def emit(self, event: str, data: dict) -> None:
+        with self._lock:
+            self.events.append((event, data))
+
+    def set_stage(self, stage: str) -> None:
+        self.end_stage()
+        self._stage_started = (time.time(), time.perf_counter())
+        with self._lock:
+            self.status.stage = stage
+            self.events.append(("stage", {"stage": stage}))
+        print(f"[job {self.job_id}] stage={stage}")
+
+    def end_stage(self) -> None:
+        """Close the timing of the current stage, if any."""
+        if self._stage_started is None or not self.status.stage:
+            return
+        wall, start = self._stage_started
+        duration = time.perf_counter() - start
+        self._stage_started = None
+        metrics.STAGE_SECONDS.observe(duration, stage=self.status.stage, kind=self.status.kind)
+        self.trace.add("stage", wall, duration, stage=self.status.stage)
+
+    def set_progress(self, done: int, total: int, path: Optional[str] = None) -> None:
+        with self._lock:
+            self.status.files_done = done
+            self.status.files_total = total
+            self.events.append(("progress", {"done": done, "total": total, "path": path}))
+
+    def emit_token(self, text: str) -> None:
+        self.emit("token", {"text": text})
+
+
+class JobManager:
+    """
+    In-process job queue: pipelines run on a bounded worker pool so the
+    FastAPI event loop is never blocked by clone/LLM/Supabase calls.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, history_limit: int = JOB_HISTORY_LIMIT):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, JobStatus] = {}
+        self._events: Dict[str, List[JobEvent]] = {}
+        self._traces: Dict[str, metrics.Trace] = {}
+        self._batches: Dict[str, Tuple[float, List[str]]] = {}   # batch_id -> (created_at, job_ids)
+        self._active: Dict[str, str] = {}   # project_name -> id of its queued/running job
+        self._filling: Set[str] = set()      # batches whose jobs are still being submitted
+        self.history_limit = history_limit
+
+    def submit(
+        self,
+        project_name: str,
+        fn: Callable[[Job], Optional[dict]],
+        kind: str = "ingest",
+        batch_id: Optional[str] = None,
+    ) -> JobStatus:
+        """
+        Queue `fn` for the project. Jobs of one project share its clone and
+        checkpoint, so only one may be queued or running at a time: a second
+        submit raises JobConflict carrying the active job.
+        """
+        status = JobStatus(
+            job_id=uuid.uuid4().hex, project_name=project_name, kind=kind, created_at=time.time(),
+            batch_id=batch_id,
+        )
+        events: List[JobEvent] = [("status", {"status": status.status})]
+        with self._lock:
+            active = self._active.get(project_name)
+            if active is not None:
+                raise JobConflict(self._jobs[active].model_copy())
+            self._active[project_name] = status.job_id
+            self._jobs[status.job_id] = status
+            self._events[status.job_id] = events
+            if batch_id is not None:
+                self._batches[batch_id][1].append(status.job_id)
+            self._trim()
+            job = Job(status, events, self._lock)
+            self._traces[status.job_id] = job.trace
+        self._pool.submit(self._run, job, fn)
+        return self.get(status.job_id)
+
+    def submit_batch(self, items: List[Tuple[str, Callable[[Job], Optional[dict]]]], kind: str = "ingest") -> BatchStatus:
+        """
+        Queue one job per (project_name, fn). The jobs run concurrently on the
+        worker pool and their LLM calls share the process-wide fair scheduler.
+        A project that already has an active job (from this batch or not) is
+        tracked through that job instead of getting a second one.
+        """
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._batches[batch_id] = (time.time(), [])
+            self._filling.add(batch_id)
+        try:
+            for project_name, fn in items:
+                try:
+                    self.submit(project_name, fn, kind=kind, batch_id=batch_id)
+                except JobConflict as e:
+                    with self._lock:
+                        job_ids = self._batches[batch_id][1]
+                        if e.job.job_id not in job_ids:
+                            job_ids.append(e.job.job_id)
+        finally:
+            with self._lock:
+                self._filling.discard(batch_id)
+        return self.get_batch(batch_id)
+
+    def get_batch(self, batch_id: str) -> Optional[BatchStatus]:
+        """Aggregate progress and throughput of a batch's jobs."""
+        with self._lock:
+            entry = self._batches.get(batch_id)
+            if entry is None:
+                return None
+            created_at, job_ids = entry[0], list(entry[1])
+            jobs = [self._jobs[j].model_copy() for j in job_ids if j in self._jobs]
+            traces = [self._traces[j] for j in job_ids if j in self._traces]
+        counts = {s: sum(j.status == s for j in jobs) for s in ("queued", "running", "succeeded", "failed")}
+        finished = [j.finished_at for j in jobs if j.finished_at is not None]
+        # Jobs missing from the history were trimmed, which only happens once they finished
+        done = len(finished) + len(job_ids) - len(jobs)
+        if not job_ids:
+            finished_at = created_at
+        else:
+            finished_at = max(finished, default=created_at) if done == len(job_ids) else None
+        elapsed = max(1e-9, (finished_at or time.time()) - created_at)
+        files_done = sum(j.files_done for j in jobs)
+        tokens = 0
+        for trace in traces:
+            t = trace.to_dict()
+            tokens += t["prompt_tokens"] + t["completion_tokens"]
+        return BatchStatus(
+            batch_id=batch_id, job_ids=job_ids, created_at=created_at, finished_at=finished_at,
+            jobs_total=len(job_ids),
+            jobs_queued=counts["queued"], jobs_running=counts["running"],
+            jobs_succeeded=counts["succeeded"], jobs_failed=counts["failed"],
+            files_done=files_done, files_total=sum(j.files_total for j in jobs), llm_tokens=tokens,
+            elapsed_seconds=round(elapsed, 3),
+            files_per_second=round(files_done / elapsed, 3), tokens_per_second=round(tokens / elapsed, 1),
+        )
+
+    def _run(self, job: Job, fn: Callable[[Job], Optional[dict]]) -> None:
+        with self._lock:
+            job.status.status = "running"
+            job.status.started_at = time.time()
+            job.events.append(("status", {"status": "running"}))
+        try:
+            # The lease keeps the project's clone from being evicted while the job uses it
+            with metrics.bind(job.status.project_name, job.trace), get_workspace_manager().lease(job.status.project_name):
+                result = fn(job)
+            with self._lock:
+                job.status.status = "succeeded"
+                job.status.result = result
+        except Exception as e:
+            traceback.print_exc()
+            with self._lock:
+                job.status.status = "failed"
+                job.status.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.end_stage()
+            with self._lock:
+                job.status.finished_at = time.time()
+                if self._active.get(job.status.project_name) == job.status.job_id:
+                    del self._active[job.status.project_name]
+                job.events.append(("done", {
+                    "status": job.status.status, "error": job.status.error, "result": job.status.result,
+                }))
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs once the history grows past the limit; jobs of a
+        # batch that is still running are kept so its progress and counts stay complete
+        in_running_batch = {
+            j for batch_id, (_, job_ids) in self._batches.items()
+            if batch_id in self._filling or any(self._jobs[i].finished_at is None for i in job_ids if i in self._jobs)
+            for j in job_ids
+        }
+        finished = [
+            j for j in self._jobs.values() if j.finished_at is not None and j.job_id not in in_running_batch
+        ]
+        excess = len(self._jobs) - self.history_limit
+        for j in sorted(finished, key=lambda j: j.finished_at)[:max(0, excess)]:
+            del self._jobs[j.job_id]
+            self._events.pop(j.job_id, None)
+            self._traces.pop(j.job_id, None)
+        for batch_id, (_, job_ids) in list(self._batches.items()):
+            if job_ids and not any(j in self._jobs for j in job_ids):
+                del self._batches[batch_id]
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            status = self._jobs.get(job_id)
+            return status.model_copy() if status else None
+
+    def list(self) -> list[JobStatus]:
+        with self._lock:
+            return [j.model_copy() for j in self._jobs.values()]
+
+    def events_since(self, job_id: str, start: int) -> Optional[List[JobEvent]]:
+        """Events from index `start` onward, or None for an unknown job."""
+        with self._lock:
+            events = self._events.get(job_id)
+            return None if events is None else events[start:]
+
+    def trace(self, job_id: str) -> Optional[dict]:
+        """Timed spans (stages, LLM calls, storage writes) recorded for a job."""
+        with self._lock:
+            trace = self._traces.get(job_id)
+            status = self._jobs.get(job_id)
+        if trace is None or status is None:
+            return None
+        return {"job_id": job_id, "project_name": status.project_name, "status": status.status, **trace.to_dict()}
+
+
+job_manager = JobManager()
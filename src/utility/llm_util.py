@@ -1,123 +1,666 @@
-import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from __future__ import annotations
+
+import contextvars
+import re
+from contextlib import contextmanager
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .clients import get_llm_client
 from .supabase.models import ProjectFile, Project
-from .supabase.database import save_files_data, save_readme
+from .supabase.database import (
+    save_files_data, save_readme, get_file_summaries, get_duplicate_links, delete_files_data, delete_all_files_data,
+)
+from .git import RepoChanges
 
-from .config import MAX_CHARS_PER_FILE_SNIPPET, MAX_FILES_TO_SUMMARIZE
-from .preprocess_file import parse_blocks
-from .path import get_readme_output_path
+from .config import (
+    MAX_FILES_TO_SUMMARIZE, SUMMARY_MAX_CONCURRENCY, SUMMARY_COMPLETION_TOKENS,
+    SUMMARY_CACHE_ENABLED, CHECKPOINT_ENABLED, DEDUP_ENABLED, SKELETON_ENABLED, SKELETON_MIN_TOKENS,
+    WRITE_AGGREGATE_FILE, FILE_SAVE_BATCH_SIZE, COMPOSE_TOKEN_BUDGET,
+)
+from .rate_limiter import RateLimiter, get_llm_scheduler
+from .token_budget import SizedBlock, count_tokens, truncate_to_tokens, pack_blocks
+from .summary_cache import SummaryCache, get_summary_cache, summary_cache_key
+from .file_crawler import collect_code_files, iter_code_blocks
+from .dedup import DuplicateIndex
+from .skeleton import SKELETON_VERSION, extract_skeleton
+from .ranking import select_important_blocks, select_important_files
+from .path import get_agg_file_path, get_readme_output_path
+from .retry import call_with_retry
+from .checkpoint import Checkpoint
+from . import metrics
 
-load_dotenv()
+if TYPE_CHECKING:   # the OpenAI SDK is imported lazily, on first use of the client
+    from langchain_openai import ChatOpenAI
 
-def getOpenAIKey():
-    key = os.getenv("OPENAI_API_KEY")
-    return key
-    
+ProgressCallback = Callable[[int, int, Optional[str]], None]   # (files_done, files_total, path just finished)
+StageCallback = Callable[[str], None]
+TokenCallback = Callable[[str], None]
+
+# Bump SUMMARY_PROMPT_VERSION when the wording changes in a way that should
+# invalidate previously cached summaries.
+SUMMARY_PROMPT_VERSION = "3"
+SUMMARY_PROMPT_TEMPLATE = (
+    "You are a precise code summarizer. Summarize the file below for a README.\n"
+    "Focus on: purpose, key responsibilities, important functions/classes/exports, routes/CLI, "
+    "external deps, and how it fits the project. No code snippets.\n"
+    "Large files are shown as a structural skeleton (signatures, docstrings, routes; bodies elided as `...`).\n\n"
+    "PATH: {path}\n"
+    "CONTENT:\n```\n{code}\n```\n\n"
+    "Output 9–10 concise bullet points."
+)
+# Several small files summarized in one request; each answer starts with "### <path>"
+PACKED_SUMMARY_PROMPT_TEMPLATE = (
+    "You are a precise code summarizer. Summarize EACH of the small files below for a README.\n"
+    "Focus on: purpose, key responsibilities, important functions/classes/exports, routes/CLI, "
+    "external deps, and how it fits the project. No code snippets.\n\n"
+    "{files}\n\n"
+    "For every file, output a line `### <PATH>` with the exact path, followed by 3–5 concise bullet points. "
+    "Cover every file, in the order given."
+)
+_PACKED_HEADER = re.compile(r"^###\s+(.+?)\s*$", re.MULTILINE)
+
+def _parse_packed_summaries(text: str) -> Dict[str, str]:
+    """Split a packed response into path -> summary using its ### headers."""
+    matches = list(_PACKED_HEADER.finditer(text))
+    out: Dict[str, str] = {}
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        out[m.group(1).strip("`")] = text[m.end():end].strip()
+    return out
 
 def get_llm_model() -> ChatOpenAI:
-    """Configured LLM client."""
-    key = getOpenAIKey()
-    return ChatOpenAI(
-        model="gpt-4o-mini",
-        api_key=key,
-        temperature=0.3,
-        streaming=False,
+    """Configured LLM client (one shared instance and connection pool per process)."""
+    return get_llm_client()
+
+def _invoke_chain(
+    chain,
+    kind: str,
+    template: str,
+    inputs: dict,
+    on_token: Optional[TokenCallback] = None,
+    limiter: Optional[RateLimiter] = None,
+    tokens: int = 0,
+) -> str:
+    """
+    Run `chain` (streaming into `on_token` when given) and record each
+    attempt's latency, prompt/completion tokens, estimated cost and failure
+    in metrics. Rate limits, timeouts and 5xx errors are retried with
+    backoff (see retry.py); every attempt first takes `tokens` from
+    `limiter`. A stream is only retried if nothing was emitted yet.
+    """
+    prompt_tokens = count_tokens(template.format(**inputs))
+    emitted = False
+
+    def attempt() -> str:
+        nonlocal emitted
+        if limiter is not None:
+            limiter.acquire(tokens)
+        parts: List[str] = []
+        start = time.perf_counter()
+        try:
+            if on_token is None:
+                parts.append(chain.invoke(inputs))
+            else:
+                for chunk in chain.stream(inputs):
+                    parts.append(chunk)
+                    emitted = True
+                    on_token(chunk)
+        except Exception:
+            metrics.record_llm_call(kind, time.perf_counter() - start, prompt_tokens, count_tokens("".join(parts)), ok=False)
+            raise
+        text = "".join(parts)
+        metrics.record_llm_call(kind, time.perf_counter() - start, prompt_tokens, count_tokens(text))
+        return text
+
+    def on_retry(n: int, error: BaseException, delay: float) -> None:
+        metrics.record_retry(kind)
+        print(f"LLM {kind} call failed ({type(error).__name__}: {error}); retry {n} in {delay:.1f}s")
+
+    return call_with_retry(attempt, on_retry=on_retry, can_retry=lambda: not emitted)
+
+def _summary_view(path: str, code: str, n_tokens: int) -> str:
+    """What the summarizer sees: a structural skeleton for large files, the code otherwise."""
+    if SKELETON_ENABLED and n_tokens > SKELETON_MIN_TOKENS:
+        return extract_skeleton(path, code) or code
+    return code
+
+SummaryResult = Tuple[str, str, Optional[str], Optional[str]]   # (path, code, summary, error)
+
+def iter_file_summaries(
+    LLM: ChatOpenAI,
+    blocks: Iterable[Tuple[str, str]],
+    total: Optional[int] = None,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SummaryCache] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    dedup: Optional[DuplicateIndex] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Iterator[SummaryResult]:
+    """
+    Summarize blocks concurrently (bounded by `max_concurrency` and the rate
+    limiter) and yield (path, code, summary, error) in block order; exactly
+    one of summary/error is set. `blocks` may be a lazy generator: at most
+    2 × max_concurrency requests are held in flight at once.
+    Consecutive small files are packed into one request, large files are
+    truncated on token boundaries, and summaries already in the
+    content-addressed cache skip the LLM call. With `dedup`, only the first
+    file of each exact/near-duplicate cluster is summarized and the others
+    reuse its summary (the links are kept in `dedup.links`). Summaries
+    recorded in `checkpoint` by an earlier, interrupted run are reused and
+    new ones are appended to it as they complete.
+    `on_progress(done, total, path)` fires as each file completes.
+    """
+    chain = PromptTemplate.from_template(SUMMARY_PROMPT_TEMPLATE) | LLM | StrOutputParser()
+    packed_chain = PromptTemplate.from_template(PACKED_SUMMARY_PROMPT_TEMPLATE) | LLM | StrOutputParser()
+    limiter = limiter or get_llm_scheduler()
+    if cache is None and SUMMARY_CACHE_ENABLED:
+        cache = get_summary_cache()
+    model_name = getattr(LLM, "model_name", None) or type(LLM).__name__
+    prompt_id = (
+        f"{SUMMARY_PROMPT_VERSION}:{SKELETON_VERSION if SKELETON_ENABLED else '-'}:"
+        f"{SUMMARY_PROMPT_TEMPLATE}:{PACKED_SUMMARY_PROMPT_TEMPLATE}"
     )
 
-def summarize_files(LLM: ChatOpenAI, blocks: List[Tuple[str, str]], projectName: str) -> str:
+    def summarize_single(path: str, code: str, n: int) -> str:
+        snippet = truncate_to_tokens(_summary_view(path, code, n))
+        return _invoke_chain(
+            chain, "file", SUMMARY_PROMPT_TEMPLATE, {"path": path, "code": snippet},
+            limiter=limiter, tokens=count_tokens(snippet) + SUMMARY_COMPLETION_TOKENS,
+        )
+
+    def summarize_pack(pack: List[SizedBlock]) -> Dict[str, str]:
+        files = "\n\n".join(f"PATH: {path}\nCONTENT:\n```\n{code}\n```" for path, code, _ in pack)
+        return _parse_packed_summaries(_invoke_chain(
+            packed_chain, "pack", PACKED_SUMMARY_PROMPT_TEMPLATE, {"files": files},
+            limiter=limiter, tokens=sum(n for _, _, n in pack) + SUMMARY_COMPLETION_TOKENS * len(pack),
+        ))
+
+    def is_saved(code: str) -> bool:
+        key = summary_cache_key(code, prompt_id, model_name)
+        return (checkpoint is not None and checkpoint.get(key) is not None) or (cache is not None and key in cache)
+
+    def summarize_unit(pack: List[SizedBlock]) -> List[Tuple[Optional[str], Optional[str]]]:
+        keys = [summary_cache_key(code, prompt_id, model_name) for _, code, _ in pack]
+        found: Dict[str, str] = {}
+        for (path, _, _), key in zip(pack, keys):
+            saved = checkpoint.get(key) if checkpoint is not None else None
+            if saved is None and cache is not None:
+                saved = cache.get(key)
+            if saved is not None:
+                found[path] = saved
+        todo = [b for b in pack if b[0] not in found]
+        errors: Dict[str, str] = {}
+        if len(todo) > 1:
+            try:
+                found.update({p: v for p, v in summarize_pack(todo).items() if p in {b[0] for b in todo}})
+            except Exception as e:
+                print(f"Packed summary failed for {len(todo)} files, retrying individually: {e}")
+            # Files the packed answer skipped (or a failed pack) fall back to single requests
+            todo = [b for b in todo if b[0] not in found]
+            for _ in todo:
+                metrics.record_retry("pack")
+        for path, code, n in todo:
+            try:
+                found[path] = summarize_single(path, code, n)
+            except Exception as e:
+                print(f"Error summarizing file {path}: {e}")
+                errors[path] = str(e)
+        results = []
+        for (path, _, _), key in zip(pack, keys):
+            if path in found:
+                summary = found[path].strip()
+                if cache is not None:
+                    cache.put(key, summary)
+                if checkpoint is not None:
+                    checkpoint.add(key, path, summary)
+                results.append((summary, None))
+            else:
+                results.append((None, errors.get(path, "no summary returned")))
+        return results
+
+    workers = max(1, max_concurrency)
+    done = 0
+    done_lock = threading.Lock()
+
+    def reporter(pack: List[SizedBlock]):
+        def report(_future) -> None:
+            nonlocal done
+            with done_lock:
+                for path, _, _ in pack:
+                    done += 1
+                    if on_progress is not None:
+                        on_progress(done, total or done, path)
+        return report
+
+    # representative path -> (future of its request, index in that request)
+    rep_loc: Dict[str, Tuple[Future, int]] = {}
+
+    def outcome(future: Future, index: int) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            return future.result()[index]
+        except Exception as e:
+            return None, str(e)
+
+    def drain(entry) -> Iterator[SummaryResult]:
+        pack, future, links = entry
+        index = 0
+        for path, code, _ in pack:
+            if path in links:
+                summary, error = outcome(*rep_loc[links[path]])
+            else:
+                summary, error = outcome(future, index)
+                index += 1
+            yield path, code, summary, error
+
+    if on_progress is not None:
+        on_progress(0, total or 0, None)
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for pack in pack_blocks(blocks):
+            unique: List[SizedBlock] = []
+            links: Dict[str, str] = {}
+            for block in pack:
+                # A file whose summary is already saved costs no request, so skip the MinHash comparison
+                hit = dedup.check(block[0], block[1], near=not is_saved(block[1])) if dedup is not None else None
+                if hit is None:
+                    unique.append(block)
+                else:
+                    links[block[0]] = hit[0]
+            future = None
+            if unique:
+                # Each task runs in a copy of this context so metrics keep the job's project/trace
+                future = pool.submit(contextvars.copy_context().run, summarize_unit, unique)
+                for i, block in enumerate(unique):
+                    rep_loc[block[0]] = (future, i)
+                future.add_done_callback(reporter(unique))
+            for block in pack:
+                if block[0] in links:
+                    # Duplicates complete together with their representative
+                    rep_loc[links[block[0]]][0].add_done_callback(reporter([block]))
+            in_flight.append((pack, future, links))
+            if len(in_flight) >= 2 * workers:
+                yield from drain(in_flight.popleft())
+        while in_flight:
+            yield from drain(in_flight.popleft())
+
+def map_file_summaries(
+    LLM: ChatOpenAI,
+    blocks: List[Tuple[str, str]],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SummaryCache] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    dedup: Optional[DuplicateIndex] = None,
+) -> List[SummaryResult]:
+    """Eager variant of iter_file_summaries for an in-memory list of blocks."""
+    return list(iter_file_summaries(LLM, blocks, len(blocks), max_concurrency, limiter, cache, on_progress, dedup))
+
+def _format_summary(
+    path: str, summary: Optional[str], error: Optional[str] = None, duplicate_of: Optional[str] = None
+) -> str:
+    if duplicate_of is not None:
+        # The representative's section already carries the summary
+        return f"### {path}\n- Same as `{duplicate_of}`.\n"
+    if summary is None:
+        return f"### {path}\n- (summary failed: {error})\n"
+    return f"### {path}\n{summary}\n"
+
+def _summarize_and_save(
+    LLM: ChatOpenAI,
+    blocks: Iterable[Tuple[str, str]],
+    projectName: str,
+    total: Optional[int] = None,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SummaryCache] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    project_id: Optional[str] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """
+    Stream blocks through the summarizer, persisting file rows in batches of
+    FILE_SAVE_BATCH_SIZE so file contents are released as soon as they are
+    stored. Duplicates are linked to their cluster's representative; exact
+    copies are stored without file_content (reads and search resolve it
+    through `duplicate_of`). Returns
+    path -> (summary, error, duplicate_of) in block order.
+    """
+    dedup = DuplicateIndex() if DEDUP_ENABLED else None
+    results: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+    batch: List[ProjectFile] = []
+    for path, code, summary, error in iter_file_summaries(
+        LLM, blocks, total, max_concurrency, limiter, cache, on_progress, dedup, checkpoint
+    ):
+        rep, exact = dedup.links.get(path, (None, False)) if dedup is not None else (None, False)
+        results[path] = (summary, error, rep)
+        if summary is not None:
+            batch.append(ProjectFile(
+                file_name=path, file_content=None if exact else code, file_summary=summary, duplicate_of=rep,
+            ))
+        if len(batch) >= FILE_SAVE_BATCH_SIZE:
+            save_files_data(projectName, batch, project_id=project_id)
+            batch = []
+    if batch:
+        save_files_data(projectName, batch, project_id=project_id)
+    return results
+
+def summarize_files(
+    LLM: ChatOpenAI,
+    blocks: Iterable[Tuple[str, str]],
+    projectName: str,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[SummaryCache] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    total: Optional[int] = None,
+    project_id: Optional[str] = None,
+) -> str:
     """
     Map step: summarize each file briefly to keep context tiny.
+    `blocks` may be a list or a lazy (path, code) generator straight from the
+    crawler; files are summarized concurrently and keep their original order.
+    When a list holds more than MAX_FILES_TO_SUMMARIZE blocks, the most
+    central ones are kept (see ranking.py); a generator is simply cut off.
     Returns a concatenated multi-file summary string.
     """
-    file_level_data = []
-    prompt = PromptTemplate.from_template(
-        "You are a precise code summarizer. Summarize the file below for a README.\n"
-        "Focus on: purpose, key responsibilities, important functions/classes/exports, routes/CLI, "
-        "external deps, and how it fits the project. No code snippets.\n\n"
-        "PATH: {path}\n"
-        "CONTENT:\n```\n{code}\n```\n\n"
-        "Output 9–10 concise bullet points."
+    if isinstance(blocks, list):
+        blocks = select_important_blocks(blocks, MAX_FILES_TO_SUMMARIZE)
+    if total is None and hasattr(blocks, "__len__"):
+        total = len(blocks)
+    if total is not None and MAX_FILES_TO_SUMMARIZE is not None:
+        total = min(total, MAX_FILES_TO_SUMMARIZE)
+    results = _summarize_and_save(
+        LLM, islice(blocks, MAX_FILES_TO_SUMMARIZE), projectName, total,
+        max_concurrency, limiter, cache, on_progress, project_id,
     )
-    chain = prompt | LLM | StrOutputParser()
-
-    summaries: List[str] = []
-    limit = min(MAX_FILES_TO_SUMMARIZE, len(blocks))
-    for i in range(limit):
-        path, code = blocks[i]
-        snippet = code[:MAX_CHARS_PER_FILE_SNIPPET]
-        # print("Summarizing file:", path, len(code))
-        try:
-            s = chain.invoke({"path": path, "code": snippet})
-            summaries.append(f"### {path}\n{s.strip()}\n")
-            project_file = ProjectFile(
-                file_name=path,
-                file_content=code,
-                file_summary=s.strip()
-            )
-            # print("Adding file summary to database: ", project_file)
-            file_level_data.append(project_file)
-        except Exception as e:
-            # Skip problematic files but continue
-            
-            print(f"Error summarizing file {path}: {e}")
-            summaries.append(f"### {path}\n- (summary failed: {e})\n")
-    # print("Saving file-level summaries to database...", file_level_data)
-    save_files_data(projectName, file_level_data)
-    return "\n".join(summaries)
+    return "\n".join(_format_summary(path, *res) for path, res in results.items())
 
-def compose_readme(LLM: ChatOpenAI, multi_file_summary: str) -> str:
+COMPOSE_PROMPT_TEMPLATE = (
+    "You will write a high-quality README.md for a repository using the condensed file summaries below.\n"
+    "Write concise, actionable documentation without large code blocks. Use fenced blocks only for commands.\n\n"
+    "FILE SUMMARIES:\n{summaries}\n\n"
+    "Produce README with these sections (only include a section if relevant):\n"
+    "1. Overview (what it is and why it exists)\n"
+    "2. Tech Stack\n"
+    "3. Project Structure (high-level; list major dirs/files and roles)\n"
+    "4. Key Components/Modules/Database-Schema (what they do)\n"
+    "5. Setup (install) [include information to create virtual env or other way to install the dependency if needed.]\n"
+    "6. Usage (run, CLI or API quickstart; sample commands/endpoints)\n"
+    "7. Configuration (env vars table: NAME | Purpose | Required | Default)\n"
+    "8. Data Model (entities/relations if present)\n"
+    "9. Testing (how to run tests)\n"
+    "10. Deployment (Docker/CI/CD/cloud hints)\n"
+    "11. Roadmap/Limitations\n"
+    "Keep it crisp and dev-friendly."
+)
+
+def compose_readme(LLM: ChatOpenAI, multi_file_summary: str, on_token: Optional[TokenCallback] = None) -> str:
     """
     Reduce + final step: produce a complete README.md
-    from the compact multi-file summary.
-    """
-    final_prompt = PromptTemplate.from_template(
-        "You will write a high-quality README.md for a repository using the condensed file summaries below.\n"
-        "Write concise, actionable documentation without large code blocks. Use fenced blocks only for commands.\n\n"
-        "FILE SUMMARIES:\n{summaries}\n\n"
-        "Produce README with these sections (only include a section if relevant):\n"
-        "1. Overview (what it is and why it exists)\n"
-        "2. Tech Stack\n"
-        "3. Project Structure (high-level; list major dirs/files and roles)\n"
-        "4. Key Components/Modules/Database-Schema (what they do)\n"
-        "5. Setup (install) [include information to create virtual env or other way to install the dependency if needed.]\n"
-        "6. Usage (run, CLI or API quickstart; sample commands/endpoints)\n"
-        "7. Configuration (env vars table: NAME | Purpose | Required | Default)\n"
-        "8. Data Model (entities/relations if present)\n"
-        "9. Testing (how to run tests)\n"
-        "10. Deployment (Docker/CI/CD/cloud hints)\n"
-        "11. Roadmap/Limitations\n"
-        "Keep it crisp and dev-friendly."
-    )
-    chain = final_prompt | LLM | StrOutputParser()
-    return chain.invoke({"summaries": multi_file_summary})
+    from the compact multi-file summary. With `on_token`, the README is
+    streamed and each chunk is passed to the callback as it arrives.
+    """
+    chain = PromptTemplate.from_template(COMPOSE_PROMPT_TEMPLATE) | LLM | StrOutputParser()
+    return _invoke_chain(chain, "compose", COMPOSE_PROMPT_TEMPLATE, {"summaries": multi_file_summary}, on_token)
+
+DIRECTORY_SUMMARY_PROMPT_TEMPLATE = (
+    "You are summarizing one part of a repository for its README.\n"
+    "Below are summaries of the files and sub-directories under `{scope}`.\n\n"
+    "{summaries}\n\n"
+    "Write a concise summary of this part: purpose, main components and how they interact, "
+    "entry points/routes/CLI, and notable external deps. Output 5–8 bullet points. No code snippets."
+)
+
+Section = Tuple[str, str]   # (path or directory, formatted summary text)
+
+def _depth(key: str) -> int:
+    return key.count("/") + 1 if key else 0
+
+def _parent(key: str) -> str:
+    return key.rsplit("/", 1)[0] if "/" in key else ""
 
-def generate_readme_file(projectName: str) -> str:
+def _chunk_sections(sections: List[Section], budget: int) -> List[List[Section]]:
+    """Split sections into consecutive chunks whose text fits `budget` tokens."""
+    chunks: List[List[Section]] = []
+    current: List[Section] = []
+    used = 0
+    for key, text in sections:
+        n = count_tokens(text)
+        if n > budget:
+            text = truncate_to_tokens(text, budget)
+            n = budget
+        if current and used + n > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append((key, text))
+        used += n
+    if current:
+        chunks.append(current)
+    return chunks
+
+def reduce_file_summaries(
+    LLM: ChatOpenAI,
+    sections: List[Section],
+    budget: int = COMPOSE_TOKEN_BUDGET,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
     """
-    Orchestrates the map → reduce → write pipeline.
-    Returns the output README path.
+    Tree-reduce per-file summaries until they fit in one compose prompt.
+    Each round folds the deepest level into directory summaries (all groups
+    of a round run in parallel), so files roll up into their directories,
+    then into top-level packages, then into the repository root. Every
+    reduce prompt stays under `budget` tokens whatever the repo size.
     """
-    LLM = get_llm_model()
-    blocks = parse_blocks(projectName)
-    README_OUTPUT_PATH = get_readme_output_path(projectName)
+    chain = PromptTemplate.from_template(DIRECTORY_SUMMARY_PROMPT_TEMPLATE) | LLM | StrOutputParser()
+    limiter = limiter or get_llm_scheduler()
+
+    def summarize_group(scope: str, chunk: List[Section]) -> Section:
+        text = "\n".join(t for _, t in chunk)
+        try:
+            summary = _invoke_chain(
+                chain, "reduce", DIRECTORY_SUMMARY_PROMPT_TEMPLATE,
+                {"scope": scope or "(repository root)", "summaries": text},
+                limiter=limiter, tokens=count_tokens(text) + SUMMARY_COMPLETION_TOKENS,
+            ).strip()
+        except Exception as e:
+            # Keep going with a truncated view of the group rather than failing the README
+            print(f"Error summarizing directory {scope or '/'}: {e}")
+            summary = truncate_to_tokens(text, SUMMARY_COMPLETION_TOKENS)
+        return scope, f"### {scope or '(root)'}/\n{summary}\n"
+
+    while sections:
+        if count_tokens("\n".join(t for _, t in sections)) <= budget:
+            break
+        max_depth = max(_depth(key) for key, _ in sections)
+
+        # Group the deepest entries under their parent, keeping first-seen order
+        groups: Dict[str, List[Section]] = {}
+        slots: List[object] = []
+        for key, text in sections:
+            if _depth(key) == max_depth:
+                scope = _parent(key) if max_depth > 0 else ""
+                if scope not in groups:
+                    groups[scope] = []
+                    slots.append(scope)   # reduced output goes where the group first appeared
+                groups[scope].append((key, text))
+            else:
+                slots.append((key, text))
+
+        jobs = [(scope, chunk) for scope, items in groups.items() for chunk in _chunk_sections(items, budget)]
+        if max_depth == 0 and len(jobs) == len(sections):
+            # Every root chunk holds a single oversized section; truncation is all that is left
+            return "\n".join(truncate_to_tokens(t, budget // len(sections)) for _, t in sections)
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, summarize_group, *job) for job in jobs]
+            reduced = [f.result() for f in futures]
+        by_scope: Dict[str, List[Section]] = {}
+        for scope, text in reduced:
+            by_scope.setdefault(scope, []).append((scope, text))
 
-    # Map: per-file micro-summaries (bounded by limits above)
-    multi_file_summary = summarize_files(LLM, blocks, projectName)
+        next_sections: List[Section] = []
+        for slot in slots:
+            if isinstance(slot, tuple):
+                next_sections.append(slot)
+            else:
+                next_sections.extend(by_scope[slot])
+        print(f"Reduced {len(sections)} sections to {len(next_sections)} (depth {max_depth})")
+        sections = next_sections
+
+    return "\n".join(t for _, t in sections)
+
+def _write_readme(
+    LLM: ChatOpenAI,
+    projectName: str,
+    multi_file_summary: str,
+    on_stage: Optional[StageCallback] = None,
+    on_token: Optional[TokenCallback] = None,
+) -> str:
+    """Compose the README, save it to the database and write it to disk."""
+    if on_stage is not None:
+        on_stage("compose")
+    README_OUTPUT_PATH = get_readme_output_path(projectName)
 
     # Reduce/final: compose full README from condensed context
-    readme_text = compose_readme(LLM, multi_file_summary)
+    readme_text = compose_readme(LLM, multi_file_summary, on_token)
     
     # Save README to database
     project = Project(project_name=projectName, readme_doc=readme_text)
-    # print("Saving README to database for project:", projectName)
     save_readme(project)
 
     # Write output README
-
     with open(README_OUTPUT_PATH, "w", encoding="utf-8") as outf:
         outf.write(readme_text)
 
-    return README_OUTPUT_PATH
\ No newline at end of file
+    return README_OUTPUT_PATH
+
+@contextmanager
+def _run_checkpoint(projectName: str) -> Iterator[Optional[Checkpoint]]:
+    """
+    Checkpoint for one pipeline run: summaries saved by an interrupted run
+    are reused, the state is marked interrupted if the run fails and the
+    checkpoint is dropped once the README is written.
+    """
+    if not CHECKPOINT_ENABLED:
+        yield None
+        return
+    checkpoint = Checkpoint(projectName)
+    if checkpoint.resumed:
+        print(f"Resuming {projectName}: {checkpoint.resumed} file summaries kept from the interrupted run")
+    checkpoint.mark("running")
+    try:
+        yield checkpoint
+    except BaseException as e:
+        checkpoint.close()
+        checkpoint.mark("interrupted", str(e) or type(e).__name__)
+        raise
+    checkpoint.clear()
+
+def generate_readme_file(
+    projectName: str,
+    project_id: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    on_stage: Optional[StageCallback] = None,
+    on_token: Optional[TokenCallback] = None,
+) -> str:
+    """
+    Orchestrates the crawl → map → reduce → write pipeline.
+    Files stream from the crawler straight into the summarizer; the
+    aggregated_code.txt file (covering the summarized files) is only written
+    as a side output when WRITE_AGGREGATE_FILE is set. Finished file
+    summaries are checkpointed, so running it again after a failure only
+    summarizes the files that were not done.
+    Returns the output README path.
+    """
+    with _run_checkpoint(projectName) as checkpoint:
+        LLM = get_llm_model()
+        if on_stage is not None:
+            on_stage("crawl")
+        files = select_important_files(collect_code_files(projectName), MAX_FILES_TO_SUMMARIZE)
+        side_output = get_agg_file_path(projectName) if WRITE_AGGREGATE_FILE else None
+        blocks = iter_code_blocks(files, side_output=side_output)
+
+        # Map: per-file micro-summaries
+        if on_stage is not None:
+            on_stage("summarize")
+        results = _summarize_and_save(
+            LLM, blocks, projectName, len(files), on_progress=on_progress, project_id=project_id,
+            checkpoint=checkpoint,
+        )
+        # Rows are upserted, so only files that disappeared since the last run need removing
+        gone = set(get_file_summaries(projectName, project_id)) - set(results)
+        delete_files_data(projectName, gone, project_id=project_id)
+
+        # Reduce: fold per-file summaries up the directory tree until they fit
+        if on_stage is not None:
+            on_stage("reduce")
+        sections = [(path, _format_summary(path, *res)) for path, res in results.items()]
+        multi_file_summary = reduce_file_summaries(LLM, sections)
+
+        return _write_readme(LLM, projectName, multi_file_summary, on_stage, on_token)
+
+def refresh_readme_file(
+    projectName: str,
+    changes: RepoChanges,
+    project_id: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    on_stage: Optional[StageCallback] = None,
+    on_token: Optional[TokenCallback] = None,
+) -> Optional[str]:
+    """
+    Incremental variant of generate_readme_file driven by a git diff.
+    Only added/modified files are read and re-summarized; summaries of
+    untouched files are reused from the database and deleted files are dropped.
+    Returns the README path, or None when nothing changed.
+    """
+    if not changes.has_changes:
+        return None
+
+    with _run_checkpoint(projectName) as checkpoint:
+        LLM = get_llm_model()
+        if on_stage is not None:
+            on_stage("crawl")
+        files = select_important_files(collect_code_files(projectName), MAX_FILES_TO_SUMMARIZE)
+        existing = {} if changes.full else get_file_summaries(projectName, project_id)
+        links = {} if changes.full else get_duplicate_links(projectName, project_id)
+
+        removed = set(existing) - {rel for rel, _ in files}  # deleted upstream or no longer crawled
+        # A duplicate shares its representative's summary (and, if exact, its stored content)
+        orphaned = {dup for dup, rep in links.items() if rep in changes.changed or rep in removed}
+        stale = [
+            (rel, fpath) for rel, fpath in files
+            if rel in changes.changed or rel not in existing or rel in orphaned
+        ]
+        if not changes.full and not stale and not removed:
+            # Only non-code files changed; the stored README is still accurate
+            return None
+
+        # Stale rows are overwritten by the upsert below; only vanished files are deleted
+        if changes.full:
+            delete_all_files_data(projectName, project_id)
+        else:
+            delete_files_data(projectName, removed, project_id=project_id)
+
+        if on_stage is not None:
+            on_stage("summarize")
+        fresh = _summarize_and_save(
+            LLM, iter_code_blocks(stale), projectName, len(stale), on_progress=on_progress, project_id=project_id,
+            checkpoint=checkpoint,
+        )
+
+        sections = []
+        for rel, _ in files:
+            if rel in fresh:
+                sections.append((rel, _format_summary(rel, *fresh[rel])))
+            elif rel in existing:
+                sections.append((rel, _format_summary(rel, existing[rel], None, links.get(rel))))
+        if on_stage is not None:
+            on_stage("reduce")
+        return _write_readme(LLM, projectName, reduce_file_summaries(LLM, sections), on_stage, on_token)
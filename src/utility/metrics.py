@@ -0,0 +1,182 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import LLM_PROMPT_COST_PER_1K, LLM_COMPLETION_COST_PER_1K
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for k, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_fmt_labels(k)} {v}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        k = _key(labels)
+        with self._lock:
+            counts, total, n = self._values.get(k) or ([0] * len(self.buckets), 0.0, 0)
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    counts[i] += 1
+            self._values[k] = (counts, total + value, n + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for k, (counts, total, n) in sorted(self._values.items()):
+                for b, c in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_fmt_labels(k, [('le', str(b))])} {c}")
+                lines.append(f"{self.name}_bucket{_fmt_labels(k, [('le', '+Inf')])} {n}")
+                lines.append(f"{self.name}_sum{_fmt_labels(k)} {total}")
+                lines.append(f"{self.name}_count{_fmt_labels(k)} {n}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("readme_pipeline_stage_seconds", "Wall time of each ingest pipeline stage")
+LLM_REQUEST_SECONDS = Histogram("readme_llm_request_seconds", "Latency of a single LLM call")
+LLM_PROMPT_TOKENS = Counter("readme_llm_prompt_tokens_total", "Prompt tokens sent to the LLM")
+LLM_COMPLETION_TOKENS = Counter("readme_llm_completion_tokens_total", "Completion tokens received from the LLM")
+LLM_COST_USD = Counter("readme_llm_cost_usd_total", "Estimated LLM spend in USD")
+LLM_RETRIES = Counter("readme_llm_retries_total", "LLM calls retried (including packed requests split up)")
+LLM_FAILURES = Counter("readme_llm_failures_total", "LLM calls that failed")
+DB_SECONDS = Histogram("readme_db_operation_seconds", "Latency of storage operations")
+
+REGISTRY = [
+    STAGE_SECONDS, LLM_REQUEST_SECONDS, LLM_PROMPT_TOKENS, LLM_COMPLETION_TOKENS,
+    LLM_COST_USD, LLM_RETRIES, LLM_FAILURES, DB_SECONDS,
+]
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Per-job list of timed spans (stages, LLM calls, storage writes)."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._spans: List[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, **attrs) -> None:
+        with self._lock:
+            self._spans.append({
+                "name": name, "start": round(start - self.started_at, 4),
+                "duration": round(duration, 4), **attrs,
+            })
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = list(self._spans)
+        llm = [s for s in spans if s["name"] == "llm"]
+        return {
+            "started_at": self.started_at,
+            "spans": spans,
+            "llm_calls": len(llm),
+            "prompt_tokens": sum(s.get("prompt_tokens", 0) for s in llm),
+            "completion_tokens": sum(s.get("completion_tokens", 0) for s in llm),
+            "cost_usd": round(sum(s.get("cost_usd", 0.0) for s in llm), 6),
+        }
+
+
+# Set per job; worker threads inherit them through contextvars.copy_context()
+_current_project: contextvars.ContextVar[str] = contextvars.ContextVar("current_project", default="")
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def bind(project: str, trace: Optional[Trace] = None) -> Iterator[None]:
+    """Attribute metrics and spans recorded inside the block to `project`/`trace`."""
+    t1 = _current_project.set(project)
+    t2 = _current_trace.set(trace)
+    try:
+        yield
+    finally:
+        _current_project.reset(t1)
+        _current_trace.reset(t2)
+
+
+def current_project() -> str:
+    return _current_project.get()
+
+
+def record_span(name: str, start: float, duration: float, **attrs) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, start, duration, **attrs)
+
+
+@contextmanager
+def timed(histogram: Histogram, span: str, **labels) -> Iterator[None]:
+    start_wall, start = time.time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        histogram.observe(duration, **labels)
+        record_span(span, start_wall, duration, **labels)
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return prompt_tokens / 1000 * LLM_PROMPT_COST_PER_1K + completion_tokens / 1000 * LLM_COMPLETION_COST_PER_1K
+
+
+def record_llm_call(kind: str, duration: float, prompt_tokens: int, completion_tokens: int, ok: bool = True) -> None:
+    project = current_project()
+    cost = estimate_cost(prompt_tokens, completion_tokens)
+    LLM_REQUEST_SECONDS.observe(duration, kind=kind)
+    LLM_PROMPT_TOKENS.inc(prompt_tokens, kind=kind, project=project)
+    LLM_COMPLETION_TOKENS.inc(completion_tokens, kind=kind, project=project)
+    LLM_COST_USD.inc(cost, project=project)
+    if not ok:
+        LLM_FAILURES.inc(kind=kind, project=project)
+    record_span(
+        "llm", time.time() - duration, duration, kind=kind, ok=ok,
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cost_usd=round(cost, 6),
+    )
+
+
+def record_retry(kind: str) -> None:
+    LLM_RETRIES.inc(kind=kind, project=current_project())
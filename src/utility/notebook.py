@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+
+Cell = Tuple[str, str]   # (cell_type, source)
+
+
+def _join_source(source) -> str:
+    return "".join(source) if isinstance(source, list) else (source or "")
+
+
+_ijson = None   # the optional streaming parser, imported on first use (False if not installed)
+
+
+def _load_ijson():
+    global _ijson
+    if _ijson is None:
+        try:
+            import ijson   # optional: streams the JSON so large outputs are never held in memory
+            _ijson = ijson
+        except ImportError:
+            _ijson = False
+    return _ijson or None
+
+
+def _iter_cells_streaming(f: IO[bytes], ijson) -> Iterator[Cell]:
+    """Walk parser events, keeping only cell_type and source; outputs are skipped unbuilt."""
+    cell_type, parts = None, []
+    for prefix, event, value in ijson.parse(f):
+        if prefix == "cells.item" and event == "start_map":
+            cell_type, parts = None, []
+        elif prefix == "cells.item.cell_type":
+            cell_type = value
+        elif prefix in ("cells.item.source", "cells.item.source.item") and event == "string":
+            parts.append(value)
+        elif prefix == "cells.item" and event == "end_map":
+            yield cell_type or "code", "".join(parts)
+
+
+def _iter_cells(nb: dict) -> Iterator[Cell]:
+    if "cells" in nb:   # nbformat 4
+        for cell in nb["cells"]:
+            yield cell.get("cell_type", "code"), _join_source(cell.get("source"))
+        return
+    for sheet in nb.get("worksheets", []):   # nbformat 3
+        for cell in sheet.get("cells", []):
+            kind = cell.get("cell_type", "code")
+            yield kind, _join_source(cell.get("input") if kind == "code" else cell.get("source"))
+
+
+def render_cells(cells: Iterator[Cell]) -> str:
+    """
+    Percent-format text (as used by jupytext): `# %%` before each code cell,
+    `# %% [markdown]` before markdown cells whose lines are commented out.
+    Raw cells and empty cells are dropped.
+    """
+    out: List[str] = []
+    for kind, source in cells:
+        source = source.strip("\n")
+        if not source.strip():
+            continue
+        if kind == "markdown":
+            out.append("# %% [markdown]\n" + "\n".join(f"# {line}".rstrip() for line in source.splitlines()))
+        elif kind == "code":
+            out.append("# %%\n" + source)
+    return "\n\n".join(out) + "\n" if out else ""
+
+
+def notebook_to_text(raw: str) -> Optional[str]:
+    """Markdown and code cells of a notebook given as a JSON string, or None if it is not valid JSON."""
+    try:
+        nb = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(nb, dict):
+        return None
+    return render_cells(_iter_cells(nb))
+
+
+def read_notebook(path: Path) -> Optional[str]:
+    """
+    Read an .ipynb file without outputs or metadata. Uses ijson to stream
+    the file when installed, otherwise parses it with json.
+    """
+    ijson = _load_ijson()
+    if ijson is not None:
+        try:
+            with open(path, "rb") as f:
+                cells = list(_iter_cells_streaming(f, ijson))
+            if cells:
+                return render_cells(iter(cells))
+        except Exception:
+            pass   # malformed for the streaming parser; let json report it
+    # nbformat 3 layout, or no streaming parser available
+    try:
+        with open(path, "rb") as f:
+            return notebook_to_text(f.read().decode("utf-8", errors="ignore"))
+    except OSError:
+        return None
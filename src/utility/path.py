@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional
 from pathlib import Path
 
@@ -27,4 +28,35 @@ def get_readme_output_path(projectName: str):
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / "readme.md"
     return out_path
-    
\ No newline at end of file
+
+def get_summary_cache_dir():
+    project_root = get_project_root()
+    cache_dir = (project_root / "src" / "output" / "cache" / "summaries").resolve()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+def get_mirror_path(gitUrl: str):
+    """Bare mirror cache location for a remote, shared by every project cloned from it."""
+    project_root = get_project_root()
+    key = hashlib.sha1(gitUrl.strip().rstrip("/").encode("utf-8")).hexdigest()
+    mirror_dir = (project_root / "src" / "output" / "mirrors").resolve()
+    mirror_dir.mkdir(parents=True, exist_ok=True)
+    return mirror_dir / f"{key}.git"
+
+def get_sqlite_db_path():
+    project_root = get_project_root()
+    return (project_root / "src" / "output" / "db" / "readme_generator.sqlite3").resolve()
+
+def get_checkpoint_dir():
+    project_root = get_project_root()
+    checkpoint_dir = (project_root / "src" / "output" / "checkpoints").resolve()
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    return checkpoint_dir
+
+def get_output_dir():
+    project_root = get_project_root()
+    return (project_root / "src" / "output").resolve()
+
+def get_workspace_index_path():
+    """Per-project last-access times kept by the workspace manager."""
+    return get_output_dir() / "workspace.json"
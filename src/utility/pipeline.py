@@ -0,0 +1,67 @@
+from ..models.request import RepoRequest
+from .git import clone_repo, refresh_repo
+from .jobs import Job
+from .llm_util import generate_readme_file, refresh_readme_file
+from .checkpoint import read_state
+from .path import get_git_repo_path
+from .supabase.models import Project
+from .supabase.database import save_projects, get_project_id
+
+
+def ingest_repo(job: Job, body: RepoRequest) -> dict:
+    """
+    Job body for a full ingest: register, clone, then crawl → summarize → compose.
+    Re-ingesting a project fast-forwards its existing clone instead of cloning
+    over it; clone or fetch errors fail the job.
+    """
+    project = Project(project_name=body.project_name, git_url=body.git_url)
+    # Save the project info to the database.
+    job.set_stage("register")
+    project_id = save_projects(project)
+    # Clone the repository (or bring an existing clone up to date)
+    job.set_stage("clone")
+    refresh_repo(body.git_url, body.project_name)
+    # Crawl, summarize and compose (code streams straight from the clone)
+    generate_readme_file(
+        projectName=body.project_name, project_id=project_id,
+        on_progress=job.set_progress, on_stage=job.set_stage, on_token=job.emit_token,
+    )
+    return {'message': "Success"}
+
+
+def refresh_project(job: Job, body: RepoRequest) -> dict:
+    """Job body for a refresh: fetch, then re-summarize only what changed."""
+    job.set_stage("register")
+    project_id = get_project_id(body.project_name)
+    if project_id is None:
+        project_id = save_projects(Project(project_name=body.project_name, git_url=body.git_url))
+    job.set_stage("fetch")
+    changes = refresh_repo(body.git_url, body.project_name)
+    if not changes.has_changes:
+        return {'message': "Up to date", 'changed': 0, 'deleted': 0}
+    refresh_readme_file(
+        body.project_name, changes, project_id,
+        on_progress=job.set_progress, on_stage=job.set_stage, on_token=job.emit_token,
+    )
+    return {'message': "Success", 'changed': len(changes.changed), 'deleted': len(changes.deleted)}
+
+
+def resume_project(job: Job, body: RepoRequest) -> dict:
+    """
+    Job body that picks up an interrupted ingest or refresh: the existing
+    clone is reused (cloned again only if it is missing) and files
+    summarized before the interruption come from the project's checkpoint.
+    """
+    state = read_state(body.project_name)
+    job.set_stage("register")
+    project_id = get_project_id(body.project_name)
+    if project_id is None:
+        project_id = save_projects(Project(project_name=body.project_name, git_url=body.git_url))
+    if not get_git_repo_path(body.project_name).exists():
+        job.set_stage("clone")
+        clone_repo(body.git_url, body.project_name)
+    generate_readme_file(
+        projectName=body.project_name, project_id=project_id,
+        on_progress=job.set_progress, on_stage=job.set_stage, on_token=job.emit_token,
+    )
+    return {'message': "Success", 'resumed_files': state["files_done"] if state else 0}
@@ -1,3 +1,4 @@
+import re
 from typing import List, Tuple
 from .path import get_agg_file_path, get_readme_output_path
 
@@ -15,16 +16,25 @@ def get_readme_data(projectName:str) -> str:
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
 
+# A block ends with a "---" line that is immediately followed by the next
+# block's "Path - " header (or the end of the file). Splitting on that pair
+# keeps "---" lines inside YAML/Markdown sources intact.
+_BLOCK_BOUNDARY = re.compile(r"^---\n(?=Path - )", re.MULTILINE)
+_PATH_PREFIX = "Path - "
+
 def parse_blocks(projectName: str) -> List[Tuple[str, str]]:
     """
     Parse aggregated file blocks of the form:
-        <relative/path>
+        Path - <relative/path>
+
         <file contents...>
         ---
     Returns list of (path, code) tuples.
     """
     file_data = get_file_data(projectName)
-    raw_blocks = [b.strip("\n") for b in file_data.split("\n---\n") if b.strip()]
+    if file_data.endswith("---\n"):
+        file_data = file_data[: -len("---\n")]
+    raw_blocks = [b.strip("\n") for b in _BLOCK_BOUNDARY.split(file_data) if b.strip()]
     blocks: List[Tuple[str, str]] = []
     for b in raw_blocks:
         if "\n" not in b:
@@ -32,6 +42,10 @@ def parse_blocks(projectName: str) -> List[Tuple[str, str]]:
             continue
         first_nl = b.find("\n")
         rel_path = b[:first_nl].strip()
+        if rel_path.startswith(_PATH_PREFIX):
+            rel_path = rel_path[len(_PATH_PREFIX):]
         code = b[first_nl + 1 :]
+        if code.startswith("\n"):
+            code = code[1:]
         blocks.append((rel_path, code))
-    return blocks
\ No newline at end of file
+    return blocks
@@ -0,0 +1,245 @@
+import math
+import os
+import posixpath
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .config import CRAWL_WORKERS
+
+RANK_READ_BYTES = 64 * 1024     # imports live near the top; only this much of each file is parsed
+PAGERANK_DAMPING = 0.85
+PAGERANK_ITERATIONS = 30
+
+# Score = weighted centrality + entry-point bonus + size, then scaled down for
+# paths that rarely matter for a README (tests, CI config, docs, examples)
+CENTRALITY_WEIGHT = 0.55
+ENTRY_POINT_WEIGHT = 0.3
+SIZE_WEIGHT = 0.15
+PERIPHERAL_FACTOR = 0.3
+
+ENTRY_POINT_NAMES = {
+    "main.py", "__main__.py", "app.py", "cli.py", "manage.py", "server.py", "wsgi.py", "asgi.py",
+    "main.go", "index.js", "index.ts", "index.jsx", "index.tsx", "main.js", "main.ts",
+    "server.js", "server.ts", "app.js", "app.ts", "main.rs", "lib.rs", "main.java", "application.java",
+}
+_ENTRY_POINT_MARKERS = re.compile(
+    r"if\s+__name__\s*==\s*['\"]__main__['\"]|^func\s+main\s*\(|FastAPI\(|Flask\(|express\(\)|"
+    r"public\s+static\s+void\s+main\s*\(|@SpringBootApplication",
+    re.MULTILINE,
+)
+PERIPHERAL_DIRS = {
+    "test", "tests", "__tests__", "spec", "specs", ".github", ".circleci", "docs", "doc",
+    "example", "examples", "samples", "fixtures", "benchmarks", "bench", "scripts", "migrations",
+}
+_TEST_FILE = re.compile(r"(^test_|_test\.(py|go)$|\.(test|spec)\.[jt]sx?$)")
+
+_PY_IMPORT = re.compile(r"^\s*(?:from\s+(\.*[\w.]*)\s+import\s+([\w*., ()]+)|import\s+([\w., ]+))", re.MULTILINE)
+_JS_IMPORT = re.compile(
+    r"""(?:import\s+(?:[^'";]*?\s+from\s+)?|export\s+[^'";]*?\s+from\s+|require\s*\(\s*|import\s*\(\s*)['"]([^'"]+)['"]"""
+)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\(([^)]*)\)", re.MULTILINE)
+_GO_IMPORT_LINE = re.compile(r"^import\s+(?:\w+\s+)?\"([^\"]+)\"", re.MULTILINE)
+_GO_QUOTED = re.compile(r"\"([^\"]+)\"")
+
+_JS_EXTS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+
+def _read_head(fpath: Path) -> str:
+    try:
+        with open(fpath, "rb") as f:
+            return f.read(RANK_READ_BYTES).decode("utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
+def _python_module(rel: str) -> str:
+    mod = rel[:-3].replace("/", ".")
+    return mod[: -len(".__init__")] if mod.endswith(".__init__") else mod
+
+
+class _Resolver:
+    """Maps import specifiers found in one file to files of the same repo."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = set(paths)
+        # Every dotted suffix of a module, so both `pkg.mod` and `src.pkg.mod` resolve
+        self.py_modules: Dict[str, Set[str]] = {}
+        self.go_dirs: Dict[str, List[str]] = {}
+        for rel in self.paths:
+            if rel.endswith(".py"):
+                parts = _python_module(rel).split(".")
+                for i in range(len(parts)):
+                    self.py_modules.setdefault(".".join(parts[i:]), set()).add(rel)
+            elif rel.endswith(".go") and not rel.endswith("_test.go"):
+                self.go_dirs.setdefault(posixpath.dirname(rel), []).append(rel)
+
+    def python(self, rel: str, text: str) -> Set[str]:
+        out: Set[str] = set()
+        package = posixpath.dirname(rel).replace("/", ".")
+        for m in _PY_IMPORT.finditer(text):
+            if m.group(3):
+                names = [n.strip().split(" as ")[0].strip() for n in m.group(3).split(",")]
+            else:
+                base = m.group(1)
+                if base.startswith("."):
+                    level = len(base) - len(base.lstrip("."))
+                    anchor = package.split(".") if package else []
+                    anchor = anchor[: len(anchor) - (level - 1)] if level > 1 else anchor
+                    base = ".".join(p for p in anchor + [base.lstrip(".")] if p)
+                # `from pkg import mod` may name a submodule rather than an attribute
+                imported = m.group(2).replace("(", " ").replace(")", " ").split(",")
+                names = [base] + [f"{base}.{n.strip().split(' as ')[0]}".strip(".") for n in imported if n.strip()]
+            for name in names:
+                out |= self._resolve_python(name)
+        out.discard(rel)
+        return out
+
+    def _resolve_python(self, name: str) -> Set[str]:
+        parts = name.split(".")
+        while parts:
+            hit = self.py_modules.get(".".join(parts))
+            if hit:
+                return hit
+            parts.pop()
+        return set()
+
+    def javascript(self, rel: str, text: str) -> Set[str]:
+        out: Set[str] = set()
+        here = posixpath.dirname(rel)
+        for m in _JS_IMPORT.finditer(text):
+            spec = m.group(1)
+            if not spec.startswith("."):
+                continue   # package import, not a repo file
+            target = posixpath.normpath(posixpath.join(here, spec))
+            for cand in [target] + [target + e for e in _JS_EXTS] + [f"{target}/index{e}" for e in _JS_EXTS]:
+                if cand in self.paths:
+                    out.add(cand)
+                    break
+        out.discard(rel)
+        return out
+
+    def go(self, rel: str, text: str) -> Set[str]:
+        specs = _GO_IMPORT_LINE.findall(text)
+        for block in _GO_IMPORT_BLOCK.findall(text):
+            specs.extend(_GO_QUOTED.findall(block))
+        out: Set[str] = set()
+        for spec in specs:
+            # A Go package is a directory; match the longest repo dir the import path ends with
+            best = max(
+                (d for d in self.go_dirs if d and (spec == d or spec.endswith("/" + d))),
+                key=len, default=None,
+            )
+            if best is not None:
+                out.update(self.go_dirs[best])
+        out.discard(rel)
+        return out
+
+    def edges(self, rel: str, text: str) -> Set[str]:
+        if rel.endswith(".py"):
+            return self.python(rel, text)
+        if rel.endswith(_JS_EXTS):
+            return self.javascript(rel, text)
+        if rel.endswith(".go"):
+            return self.go(rel, text)
+        return set()
+
+
+def _pagerank(nodes: List[str], edges: Dict[str, Set[str]]) -> Dict[str, float]:
+    n = len(nodes)
+    rank = {v: 1.0 / n for v in nodes}
+    for _ in range(PAGERANK_ITERATIONS):
+        dangling = sum(rank[v] for v in nodes if not edges.get(v))
+        nxt = {v: (1 - PAGERANK_DAMPING) / n + PAGERANK_DAMPING * dangling / n for v in nodes}
+        for v in nodes:
+            targets = edges.get(v)
+            if targets:
+                share = PAGERANK_DAMPING * rank[v] / len(targets)
+                for t in targets:
+                    nxt[t] += share
+        rank = nxt
+    return rank
+
+
+def _is_peripheral(rel: str) -> bool:
+    parts = rel.lower().split("/")
+    return any(p in PERIPHERAL_DIRS for p in parts[:-1]) or bool(_TEST_FILE.search(parts[-1]))
+
+
+def _score(nodes: List[str], heads: List[str], sizes: Dict[str, int]) -> List[Tuple[str, float]]:
+    resolver = _Resolver(nodes)
+    edges = {rel: resolver.edges(rel, text) for rel, text in zip(nodes, heads)}
+    centrality = _pagerank(nodes, edges)
+    top = max(centrality.values()) or 1.0
+    max_size = math.log1p(max(sizes.values()) or 1)
+
+    scored = []
+    for rel, text in zip(nodes, heads):
+        entry = 1.0 if posixpath.basename(rel).lower() in ENTRY_POINT_NAMES or _ENTRY_POINT_MARKERS.search(text) else 0.0
+        score = (
+            CENTRALITY_WEIGHT * centrality[rel] / top
+            + ENTRY_POINT_WEIGHT * entry
+            + SIZE_WEIGHT * math.log1p(sizes[rel]) / max_size
+        )
+        if _is_peripheral(rel):
+            score *= PERIPHERAL_FACTOR
+        scored.append((rel, score))
+    scored.sort(key=lambda s: (-s[1], s[0].lower()))
+    return scored
+
+
+def rank_files(files: List[Tuple[str, Path]], workers: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Score files by how much they matter for a README, highest first.
+    Centrality is PageRank over the import graph (Python imports, relative
+    JS/TS imports, Go packages); entry points and larger files get a bonus
+    and tests/CI/docs are scaled down.
+    """
+    if not files:
+        return []
+    workers = workers or CRAWL_WORKERS or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        heads = list(pool.map(lambda f: _read_head(f[1]), files))
+    sizes = {}
+    for rel, fpath in files:
+        try:
+            sizes[rel] = fpath.stat().st_size
+        except OSError:
+            sizes[rel] = 0
+    return _score([rel for rel, _ in files], heads, sizes)
+
+
+def rank_blocks(blocks: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
+    """rank_files for (path, code) blocks already held in memory."""
+    if not blocks:
+        return []
+    return _score(
+        [path for path, _ in blocks],
+        [code[:RANK_READ_BYTES] for _, code in blocks],
+        {path: len(code) for path, code in blocks},
+    )
+
+
+def select_important_files(files: List[Tuple[str, Path]], limit: Optional[int]) -> List[Tuple[str, Path]]:
+    """
+    Keep the `limit` highest-ranked files (all of them when under the cap),
+    returned in the original path order so summaries still group by directory.
+    Ranking is opt-in: with no limit (MAX_FILES_TO_SUMMARIZE = None) every
+    file is summarized and nothing is ranked, since order does not change
+    the cost of summarizing the whole repo.
+    """
+    if limit is None or len(files) <= limit:
+        return files
+    keep = {rel for rel, _ in rank_files(files)[:limit]}
+    print(f"Ranked {len(files)} files; summarizing the top {limit}")
+    return [f for f in files if f[0] in keep]
+
+
+def select_important_blocks(blocks: List[Tuple[str, str]], limit: Optional[int]) -> List[Tuple[str, str]]:
+    """select_important_files for in-memory (path, code) blocks."""
+    if limit is None or len(blocks) <= limit:
+        return blocks
+    keep = {path for path, _ in rank_blocks(blocks)[:limit]}
+    print(f"Ranked {len(blocks)} blocks; summarizing the top {limit}")
+    return [b for b in blocks if b[0] in keep]
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+from .metrics import current_project
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English/code)."""
+    return max(1, len(text) // 4)
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter for requests-per-minute and
+    tokens-per-minute. `acquire` blocks until the call fits in both budgets.
+    A limit of None (or 0) disables that budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        window_seconds: float = 60.0,
+    ):
+        self.requests_per_minute = requests_per_minute or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self.window_seconds = window_seconds
+        self._events: Deque[Tuple[float, int]] = deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= self.window_seconds:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, now: float, tokens: int) -> float:
+        """Seconds until a call of `tokens` fits; 0 when it fits right now."""
+        waits = [0.0]
+        if self.requests_per_minute and len(self._events) >= self.requests_per_minute:
+            oldest = self._events[len(self._events) - self.requests_per_minute][0]
+            waits.append(oldest + self.window_seconds - now)
+        if self.tokens_per_minute and self._events:
+            # A single call larger than the whole budget is let through once the window is empty
+            budget = self.tokens_per_minute - min(tokens, self.tokens_per_minute)
+            running = self._tokens_in_window
+            for ts, t in self._events:
+                if running <= budget:
+                    break
+                running -= t
+                waits.append(ts + self.window_seconds - now)
+        return max(waits)
+
+    def acquire(self, tokens: int = 0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+            time.sleep(min(wait, 1.0))
+
+
+class FairScheduler:
+    """
+    Process-wide gate in front of a RateLimiter shared by every job. Callers
+    are grouped by tenant (the project being ingested) and served round-robin:
+    when the budget is saturated each waiting tenant gets one request in turn,
+    so a monorepo with thousands of queued files cannot starve small repos.
+    Exposes the same `acquire(tokens)` as RateLimiter.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[object]] = {}
+        self._ring: Deque[str] = deque()          # tenants with waiting requests, next to serve first
+        self._dispatching = False
+        self._granted: Dict[str, List[int]] = {}  # tenant -> [requests, tokens]
+
+    def acquire(self, tokens: int = 0, tenant: Optional[str] = None) -> None:
+        if tenant is None:
+            tenant = current_project()
+        ticket = object()
+        with self._cond:
+            queue = self._queues.setdefault(tenant, deque())
+            if not queue:
+                self._ring.append(tenant)
+            queue.append(ticket)
+            while self._dispatching or self._ring[0] != tenant or queue[0] is not ticket:
+                self._cond.wait()
+            self._dispatching = True
+        try:
+            # Only the dispatching caller waits on the budget; everyone else keeps their place
+            self.limiter.acquire(tokens)
+        finally:
+            with self._cond:
+                queue.popleft()
+                self._ring.popleft()
+                if queue:
+                    self._ring.append(tenant)   # back of the ring: the next tenant goes first
+                else:
+                    del self._queues[tenant]
+                granted = self._granted.setdefault(tenant, [0, 0])
+                granted[0] += 1
+                granted[1] += tokens
+                self._dispatching = False
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "waiting": {t: len(q) for t, q in self._queues.items()},
+                "granted": {t: {"requests": r, "tokens": n} for t, (r, n) in self._granted.items()},
+                "requests_per_minute": self.limiter.requests_per_minute,
+                "tokens_per_minute": self.limiter.tokens_per_minute,
+            }
+
+
+_scheduler: Optional[FairScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> FairScheduler:
+    """The scheduler all LLM calls in this process go through, created on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler(RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE))
+        return _scheduler
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from .config import RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES
+from .clients import load_env
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Process-local TTL + LRU store (the default; one copy per uvicorn worker)."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    """
+    Shared store so every uvicorn worker sees the same entries and
+    invalidations. Needs the optional `redis` package. Values are stored as
+    JSON; if Redis goes away after startup, reads degrade to misses and
+    writes are dropped rather than failing the request.
+    """
+
+    def __init__(self, url: str, prefix: str = "readme-gen:"):
+        import redis  # optional dependency, only needed when RESPONSE_CACHE_URL is set
+        self._redis = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self.prefix = prefix
+        self._redis.ping()  # from_url connects lazily; fail here so the builder can fall back
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self._redis.get(self.prefix + key)
+        except self._errors as e:
+            print("Response cache read failed:", e)
+            return _MISSING
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self._redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+        except self._errors as e:
+            print("Response cache write failed:", e)
+
+    def version(self, namespace: str) -> int:
+        try:
+            raw = self._redis.get(f"{self.prefix}version:{namespace}")
+        except self._errors as e:
+            print("Response cache read failed:", e)
+            return 0
+        return int(raw) if raw is not None else 0
+
+    def bump(self, namespace: str) -> None:
+        try:
+            self._redis.incr(f"{self.prefix}version:{namespace}")
+        except self._errors as e:
+            # Entries under the old version can be served until they expire
+            print(f"Response cache invalidation of {namespace} failed:", e)
+
+
+class ResponseCache:
+    """
+    Read-through cache for API reads. Entries live in a namespace (e.g. the
+    project list or one project's files/README); `invalidate(namespace)`
+    bumps the namespace version so every older entry stops matching, which
+    also works across workers when the backend is shared. Cached values must
+    be JSON-serializable; pass `model` to cache a pydantic model as its
+    dump. The backend is built on first use so importing this module stays
+    cheap.
+    """
+
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL,
+                 backend_factory: Callable[[], Any] = MemoryBackend):
+        self._backend = backend
+        self._backend_factory = backend_factory
+        self.ttl = ttl
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._backend_factory()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend) -> None:
+        self._backend = backend
+
+    def _count(self, namespace: str, field: str) -> None:
+        group = namespace.split(":", 1)[0]
+        with self._lock:
+            counts = self._stats.setdefault(group, {"hits": 0, "misses": 0, "invalidations": 0})
+            counts[field] += 1
+
+    def get_or_load(self, namespace: str, key: str, loader: Callable[[], Any],
+                    model: Optional[Type[BaseModel]] = None) -> Any:
+        full_key = f"{namespace}:v{self.backend.version(namespace)}:{key}"
+        value = self.backend.get(full_key)
+        if value is not _MISSING:
+            self._count(namespace, "hits")
+            return model.model_validate(value) if model else value
+        self._count(namespace, "misses")
+        value = loader()
+        self.backend.set(full_key, value.model_dump(mode="json") if model else value, self.ttl)
+        return value
+
+    def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+            self._count(namespace, "invalidations")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out: Dict[str, Dict[str, float]] = {}
+            for group, counts in self._stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                out[group] = dict(counts, hit_ratio=(counts["hits"] / lookups) if lookups else 0.0)
+            return out
+
+
+def _build_backend():
+    load_env()
+    url: Optional[str] = os.getenv("RESPONSE_CACHE_URL")
+    if url:
+        try:
+            return RedisBackend(url)
+        except Exception as e:
+            print("Shared response cache unavailable, using in-process cache:", e)
+    return MemoryBackend()
+
+
+response_cache = ResponseCache(backend_factory=_build_backend)
+
+
+PROJECTS_NAMESPACE = "projects"
+
+
+def project_namespace(project_id: str) -> str:
+    return f"project:{project_id}"
@@ -0,0 +1,185 @@
+import random
+import re
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from .config import (
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX,
+    LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN, LLM_BREAKER_MAX_COOLDOWN,
+)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_NAMES = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "ServiceUnavailableError", "Timeout", "TimeoutError", "ConnectTimeout", "ReadTimeout",
+    "ConnectError", "RemoteProtocolError", "ConnectionError",
+}
+_TRY_AGAIN = re.compile(r"try again in\s+([\d.]+)\s*(ms|s)\b", re.IGNORECASE)
+
+
+def _status_code(e: BaseException) -> Optional[int]:
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(e: BaseException) -> bool:
+    """Rate limits, timeouts, connection drops and 5xx answers are worth retrying."""
+    status = _status_code(e)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in RETRYABLE_NAMES for cls in type(e).__mro__)
+
+
+def retry_after(e: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After headers or 'try again in Xs'), if any."""
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    m = _TRY_AGAIN.search(str(e))
+    if m:
+        value = float(m.group(1))
+        return value / 1000 if m.group(2).lower() == "ms" else value
+    return None
+
+
+def backoff_delay(attempt: int, hint: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the provider's hint."""
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+    return max(delay, hint or 0.0)
+
+
+class CircuitBreaker:
+    """
+    Process-wide guard for the LLM provider. After `failures` retryable
+    errors in a row the circuit opens and every caller pauses for `cooldown`
+    seconds; then one trial call is let through (half-open). Success closes
+    the circuit, another failure reopens it with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        failures: int = LLM_BREAKER_FAILURES,
+        cooldown: float = LLM_BREAKER_COOLDOWN,
+        max_cooldown: float = LLM_BREAKER_MAX_COOLDOWN,
+    ):
+        self.failures = failures
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self._consecutive = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self._opened = 0
+        self._cond = threading.Condition()
+
+    @property
+    def state(self) -> str:
+        if self._open_until == 0.0:
+            return "closed"
+        return "open" if time.monotonic() < self._open_until else "half-open"
+
+    def wait(self) -> None:
+        """Block while the circuit is open; in half-open state only one caller proceeds."""
+        with self._cond:
+            while True:
+                if self._open_until == 0.0:
+                    return
+                remaining = self._open_until - time.monotonic()
+                if remaining <= 0 and not self._trial_in_flight:
+                    self._trial_in_flight = True
+                    return
+                self._cond.wait(timeout=remaining if remaining > 0 else 0.5)
+
+    def record_success(self) -> None:
+        with self._cond:
+            self._consecutive = 0
+            if self._open_until:
+                print("LLM circuit closed")
+            self._open_until = 0.0
+            self._trial_in_flight = False
+            self._cooldown = self.base_cooldown
+            self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        with self._cond:
+            self._consecutive += 1
+            if self._trial_in_flight:
+                # The half-open probe failed: back off harder
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._trial_in_flight = False
+                self._trip()
+            elif self._open_until == 0.0 and self._consecutive >= self.failures:
+                self._trip()
+            self._cond.notify_all()
+
+    def _trip(self) -> None:
+        self._open_until = time.monotonic() + self._cooldown
+        self._opened += 1
+        print(f"LLM circuit open for {self._cooldown:.0f}s after {self._consecutive} consecutive failures")
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._consecutive,
+                "times_opened": self._opened,
+                "cooldown_seconds": self._cooldown,
+            }
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker()
+        return _breaker
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    max_retries: int = LLM_MAX_RETRIES,
+    breaker: Optional[CircuitBreaker] = None,
+    on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+    can_retry: Callable[[], bool] = lambda: True,
+) -> T:
+    """
+    Run `fn`, retrying retryable errors with jittered exponential backoff
+    (honouring rate-limit hints) and pausing while the circuit is open.
+    `can_retry()` lets the caller veto a retry, e.g. once output was streamed.
+    """
+    breaker = breaker or get_circuit_breaker()
+    attempt = 0
+    while True:
+        breaker.wait()
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_retryable(e):
+                # The provider answered; a bad request says nothing about its health
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt >= max_retries or not can_retry():
+                raise
+            delay = backoff_delay(attempt, retry_after(e))
+            if on_retry is not None:
+                on_retry(attempt + 1, e, delay)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
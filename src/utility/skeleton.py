@@ -0,0 +1,163 @@
+import ast
+import re
+from typing import List, Optional, Pattern
+
+# Bump when the extracted view changes, so cached summaries of skeletons are not reused
+SKELETON_VERSION = "1"
+DOCSTRING_LINES = 6        # docstrings are cut to this many lines
+MAX_IMPORT_LINES = 40      # imports beyond this are counted, not listed
+MAX_DOC_COMMENT_LINES = 4  # leading // or /** */ lines kept above a declaration
+ELIDED = "..."
+
+def _short_docstring(doc: str) -> str:
+    lines = doc.strip().splitlines()
+    if len(lines) > DOCSTRING_LINES:
+        lines = lines[:DOCSTRING_LINES] + [ELIDED]
+    return "\n".join(lines)
+
+
+class _PythonSkeleton(ast.NodeTransformer):
+    """Keep definitions, signatures, decorators and docstrings; drop bodies."""
+
+    def _strip_body(self, node, keep_members: bool):
+        body = []
+        doc = ast.get_docstring(node, clean=True)
+        if doc:
+            body.append(ast.Expr(ast.Constant(_short_docstring(doc))))
+        if keep_members:
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    body.append(self.visit(child))
+                elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                    body.append(child)   # class attributes / model fields
+        if not keep_members or len(body) == (1 if doc else 0):
+            body.append(ast.Expr(ast.Constant(...)))
+        node.body = body
+        return node
+
+    def visit_FunctionDef(self, node):
+        return self._strip_body(node, keep_members=False)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        return self._strip_body(node, keep_members=True)
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return isinstance(node, ast.If) and "__main__" in ast.unparse(node.test)
+
+
+def python_skeleton(code: str) -> Optional[str]:
+    """Skeleton of a Python module via ast, or None if it does not parse."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    transformer = _PythonSkeleton()
+    body: List[ast.stmt] = []
+    doc = ast.get_docstring(tree, clean=True)
+    if doc:
+        body.append(ast.Expr(ast.Constant(_short_docstring(doc))))
+    imports = 0
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports += 1
+            if imports <= MAX_IMPORT_LINES:
+                body.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            body.append(transformer.visit(node))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            source = ast.unparse(node)
+            # Module constants, __all__, app/router objects; skip large literal tables
+            if len(source) <= 200:
+                body.append(node)
+        elif _is_main_guard(node):
+            node.body = node.body[:5]
+            body.append(node)
+    text = ast.unparse(ast.Module(body=body, type_ignores=[]))
+    if imports > MAX_IMPORT_LINES:
+        text = f"# ({imports - MAX_IMPORT_LINES} more imports)\n" + text
+    return text
+
+
+# Lines worth keeping in brace languages: imports/exports, type and function
+# declarations, annotated members and route registrations
+_JS_KEEP = re.compile(
+    r"^\s*(import\b|export\b|(async\s+)?function\b|class\b|interface\b|type\s+\w+|enum\b|"
+    r"(public|private|protected|static|readonly|async|get|set)\s+[\w$]+\s*[(<:=]|"
+    r"[\w$]+\s*\([^)]*\)\s*(:\s*[^{]+)?\{\s*$|"
+    r"(const|let|var)\s+[\w$]+\s*(:[^=]+)?=\s*(async\s*)?(\([^)]*\)|[\w$]+)\s*(:[^=]+)?=>|"
+    r"(app|router|server)\.(get|post|put|patch|delete|use|route)\s*\(|module\.exports)"
+)
+_GO_KEEP = re.compile(
+    r"^(package\b|import\b|\s*\"[^\"]+\"\s*$|func\b|type\b|const\b|var\b|\)\s*$|}\s*$)|"
+    r"^\s+\w+(\s*,\s*\w+)*\s+[\w.*\[\]]+.*`|^\s+\w+\s+[\w.*\[\]]+\s*(//.*)?$|"
+    r"^\s+\w+\s*\(.*\)|.*\.(HandleFunc|Handle|GET|POST|PUT|DELETE|Group)\("
+)
+_JAVA_KEEP = re.compile(
+    r"^\s*(package\b|import\b|@\w+|"
+    r"((public|protected|private|static|final|abstract|sealed|default|synchronized)\s+)*"
+    r"(class|interface|enum|record)\b|"
+    r"((public|protected|private)\s+)((static|final|abstract|synchronized)\s+)*[\w<>\[\],.? ]+\s+\w+\s*(\(|=|;))"
+)
+_LANG_PATTERNS = {
+    ".js": _JS_KEEP, ".jsx": _JS_KEEP, ".mjs": _JS_KEEP, ".cjs": _JS_KEEP, ".ts": _JS_KEEP, ".tsx": _JS_KEEP,
+    ".go": _GO_KEEP,
+    ".java": _JAVA_KEEP,
+}
+_DOC_COMMENT = re.compile(r"^\s*(//|/\*\*|\*|\*/)")
+_IMPORT_LINE = re.compile(r"^\s*(import\b|\s*\"[^\"]+\"\s*$)")
+
+
+def brace_skeleton(code: str, keep: Pattern[str]) -> str:
+    """
+    Line-based skeleton for brace languages: keep declaration lines (with
+    their leading doc comments) and collapse each run of dropped lines into
+    a single `...` at the indentation of the first dropped line.
+    """
+    out: List[str] = []
+    comments: List[str] = []
+    elided = False
+    imports = 0
+    for line in code.splitlines():
+        if not line.strip():
+            continue
+        if _DOC_COMMENT.match(line):
+            comments.append(line)
+            continue
+        if keep.match(line):
+            if _IMPORT_LINE.match(line):
+                imports += 1
+                if imports > MAX_IMPORT_LINES:
+                    continue
+            out.extend(comments[:MAX_DOC_COMMENT_LINES])
+            if len(comments) > MAX_DOC_COMMENT_LINES:
+                out.append(comments[0][: len(comments[0]) - len(comments[0].lstrip())] + "// " + ELIDED)
+            out.append(line.rstrip())
+            elided = False
+        elif not elided:
+            out.append(line[: len(line) - len(line.lstrip())] + ELIDED)
+            elided = True
+        comments = []
+    if imports > MAX_IMPORT_LINES:
+        out.insert(0, f"// ({imports - MAX_IMPORT_LINES} more imports)")
+    return "\n".join(out)
+
+
+def extract_skeleton(path: str, code: str) -> Optional[str]:
+    """
+    Compact structural view of a source file (signatures, classes, docstrings,
+    routes, exports) or None when the language is not supported or the view
+    would not be smaller than the code.
+    """
+    ext = path[path.rfind("."):].lower() if "." in path else ""
+    if ext == ".py":
+        skeleton = python_skeleton(code)
+    elif ext in _LANG_PATTERNS:
+        skeleton = brace_skeleton(code, _LANG_PATTERNS[ext])
+    else:
+        return None
+    if not skeleton or len(skeleton) >= len(code):
+        return None
+    return skeleton
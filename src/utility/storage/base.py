@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+
+class Storage(ABC):
+    """
+    Persistence interface for projects and their files. Rows are plain dicts
+    using the column names of the `projects` / `project_files` tables; the
+    facade in supabase/database.py turns them into models and handles
+    chunking and cache invalidation.
+    """
+
+    @abstractmethod
+    def upsert_project(self, project_name: str, git_url: str) -> str:
+        """Create or reset the project row keyed by name; return its project_id."""
+
+    @abstractmethod
+    def get_project_id(self, project_name: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def update_readme(self, project_name: str, readme_doc: str) -> List[str]:
+        """Store the README; return the ids of the updated projects."""
+
+    @abstractmethod
+    def list_projects(self) -> List[dict]:
+        """[{project_id, project_name}] for every project."""
+
+    @abstractmethod
+    def get_readme(self, project_id: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def upsert_files(self, records: List[dict]) -> None:
+        """Insert or update file rows on (project_id, file_name)."""
+
+    @abstractmethod
+    def get_file_summaries(self, project_id: str) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def delete_files(self, project_id: str, file_names: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def delete_all_files(self, project_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def list_files(self, project_id: str, after: Optional[str], limit: int) -> List[dict]:
+        """[{file_id, file_name, file_summary}] ordered by file_name, starting after `after`."""
+
+    @abstractmethod
+    def get_file(self, project_id: str, file_id: str) -> Optional[dict]:
+        """Full file row including file_content and duplicate_of."""
+
+    @abstractmethod
+    def get_file_content(self, project_id: str, file_name: str) -> Optional[str]:
+        """file_content of the row named `file_name` (used to resolve duplicates)."""
+
+    @abstractmethod
+    def get_duplicate_links(self, project_id: str) -> Dict[str, str]:
+        """file_name -> duplicate_of for every row linked to a representative."""
+
+    @abstractmethod
+    def search_files(self, project_id: str, terms: List[str], offset: int, limit: int) -> List[dict]:
+        """
+        Full-text search over file_name, file_summary and file_content for
+        rows containing every term (as a word prefix). Returns
+        [{file_id, file_name, file_summary, snippet, score}], best first.
+        """
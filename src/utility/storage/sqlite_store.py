@@ -0,0 +1,246 @@
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .base import Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_id   TEXT PRIMARY KEY,
+    project_name TEXT NOT NULL,
+    git_url      TEXT,
+    readme_doc   TEXT,
+    created_at   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX IF NOT EXISTS projects_project_name_idx ON projects (project_name);
+
+CREATE TABLE IF NOT EXISTS project_files (
+    file_id      TEXT PRIMARY KEY,
+    project_id   TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+    file_name    TEXT NOT NULL,
+    file_content TEXT,
+    file_summary TEXT,
+    duplicate_of TEXT,
+    created_at   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX IF NOT EXISTS project_files_project_id_filename_idx ON project_files (project_id, file_name);
+"""
+
+# Inverted index over project_files, kept in sync by triggers as ingest writes rows
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS project_files_fts USING fts5(
+    file_name, file_summary, file_content,
+    content='project_files', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS project_files_fts_insert AFTER INSERT ON project_files BEGIN
+    INSERT INTO project_files_fts (rowid, file_name, file_summary, file_content)
+    VALUES (new.rowid, new.file_name, new.file_summary, new.file_content);
+END;
+CREATE TRIGGER IF NOT EXISTS project_files_fts_delete AFTER DELETE ON project_files BEGIN
+    INSERT INTO project_files_fts (project_files_fts, rowid, file_name, file_summary, file_content)
+    VALUES ('delete', old.rowid, old.file_name, old.file_summary, old.file_content);
+END;
+CREATE TRIGGER IF NOT EXISTS project_files_fts_update AFTER UPDATE ON project_files BEGIN
+    INSERT INTO project_files_fts (project_files_fts, rowid, file_name, file_summary, file_content)
+    VALUES ('delete', old.rowid, old.file_name, old.file_summary, old.file_content);
+    INSERT INTO project_files_fts (rowid, file_name, file_summary, file_content)
+    VALUES (new.rowid, new.file_name, new.file_summary, new.file_content);
+END;
+"""
+# bm25 column weights: a name match outranks a summary match, which outranks a content match
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+SNIPPET_TOKENS = 16
+
+
+class SqliteStorage(Storage):
+    """
+    Embedded single-node storage. Uses WAL so readers never block the writer,
+    one connection per thread, and a process-wide write lock so concurrent
+    chunk writes queue instead of failing with SQLITE_BUSY.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before duplicate detection lack the link column
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(project_files)")}
+            if "duplicate_of" not in columns:
+                conn.execute("ALTER TABLE project_files ADD COLUMN duplicate_of TEXT")
+            self.fts = self._create_fts(conn)
+
+    @staticmethod
+    def _create_fts(conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 index (filling it from existing rows once); False if SQLite lacks FTS5."""
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_files_fts'"
+        ).fetchone()
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print("SQLite FTS5 unavailable, file search falls back to LIKE:", e)
+            return False
+        if not existed:
+            conn.execute("INSERT INTO project_files_fts (project_files_fts) VALUES ('rebuild')")
+        return True
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            conn = self._conn()
+            with conn:  # one transaction per write call
+                yield conn
+
+    def upsert_project(self, project_name: str, git_url: str) -> str:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO projects (project_id, project_name, git_url, readme_doc) VALUES (?, ?, ?, '') "
+                "ON CONFLICT (project_name) DO UPDATE SET git_url = excluded.git_url, readme_doc = '', "
+                "updated_at = CURRENT_TIMESTAMP",
+                (str(uuid.uuid4()), project_name, git_url),
+            )
+        return self.get_project_id(project_name)
+
+    def get_project_id(self, project_name: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT project_id FROM projects WHERE project_name = ?", (project_name,)
+        ).fetchone()
+        return row["project_id"] if row else None
+
+    def update_readme(self, project_name: str, readme_doc: str) -> List[str]:
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE projects SET readme_doc = ?, updated_at = CURRENT_TIMESTAMP WHERE project_name = ?",
+                (readme_doc, project_name),
+            )
+            rows = conn.execute("SELECT project_id FROM projects WHERE project_name = ?", (project_name,)).fetchall()
+        return [r["project_id"] for r in rows]
+
+    def list_projects(self) -> List[dict]:
+        rows = self._conn().execute("SELECT project_id, project_name FROM projects ORDER BY created_at").fetchall()
+        return [dict(r) for r in rows]
+
+    def get_readme(self, project_id: str) -> Optional[str]:
+        row = self._conn().execute("SELECT readme_doc FROM projects WHERE project_id = ?", (project_id,)).fetchone()
+        return row["readme_doc"] if row else None
+
+    def upsert_files(self, records: List[dict]) -> None:
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT INTO project_files (file_id, project_id, file_name, file_content, file_summary, duplicate_of) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project_id, file_name) DO UPDATE SET "
+                "file_content = excluded.file_content, file_summary = excluded.file_summary, "
+                "duplicate_of = excluded.duplicate_of",
+                [
+                    (
+                        str(uuid.uuid4()), r["project_id"], r["file_name"], r["file_content"],
+                        r["file_summary"], r.get("duplicate_of"),
+                    )
+                    for r in records
+                ],
+            )
+
+    def get_file_summaries(self, project_id: str) -> Dict[str, str]:
+        rows = self._conn().execute(
+            "SELECT file_name, file_summary FROM project_files WHERE project_id = ?", (project_id,)
+        ).fetchall()
+        return {r["file_name"]: r["file_summary"] for r in rows}
+
+    def delete_files(self, project_id: str, file_names: Iterable[str]) -> None:
+        with self._write() as conn:
+            conn.executemany(
+                "DELETE FROM project_files WHERE project_id = ? AND file_name = ?",
+                [(project_id, name) for name in file_names],
+            )
+
+    def delete_all_files(self, project_id: str) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM project_files WHERE project_id = ?", (project_id,))
+
+    def list_files(self, project_id: str, after: Optional[str], limit: int) -> List[dict]:
+        rows = self._conn().execute(
+            "SELECT file_id, file_name, file_summary FROM project_files "
+            "WHERE project_id = ? AND file_name > ? ORDER BY file_name LIMIT ?",
+            (project_id, after if after is not None else "", limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_file(self, project_id: str, file_id: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT file_id, project_id, file_name, file_content, file_summary, duplicate_of FROM project_files "
+            "WHERE project_id = ? AND file_id = ?",
+            (project_id, file_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_file_content(self, project_id: str, file_name: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT file_content FROM project_files WHERE project_id = ? AND file_name = ?", (project_id, file_name)
+        ).fetchone()
+        return row["file_content"] if row else None
+
+    def get_duplicate_links(self, project_id: str) -> Dict[str, str]:
+        rows = self._conn().execute(
+            "SELECT file_name, duplicate_of FROM project_files WHERE project_id = ? AND duplicate_of IS NOT NULL",
+            (project_id,),
+        ).fetchall()
+        return {r["file_name"]: r["duplicate_of"] for r in rows}
+
+    def search_files(self, project_id: str, terms: List[str], offset: int, limit: int) -> List[dict]:
+        if not terms:
+            return []
+        if not self.fts:
+            return self._search_like(project_id, terms, offset, limit)
+        match = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+        rows = self._conn().execute(
+            "WITH hits AS ("
+            " SELECT f.file_id, f.file_name, f.file_summary,"
+            " snippet(project_files_fts, -1, '**', '**', '…', ?) AS snippet,"
+            " -bm25(project_files_fts, ?, ?, ?) AS score"
+            " FROM project_files_fts JOIN project_files f ON f.rowid = project_files_fts.rowid"
+            " WHERE project_files_fts MATCH ? AND f.project_id = ?) "
+            # Exact duplicates store no content; they also match through their representative's hit
+            "SELECT file_id, file_name, file_summary, snippet, MAX(score) AS score FROM ("
+            " SELECT * FROM hits UNION ALL"
+            " SELECT d.file_id, d.file_name, d.file_summary, h.snippet, h.score"
+            " FROM project_files d JOIN hits h ON d.duplicate_of = h.file_name"
+            " WHERE d.project_id = ? AND d.file_content IS NULL) "
+            "GROUP BY file_id ORDER BY score DESC, file_name LIMIT ? OFFSET ?",
+            (SNIPPET_TOKENS, *FTS_WEIGHTS, match, project_id, project_id, limit, offset),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def _search_like(self, project_id: str, terms: List[str], offset: int, limit: int) -> List[dict]:
+        # Unranked substring match for SQLite builds without FTS5
+        where = " AND ".join(
+            "(f.file_name LIKE ? OR f.file_summary LIKE ? OR COALESCE(f.file_content, r.file_content) LIKE ?)"
+            for _ in terms
+        )
+        params = [p for t in terms for p in (f"%{t}%",) * 3]
+        rows = self._conn().execute(
+            "SELECT f.file_id, f.file_name, f.file_summary, substr(f.file_summary, 1, 200) AS snippet, 0.0 AS score "
+            "FROM project_files f LEFT JOIN project_files r "
+            "ON f.file_content IS NULL AND r.project_id = f.project_id AND r.file_name = f.duplicate_of "
+            f"WHERE f.project_id = ? AND {where} ORDER BY f.file_name LIMIT ? OFFSET ?",
+            (project_id, *params, limit, offset),
+        ).fetchall()
+        return [dict(r) for r in rows]
@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, Optional
+
+from ..config import PROJECT_TABLE, PROJECT_FILES_TABLE
+from .base import Storage
+
+
+class SupabaseStorage(Storage):
+    """Storage backed by the hosted Supabase tables (one HTTP round trip per call)."""
+
+    def __init__(self, client=None, url: Optional[str] = None, key: Optional[str] = None):
+        if client is None:
+            from supabase import create_client
+            client = create_client(url, key)
+        self.client = client
+
+    def upsert_project(self, project_name: str, git_url: str) -> str:
+        data = {"project_name": project_name, "git_url": git_url, "readme_doc": ""}
+        response = self.client.table(PROJECT_TABLE).upsert(data, on_conflict="project_name").execute()
+        if response.data:
+            return response.data[0]["project_id"]
+        return self.get_project_id(project_name)
+
+    def get_project_id(self, project_name: str) -> Optional[str]:
+        response = self.client.table(PROJECT_TABLE).select("project_id").eq("project_name", project_name).execute()
+        if response.data:
+            return response.data[0]["project_id"]
+        return None
+
+    def update_readme(self, project_name: str, readme_doc: str) -> List[str]:
+        response = (
+            self.client.table(PROJECT_TABLE)
+            .update({"readme_doc": readme_doc})
+            .eq("project_name", project_name)
+            .execute()
+        )
+        return [row["project_id"] for row in response.data or []]
+
+    def list_projects(self) -> List[dict]:
+        response = self.client.table(PROJECT_TABLE).select("project_id, project_name").execute()
+        return response.data
+
+    def get_readme(self, project_id: str) -> Optional[str]:
+        response = self.client.table(PROJECT_TABLE).select("readme_doc").eq("project_id", project_id).execute()
+        if response.data:
+            return response.data[0].get("readme_doc")
+        return None
+
+    def upsert_files(self, records: List[dict]) -> None:
+        self.client.table(PROJECT_FILES_TABLE).upsert(records, on_conflict="project_id,file_name").execute()
+
+    def get_file_summaries(self, project_id: str) -> Dict[str, str]:
+        response = (
+            self.client.table(PROJECT_FILES_TABLE)
+            .select("file_name, file_summary")
+            .eq("project_id", project_id)
+            .execute()
+        )
+        return {fd["file_name"]: fd["file_summary"] for fd in response.data}
+
+    def delete_files(self, project_id: str, file_names: Iterable[str]) -> None:
+        names = list(file_names)
+        if names:
+            self.client.table(PROJECT_FILES_TABLE).delete().eq("project_id", project_id).in_("file_name", names).execute()
+
+    def delete_all_files(self, project_id: str) -> None:
+        self.client.table(PROJECT_FILES_TABLE).delete().eq("project_id", project_id).execute()
+
+    def list_files(self, project_id: str, after: Optional[str], limit: int) -> List[dict]:
+        query = (
+            self.client.table(PROJECT_FILES_TABLE)
+            .select("file_id, file_name, file_summary")
+            .eq("project_id", project_id)
+        )
+        if after is not None:
+            query = query.gt("file_name", after)
+        return query.order("file_name").limit(limit).execute().data
+
+    def get_file(self, project_id: str, file_id: str) -> Optional[dict]:
+        response = (
+            self.client.table(PROJECT_FILES_TABLE)
+            .select("file_id, project_id, file_name, file_content, file_summary, duplicate_of")
+            .eq("project_id", project_id)
+            .eq("file_id", file_id)
+            .execute()
+        )
+        return response.data[0] if response.data else None
+
+    def get_file_content(self, project_id: str, file_name: str) -> Optional[str]:
+        response = (
+            self.client.table(PROJECT_FILES_TABLE)
+            .select("file_content")
+            .eq("project_id", project_id)
+            .eq("file_name", file_name)
+            .execute()
+        )
+        return response.data[0]["file_content"] if response.data else None
+
+    def get_duplicate_links(self, project_id: str) -> Dict[str, str]:
+        response = (
+            self.client.table(PROJECT_FILES_TABLE)
+            .select("file_name, duplicate_of")
+            .eq("project_id", project_id)
+            .not_.is_("duplicate_of", "null")
+            .execute()
+        )
+        return {fd["file_name"]: fd["duplicate_of"] for fd in response.data}
+
+    def search_files(self, project_id: str, terms: List[str], offset: int, limit: int) -> List[dict]:
+        # Postgres full-text search through the search_project_files function (see README)
+        if not terms:
+            return []
+        query = " & ".join(t.replace("'", "") + ":*" for t in terms)
+        response = self.client.rpc(
+            "search_project_files",
+            {"p_project_id": project_id, "p_query": query, "p_offset": offset, "p_limit": limit},
+        ).execute()
+        return response.data or []
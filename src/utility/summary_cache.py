@@ -0,0 +1,123 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import SUMMARY_CACHE_MAX_BYTES
+from .path import get_summary_cache_dir
+
+
+def summary_cache_key(content: str, prompt_template: str, model_name: str) -> str:
+    """Content-addressed key: file content + summarizer prompt + model."""
+    h = hashlib.sha256()
+    for part in (content, prompt_template, model_name):
+        h.update(part.encode("utf-8", errors="ignore"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class SummaryCache:
+    """
+    Persistent per-file summary cache stored as one file per key.
+    Entries are evicted least-recently-used once the store exceeds `max_bytes`;
+    file mtimes record last access so the LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = SUMMARY_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_summary_cache_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self._load_index()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def _load_index(self) -> None:
+        files = sorted(self.cache_dir.glob("*.txt"), key=lambda p: p.stat().st_mtime)
+        for f in files:
+            size = f.stat().st_size
+            self._entries[f.stem] = size
+            self._total_bytes += size
+
+    def __contains__(self, key: str) -> bool:
+        """Whether `key` is stored (index lookup only: no disk read, no hit/miss counted)."""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._entry_path(key)
+            try:
+                value = path.read_text(encoding="utf-8")
+                os.utime(path)
+            except OSError:
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        data = value.encode("utf-8")
+        with self._lock:
+            path = self._entry_path(key)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def trim(self, max_bytes: int) -> int:
+        """Evict least recently used entries until the store is at most `max_bytes`; returns bytes freed."""
+        with self._lock:
+            before = self._total_bytes
+            self._evict(max_bytes)
+            return before - self._total_bytes
+
+    def _evict(self, max_bytes: Optional[int] = None) -> None:
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        while self._total_bytes > limit and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+
+_summary_cache: Optional[SummaryCache] = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """Process-wide summary cache, created on first use."""
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache()
+        return _summary_cache
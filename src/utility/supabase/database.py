@@ -1,53 +1,165 @@
 import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
-from ..config import PROJECT_TABLE, PROJECT_FILES_TABLE
-from .models import Project, ProjectFile
-from typing import List
-import uuid
-load_dotenv()
-
-url: str = os.getenv("SUPABASE_URL")
-key: str = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key)
-
-def save_projects(requestJson: Project):
-    data = {
-        "project_name": requestJson.project_name,
-        "git_url": str(requestJson.git_url),
-        "readme_doc": ""
-    }
-    print("Saving project data: ", data)
-    supabase.table(PROJECT_TABLE).insert(data).execute()
+import re
+import base64
+import threading
+from ..config import DB_WRITE_MAX_BYTES, DB_WRITE_MAX_ROWS, DB_WRITE_CONCURRENCY
+from ..path import get_sqlite_db_path
+from .. import metrics
+from ..response_cache import response_cache, PROJECTS_NAMESPACE, project_namespace
+from ..storage.base import Storage
+from ..clients import load_env
+from .models import Project, ProjectFile, ProjectFileSummary, ProjectFilePage, FileSearchHit, FileSearchPage
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+load_env()
+
+# "supabase" (default) or "sqlite" for an embedded single-node database
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "supabase").lower()
+
+_storage: Optional[Storage] = None
+_storage_lock = threading.Lock()
+
+def _build_storage() -> Storage:
+    if STORAGE_BACKEND == "sqlite":
+        from ..storage.sqlite_store import SqliteStorage
+        return SqliteStorage(os.getenv("SQLITE_DB_PATH") or get_sqlite_db_path())
+    from ..storage.supabase_store import SupabaseStorage
+    return SupabaseStorage(url=os.getenv("SUPABASE_URL"), key=os.getenv("SUPABASE_KEY"))
+
+def get_storage() -> Storage:
+    """Configured storage backend, created on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = _build_storage()
+        return _storage
+
+def set_storage(storage: Storage) -> None:
+    """Swap the storage backend, e.g. for a temporary SQLite file in tests."""
+    global _storage
+    with _storage_lock:
+        _storage = storage
+
+def set_client(client) -> None:
+    """Use a Supabase client (or an in-process stand-in for one)."""
+    from ..storage.supabase_store import SupabaseStorage
+    set_storage(SupabaseStorage(client=client))
+
+def save_projects(requestJson: Project) -> Optional[str]:
+    """
+    Upsert the project row on project_name (re-runs reuse the same row)
+    and return its project_id.
+    """
+    print("Saving project: ", requestJson.project_name)
+    with metrics.timed(metrics.DB_SECONDS, "db", op="upsert_project"):
+        project_id = get_storage().upsert_project(requestJson.project_name, str(requestJson.git_url))
+    response_cache.invalidate(PROJECTS_NAMESPACE, project_namespace(project_id))
+    return project_id
 
 def save_readme(requestJson: Project):
-    data = {
-        "readme_doc": requestJson.readme_doc
-    }
-    supabase.table(PROJECT_TABLE).update(data).eq("project_name", requestJson.project_name).execute()
-    
-
-def save_files_data(projectName: str, requestJson: List[ProjectFile]):
-    # Get the project ID based on project name
-    response = supabase.table(PROJECT_TABLE).select("project_id").eq("project_name", projectName).execute()
-    project_data = response.data
-    print("Project data fetched for file saving: ", project_data)
-    # collect records and insert them into the PROJECT_FILES_TABLE
-    records = []
-    for pf in requestJson:
-        records.append({
-            "project_id": project_data[0]["project_id"],
-            "file_name": pf.file_name,
-            "file_content": pf.file_content,
-            "file_summary": pf.file_summary
-        })
-    print("Saving file data: ", records)
-    if records:
-        supabase.table(PROJECT_FILES_TABLE).insert(records).execute()
-        
+    with metrics.timed(metrics.DB_SECONDS, "db", op="update_readme"):
+        project_ids = get_storage().update_readme(requestJson.project_name, requestJson.readme_doc)
+    for project_id in project_ids:
+        response_cache.invalidate(project_namespace(project_id))
+
+def _chunk_records(records: List[dict], max_bytes: int, max_rows: int) -> Iterator[List[dict]]:
+    """Split records into request-sized chunks by approximate payload size and row count."""
+    chunk: List[dict] = []
+    size = 0
+    for r in records:
+        r_size = sum(len(v.encode("utf-8")) for v in r.values() if isinstance(v, str))
+        if chunk and (size + r_size > max_bytes or len(chunk) >= max_rows):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(r)
+        size += r_size
+    if chunk:
+        yield chunk
+
+def save_files_data(
+    projectName: str,
+    requestJson: List[ProjectFile],
+    project_id: Optional[str] = None,
+    max_bytes: int = DB_WRITE_MAX_BYTES,
+    max_rows: int = DB_WRITE_MAX_ROWS,
+    concurrency: int = DB_WRITE_CONCURRENCY,
+):
+    """
+    Upsert file rows on (project_id, file_name) in size-bounded chunks,
+    written concurrently. Pass the id returned by save_projects to skip the
+    lookup by project name.
+    """
+    if not requestJson:
+        return
+    if project_id is None:
+        project_id = get_project_id(projectName)
+    if project_id is None:
+        raise ValueError(f"Project not found: {projectName}")
+    records = [{
+        "project_id": project_id,
+        "file_name": pf.file_name,
+        "file_content": pf.file_content,
+        "file_summary": pf.file_summary,
+        "duplicate_of": pf.duplicate_of,
+    } for pf in requestJson]
+
+    storage = get_storage()
+    chunks = list(_chunk_records(records, max_bytes, max_rows))
+    print(f"Saving {len(records)} files for {projectName} in {len(chunks)} chunk(s)")
+    try:
+        with metrics.timed(metrics.DB_SECONDS, "db", op="upsert_files"):
+            if len(chunks) == 1 or concurrency <= 1:
+                for chunk in chunks:
+                    storage.upsert_files(chunk)
+                return
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+                # list() re-raises the first failed write
+                list(pool.map(storage.upsert_files, chunks))
+    finally:
+        response_cache.invalidate(project_namespace(project_id))
+
+def get_project_id(projectName: str) -> Optional[str]:
+    return get_storage().get_project_id(projectName)
+
+def get_file_summaries(projectName: str, project_id: Optional[str] = None) -> Dict[str, str]:
+    """Map of file_name -> file_summary for the files already stored for a project."""
+    project_id = project_id or get_project_id(projectName)
+    if project_id is None:
+        return {}
+    return get_storage().get_file_summaries(project_id)
+
+def get_duplicate_links(projectName: str, project_id: Optional[str] = None) -> Dict[str, str]:
+    """Map of file_name -> representative file_name for stored duplicates."""
+    project_id = project_id or get_project_id(projectName)
+    if project_id is None:
+        return {}
+    return get_storage().get_duplicate_links(project_id)
+
+def delete_files_data(
+    projectName: str, file_names: Iterable[str], chunk_size: int = 200, project_id: Optional[str] = None
+):
+    """Remove stored rows for the given files (e.g. deleted upstream)."""
+    project_id = project_id or get_project_id(projectName)
+    names = list(file_names)
+    if project_id is None or not names:
+        return
+    with metrics.timed(metrics.DB_SECONDS, "db", op="delete_files"):
+        for i in range(0, len(names), chunk_size):
+            get_storage().delete_files(project_id, names[i:i + chunk_size])
+    response_cache.invalidate(project_namespace(project_id))
+
+def delete_all_files_data(projectName: str, project_id: Optional[str] = None):
+    project_id = project_id or get_project_id(projectName)
+    if project_id is not None:
+        with metrics.timed(metrics.DB_SECONDS, "db", op="delete_all_files"):
+            get_storage().delete_all_files(project_id)
+        response_cache.invalidate(project_namespace(project_id))
+
 def get_projects_list():
-    response = supabase.table(PROJECT_TABLE).select("project_id, project_name").execute()
-    project_data = response.data
+    return response_cache.get_or_load(PROJECTS_NAMESPACE, "list", _load_projects_list)
+
+def _load_projects_list():
+    project_data = get_storage().list_projects()
     returnLst = []
     for pd in project_data:
         returnLst.append({
@@ -56,24 +168,86 @@ def get_projects_list():
         })
     return returnLst
 
-def get_project_files(project_id: str) -> List[ProjectFile]:
-    response = supabase.table(PROJECT_FILES_TABLE).select("*").eq("project_id", project_id).execute()
-    file_data = response.data
-    project_files = []
-    for fd in file_data:
-        project_file = ProjectFile(
-            file_id=fd["file_id"],
-            project_id=fd["project_id"],
-            file_name=fd["file_name"],
-            file_content=fd["file_content"],
-            file_summary=fd["file_summary"]
+def _encode_cursor(file_name: str) -> str:
+    return base64.urlsafe_b64encode(file_name.encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except ValueError:   # not ASCII, bad base64 padding or not UTF-8 underneath
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def list_project_files(project_id: str, cursor: Optional[str] = None, limit: int = 50) -> ProjectFilePage:
+    """
+    Keyset-paginated listing ordered by file_name; returns names and
+    summaries only (no file_content).
+    """
+    return response_cache.get_or_load(
+        project_namespace(project_id),
+        f"files:{cursor or ''}:{limit}",
+        lambda: _load_project_files_page(project_id, cursor, limit),
+        model=ProjectFilePage,
+    )
+
+def _load_project_files_page(project_id: str, cursor: Optional[str], limit: int) -> ProjectFilePage:
+    # Fetch one extra row to learn whether another page exists
+    after = _decode_cursor(cursor) if cursor else None
+    rows = get_storage().list_files(project_id, after, limit + 1)
+    items = [
+        ProjectFileSummary(file_id=fd["file_id"], file_name=fd["file_name"], file_summary=fd["file_summary"])
+        for fd in rows[:limit]
+    ]
+    next_cursor = _encode_cursor(items[-1].file_name) if len(rows) > limit else None
+    return ProjectFilePage(items=items, next_cursor=next_cursor)
+
+def get_project_file(project_id: str, file_id: str) -> Optional[ProjectFile]:
+    fd = get_storage().get_file(project_id, file_id)
+    if fd is None:
+        return None
+    content = fd["file_content"]
+    if content is None and fd.get("duplicate_of"):
+        # Exact duplicates are stored once, on their representative's row
+        content = get_storage().get_file_content(project_id, fd["duplicate_of"])
+    return ProjectFile(
+        file_id=fd["file_id"],
+        project_id=fd["project_id"],
+        file_name=fd["file_name"],
+        file_content=content or "",
+        file_summary=fd["file_summary"],
+        duplicate_of=fd.get("duplicate_of"),
+    )
+
+_SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+def search_project_files(project_id: str, query: str, offset: int = 0, limit: int = 20) -> FileSearchPage:
+    """
+    Ranked full-text search over a project's file names, summaries and
+    contents, served from the index built as files are ingested. Every word
+    of `query` must match (as a prefix); pages are offset-based.
+    """
+    terms = [t.lower() for t in _SEARCH_TERM.findall(query)][:MAX_SEARCH_TERMS]
+    return response_cache.get_or_load(
+        project_namespace(project_id),
+        f"search:{' '.join(terms)}:{offset}:{limit}",
+        lambda: _load_search_page(project_id, terms, offset, limit),
+        model=FileSearchPage,
+    )
+
+def _load_search_page(project_id: str, terms: List[str], offset: int, limit: int) -> FileSearchPage:
+    with metrics.timed(metrics.DB_SECONDS, "db", op="search_files"):
+        rows = get_storage().search_files(project_id, terms, offset, limit + 1)
+    items = [
+        FileSearchHit(
+            file_id=fd["file_id"], file_name=fd["file_name"], file_summary=fd.get("file_summary"),
+            snippet=fd.get("snippet") or "", score=fd.get("score") or 0.0,
         )
-        project_files.append(project_file)
-    return project_files
+        for fd in rows[:limit]
+    ]
+    return FileSearchPage(items=items, next_offset=offset + limit if len(rows) > limit else None)
 
 def get_readme(project_id: str) -> str:
-    response = supabase.table(PROJECT_TABLE).select("readme_doc").eq("project_id", project_id).execute()
-    project_data = response.data
-    if project_data and "readme_doc" in project_data[0]:
-        return project_data[0]["readme_doc"]
-    return ""
\ No newline at end of file
+    return response_cache.get_or_load(project_namespace(project_id), "readme", lambda: _load_readme(project_id))
+
+def _load_readme(project_id: str) -> str:
+    return get_storage().get_readme(project_id) or ""
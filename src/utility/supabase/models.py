@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import List, Optional
 
 class Project(BaseModel):
     project_id: Optional[str] = None     
@@ -11,5 +11,26 @@ class ProjectFile(BaseModel):
     file_id: Optional[str] = None
     project_id: Optional[str] = None
     file_name: str
-    file_content: str
+    file_content: Optional[str] = None   # None for exact duplicates; read from `duplicate_of`
     file_summary: str
+    duplicate_of: Optional[str] = None   # file_name of the representative whose summary is shared
+
+class ProjectFileSummary(BaseModel):
+    file_id: str
+    file_name: str
+    file_summary: Optional[str] = None
+
+class ProjectFilePage(BaseModel):
+    items: List[ProjectFileSummary]
+    next_cursor: Optional[str] = None   # pass back as ?cursor= for the next page
+
+class FileSearchHit(BaseModel):
+    file_id: str
+    file_name: str
+    file_summary: Optional[str] = None
+    snippet: str = ""      # best-matching excerpt, matched terms wrapped in **
+    score: float = 0.0     # higher is more relevant
+
+class FileSearchPage(BaseModel):
+    items: List[FileSearchHit]
+    next_offset: Optional[int] = None   # pass back as ?offset= for the next page
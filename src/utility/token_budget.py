@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Tuple
+
+from .config import (
+    LLM_MODEL_NAME, MAX_TOKENS_PER_FILE_SNIPPET, SMALL_FILE_TOKENS,
+    PACK_TOKEN_BUDGET, MAX_FILES_PER_PACK,
+)
+from .rate_limiter import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # tokenizer is optional; fall back to the character heuristic
+    tiktoken = None
+
+# (path, code, token count)
+SizedBlock = Tuple[str, str, int]
+
+
+@lru_cache(maxsize=None)
+def _encoding(model_name: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            enc = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            enc = tiktoken.get_encoding("o200k_base")
+        # The BPE ranks are downloaded on first use; fail here, once, rather than in every count
+        enc.encode("warm up")
+        return enc
+    except Exception as e:
+        print("tiktoken encoding unavailable (offline?), using the character heuristic:", e)
+        return None
+
+
+def count_tokens(text: str, model_name: str = LLM_MODEL_NAME) -> int:
+    """Token count with the model's tokenizer (heuristic when tiktoken is missing)."""
+    enc = _encoding(model_name)
+    if enc is None:
+        return estimate_tokens(text)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int = MAX_TOKENS_PER_FILE_SNIPPET, model_name: str = LLM_MODEL_NAME
+) -> str:
+    """Cut `text` to at most `max_tokens`, on a token boundary."""
+    enc = _encoding(model_name)
+    if enc is None:
+        return text[: max_tokens * 4]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+
+def pack_blocks(
+    blocks: Iterable[Tuple[str, str]],
+    small_file_tokens: int = SMALL_FILE_TOKENS,
+    pack_token_budget: int = PACK_TOKEN_BUDGET,
+    max_files_per_pack: int = MAX_FILES_PER_PACK,
+    model_name: str = LLM_MODEL_NAME,
+) -> Iterator[List[SizedBlock]]:
+    """
+    Group consecutive small files into packs that share one summarization
+    request; larger files get a pack of their own. Packs come out in block
+    order so downstream results keep the original file order.
+    """
+    pending: List[SizedBlock] = []
+    pending_tokens = 0
+    for path, code in blocks:
+        n = count_tokens(code, model_name)
+        if n > small_file_tokens:
+            if pending:
+                yield pending
+                pending, pending_tokens = [], 0
+            yield [(path, code, n)]
+            continue
+        if pending and (pending_tokens + n > pack_token_budget or len(pending) >= max_files_per_pack):
+            yield pending
+            pending, pending_tokens = [], 0
+        pending.append((path, code, n))
+        pending_tokens += n
+    if pending:
+        yield pending
@@ -0,0 +1,313 @@
+import contextvars
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .config import WORKSPACE_MAX_BYTES, WORKSPACE_TARGET_RATIO, WORKSPACE_RECLAIM_INTERVAL
+from .path import get_output_dir, get_workspace_index_path
+from .summary_cache import get_summary_cache
+
+# Per-project directories under src/output; only the first two are rebuilt on demand
+EVICTABLE_AREAS = ("git", "aggregate")
+KEPT_AREAS = ("readme", "checkpoints")
+MIRRORS_AREA = "mirrors"                   # shared bare mirrors, one per git URL
+SUMMARY_CACHE_AREA = ("cache", "summaries")
+
+# Project whose lease the current job holds (set by WorkspaceManager.lease)
+_current_project: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("workspace_project", default=None)
+
+
+def dir_size(path: Path) -> int:
+    """Bytes used by the files under `path` (0 if it does not exist)."""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+class WorkspaceManager:
+    """
+    Keeps src/output within WORKSPACE_MAX_BYTES. Usage counts project
+    clones, aggregates, READMEs and checkpoints, the shared bare mirrors
+    and the summary cache. Every job holds a lease on its project while it
+    runs, and a mirror is pinned by the leases that used it; leased
+    projects and pinned mirrors are never evicted, and a lease or mirror
+    use that arrives during an eviction waits for the deletion to finish
+    (the pipeline then re-clones). Once usage is over the quota, the least
+    recently used clones/aggregates and mirrors are deleted, then the
+    summary cache is trimmed, until usage drops to WORKSPACE_TARGET_RATIO
+    of the quota.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: Optional[int] = WORKSPACE_MAX_BYTES,
+        target_ratio: float = WORKSPACE_TARGET_RATIO,
+        interval: float = WORKSPACE_RECLAIM_INTERVAL,
+    ):
+        self.root = Path(root) if root else get_output_dir()
+        self.index_path = self.root / "workspace.json" if root else get_workspace_index_path()
+        self.max_bytes = max_bytes
+        self.target_ratio = target_ratio
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._leases: Dict[str, int] = {}
+        self._evicting: Set[str] = set()                 # project names and "mirrors/<name>" keys
+        self._mirror_users: Dict[str, Set[str]] = {}     # mirror dir name -> leased projects using it
+        self._last_access: Dict[str, float] = self._load_index()
+        self._usage: Dict[str, Dict[str, int]] = {}   # project -> area -> bytes, from the last scan
+        self._mirror_usage: Dict[str, int] = {}
+        self._cache_bytes = 0
+        self._evicted = 0
+        self._reclaimed_bytes = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_index(self) -> Dict[str, float]:
+        try:
+            return {k: float(v) for k, v in json.loads(self.index_path.read_text(encoding="utf-8")).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_index(self) -> None:
+        # Called with self._cond held
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._last_access), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def touch(self, projectName: str) -> None:
+        """Record an access to the project's workspace."""
+        with self._cond:
+            self._last_access[projectName] = time.time()
+            self._save_index()
+
+    @contextmanager
+    def lease(self, projectName: str) -> Iterator[None]:
+        """Pin the project's clone and aggregate for the duration of a job."""
+        with self._cond:
+            while projectName in self._evicting:
+                self._cond.wait()
+            self._leases[projectName] = self._leases.get(projectName, 0) + 1
+            self._last_access[projectName] = time.time()
+            self._save_index()
+        token = _current_project.set(projectName)
+        try:
+            yield
+        finally:
+            _current_project.reset(token)
+            with self._cond:
+                self._leases[projectName] -= 1
+                if not self._leases[projectName]:
+                    del self._leases[projectName]
+                    for users in self._mirror_users.values():
+                        users.discard(projectName)
+                self._last_access[projectName] = time.time()
+                self._save_index()
+            # The job may have grown the workspace; let the reclaimer check soon
+            self._wake.set()
+
+    def use_mirror(self, mirror_dir: Path) -> None:
+        """
+        Called before a mirror is created, fetched or cloned from: waits out
+        an eviction of it and pins it to the current job's lease.
+        """
+        name = Path(mirror_dir).name
+        key = f"{MIRRORS_AREA}/{name}"
+        with self._cond:
+            while key in self._evicting:
+                self._cond.wait()
+            project = _current_project.get()
+            if project is not None:
+                self._mirror_users.setdefault(name, set()).add(project)
+            self._last_access[key] = time.time()
+            self._save_index()
+
+    def _projects(self) -> List[str]:
+        names: Set[str] = set()
+        for area in EVICTABLE_AREAS + KEPT_AREAS:
+            area_dir = self.root / area
+            if area_dir.is_dir():
+                names.update(p.name for p in area_dir.iterdir() if p.is_dir())
+        return sorted(names)
+
+    def _mirrors(self) -> List[str]:
+        mirrors_dir = self.root / MIRRORS_AREA
+        return sorted(p.name for p in mirrors_dir.iterdir() if p.is_dir()) if mirrors_dir.is_dir() else []
+
+    def scan(self) -> int:
+        """Measure disk usage (per project area, per mirror, summary cache); returns the total."""
+        usage = {
+            name: {area: dir_size(self.root / area / name) for area in EVICTABLE_AREAS + KEPT_AREAS}
+            for name in self._projects()
+        }
+        mirrors = {name: dir_size(self.root / MIRRORS_AREA / name) for name in self._mirrors()}
+        cache_bytes = dir_size(self.root.joinpath(*SUMMARY_CACHE_AREA))
+        with self._cond:
+            self._usage = usage
+            self._mirror_usage = mirrors
+            self._cache_bytes = cache_bytes
+        return sum(sum(areas.values()) for areas in usage.values()) + sum(mirrors.values()) + cache_bytes
+
+    def _last_used(self, key: str) -> float:
+        if key in self._last_access:
+            return self._last_access[key]
+        # Never seen by this manager: fall back to when its clone/mirror was last written
+        path = self.root / key if key.startswith(MIRRORS_AREA + "/") else self.root / "git" / key
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def _in_use(self, key: str) -> bool:
+        # Called with self._cond held
+        if key.startswith(MIRRORS_AREA + "/"):
+            return bool(self._mirror_users.get(key[len(MIRRORS_AREA) + 1:]))
+        return bool(self._leases.get(key))
+
+    def _evict(self, key: str, paths: List[Path]) -> bool:
+        """Delete `paths` for `key` unless it is in use; leases/mirror uses wait meanwhile."""
+        with self._cond:
+            if self._in_use(key):
+                return False
+            self._evicting.add(key)
+        try:
+            for path in paths:
+                shutil.rmtree(path, ignore_errors=True)
+        finally:
+            with self._cond:
+                self._evicting.discard(key)
+                self._cond.notify_all()
+        return True
+
+    def reclaim(self) -> int:
+        """
+        Evict least recently used clones/aggregates and mirrors, then trim
+        the summary cache, until usage is under target; returns bytes freed.
+        """
+        total = self.scan()
+        if self.max_bytes is None or total <= self.max_bytes:
+            return 0
+        target = int(self.max_bytes * self.target_ratio)
+        with self._cond:
+            candidates = [
+                (name, [self.root / area / name for area in EVICTABLE_AREAS], sum(areas[a] for a in EVICTABLE_AREAS))
+                for name, areas in self._usage.items()
+            ] + [
+                (f"{MIRRORS_AREA}/{name}", [self.root / MIRRORS_AREA / name], size)
+                for name, size in self._mirror_usage.items()
+            ]
+            candidates = sorted((c for c in candidates if c[2]), key=lambda c: self._last_used(c[0]))
+        freed = 0
+        for key, paths, size in candidates:
+            if total - freed <= target:
+                break
+            if not self._evict(key, paths):
+                continue   # an active job is using it
+            freed += size
+            with self._cond:
+                self._evicted += 1
+                self._reclaimed_bytes += size
+                if key in self._usage:
+                    self._usage[key].update({area: 0 for area in EVICTABLE_AREAS})
+                else:
+                    self._mirror_usage.pop(key[len(MIRRORS_AREA) + 1:], None)
+            print(f"Workspace: evicted {key} ({size / 1024**2:.1f} MiB)")
+        cache = get_summary_cache()
+        if total - freed > target and cache.cache_dir == self.root.joinpath(*SUMMARY_CACHE_AREA):
+            trimmed = cache.trim(max(0, self._cache_bytes - (total - freed - target)))
+            freed += trimmed
+            with self._cond:
+                self._reclaimed_bytes += trimmed
+                self._cache_bytes -= trimmed
+            print(f"Workspace: trimmed summary cache by {trimmed / 1024**2:.1f} MiB")
+        if total - freed > self.max_bytes:
+            print(f"Workspace still over quota ({(total - freed) / 1024**2:.1f} MiB): remaining data is in use or kept")
+        return freed
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.reclaim()
+            except Exception as e:
+                print("Workspace reclaim failed:", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Run reclaim in a background thread every `interval` seconds (and after each job)."""
+        if self._thread is not None or self.max_bytes is None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="workspace-reclaim", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._cond:
+            projects = {
+                name: {
+                    "bytes": areas,
+                    "total_bytes": sum(areas.values()),
+                    "last_access": self._last_used(name),
+                    "active": bool(self._leases.get(name)),
+                }
+                for name, areas in self._usage.items()
+            }
+            mirrors = {
+                name: {
+                    "bytes": size,
+                    "last_access": self._last_used(f"{MIRRORS_AREA}/{name}"),
+                    "active": bool(self._mirror_users.get(name)),
+                }
+                for name, size in self._mirror_usage.items()
+            }
+            return {
+                "max_bytes": self.max_bytes,
+                "used_bytes": (
+                    sum(p["total_bytes"] for p in projects.values())
+                    + sum(m["bytes"] for m in mirrors.values()) + self._cache_bytes
+                ),
+                "summary_cache_bytes": self._cache_bytes,
+                "mirrors": mirrors,
+                "evictions": self._evicted,
+                "reclaimed_bytes": self._reclaimed_bytes,
+                "projects": projects,
+            }
+
+
+_manager: Optional[WorkspaceManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_workspace_manager() -> WorkspaceManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = WorkspaceManager()
+        return _manager
@@ -0,0 +1,75 @@
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+from langchain_core.language_models.llms import LLM
+from pydantic import PrivateAttr
+
+from src.utility import file_crawler, llm_util, path, workspace
+from src.utility.storage.sqlite_store import SqliteStorage
+from src.utility.supabase import database
+from src.utility.response_cache import MemoryBackend, response_cache
+
+_PATH_LINE = re.compile(r"^PATH: (.+)$", re.MULTILINE)
+
+
+class ScriptedLLM(LLM):
+    """
+    Answers every file in the prompt with `summary of <path>`. `delays` sets a
+    per-path latency so requests finish out of order, and a request for any
+    path in `fail` raises `ValueError` (not retryable). Prompts without file
+    paths (directory summaries, the README) get `answer`, or raise when
+    `fail_compose` is set.
+    """
+
+    delays: Dict[str, float] = {}
+    fail: List[str] = []
+    answer: str = "# README"
+    fail_compose: bool = False
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _requests: List[List[str]] = PrivateAttr(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def requests(self) -> List[List[str]]:
+        with self._lock:
+            return list(self._requests)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        paths = _PATH_LINE.findall(prompt)
+        with self._lock:
+            self._requests.append(paths)
+        time.sleep(max([self.delays.get(p, 0.0) for p in paths] or [0.0]))
+        if not paths:
+            if self.fail_compose:
+                raise ValueError("scripted compose failure")
+            return self.answer
+        if any(p in self.fail for p in paths):
+            raise ValueError(f"scripted failure for {paths}")
+        if len(paths) > 1:
+            return "\n".join(f"### {p}\n- summary of {p}" for p in paths)
+        return f"- summary of {paths[0]}"
+
+
+@pytest.fixture(autouse=True)
+def output_root(tmp_path, monkeypatch):
+    """Send every src/output path (clones, mirrors, cache, checkpoints) into a temp dir."""
+    monkeypatch.setattr(path, "get_project_root", lambda start=None: tmp_path)
+    monkeypatch.setattr(file_crawler, "get_project_root", lambda start=None: tmp_path)
+    monkeypatch.setattr(workspace, "_manager", None)
+    monkeypatch.setattr(llm_util, "SUMMARY_CACHE_ENABLED", False)
+    monkeypatch.setattr(response_cache, "backend", MemoryBackend())
+    return tmp_path / "src" / "output"
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SqliteStorage(tmp_path / "test.sqlite3")
+    database.set_storage(storage)
+    yield storage
+    database.set_storage(None)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import main
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def finished_job():
+    job = main.job_manager.submit("demo", lambda job: {"ok": True}, kind="test")
+    for _ in range(100):
+        if main.job_manager.get(job.job_id).finished_at is not None:
+            break
+        time.sleep(0.01)
+    return job.job_id
+
+
+def event_ids(body):
+    return [int(line[4:]) for line in body.splitlines() if line.startswith("id: ")]
+
+
+def test_events_stream_from_the_start(client, finished_job):
+    response = client.get(f"/jobs/{finished_job}/events")
+
+    assert response.status_code == 200
+    assert event_ids(response.text) == [0, 1, 2]
+    assert "event: done" in response.text
+
+
+def test_events_resume_after_last_event_id(client, finished_job):
+    response = client.get(f"/jobs/{finished_job}/events", headers={"Last-Event-ID": "1"})
+
+    assert event_ids(response.text) == [2]
+
+
+def test_malformed_last_event_id_is_a_bad_request(client, finished_job):
+    response = client.get(f"/jobs/{finished_job}/events", headers={"Last-Event-ID": "abc"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("name", ["", " ", ".", "..", "../..", "a/b", "a\\b"])
+def test_project_name_must_be_a_single_path_segment(client, name):
+    response = client.post("/repo", json={"project_name": name, "git_url": "https://example.test/r"})
+
+    assert response.status_code == 422
+
+
+def test_concurrent_ingest_of_the_same_project_is_a_conflict(client, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(main, "ingest_repo", lambda job, body: release.wait(5) and None)
+    body = {"project_name": "busy", "git_url": "https://example.test/r"}
+
+    first = client.post("/repo", json=body)
+    second = client.post("/repo/refresh", json=body)
+    release.set()
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert second.json()["detail"]["job_id"] == first.json()["job_id"]
+
+
+def test_malformed_file_cursor_is_a_bad_request(client, sqlite_storage):
+    response = client.get("/projects/some-project/files", params={"cursor": "not base64!"})
+
+    assert response.status_code == 400
@@ -0,0 +1,105 @@
+from src.utility import dedup, llm_util
+from src.utility.dedup import DuplicateIndex, estimate_similarity, minhash_signature
+from src.utility.rate_limiter import RateLimiter
+from src.utility.summary_cache import SummaryCache
+from src.utility.supabase import database
+from src.utility.supabase.models import Project
+
+from .conftest import ScriptedLLM
+
+MODULE = "\n".join(f"def handler_{i}(request):\n    return render(request, 'page_{i}.html', {{'n': {i}}})" for i in range(40))
+
+
+def edited(code, every):
+    lines = code.splitlines()
+    return "\n".join(f"# edited {i}" if i % every == 0 else line for i, line in enumerate(lines))
+
+
+def test_signature_similarity_tracks_the_size_of_the_edit():
+    base = minhash_signature(MODULE)
+
+    assert estimate_similarity(base, minhash_signature(MODULE)) == 1.0
+    small = estimate_similarity(base, minhash_signature(edited(MODULE, 40)))
+    large = estimate_similarity(base, minhash_signature(edited(MODULE, 3)))
+    assert small >= 0.85 > large
+
+
+def test_small_files_have_no_signature():
+    assert minhash_signature("x = 1\n") is None
+
+
+def test_index_links_exact_and_near_duplicates_to_the_first_file():
+    index = DuplicateIndex()
+
+    assert index.check("a.py", MODULE) is None
+    assert index.check("b.py", MODULE) == ("a.py", True)
+    assert index.check("c.py", edited(MODULE, 40)) == ("a.py", False)
+    assert index.check("d.py", "unrelated = True\n" * 50) is None
+
+
+def test_near_false_skips_the_signature(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dedup, "minhash_signature", lambda code: calls.append(code))
+    index = DuplicateIndex()
+
+    assert index.check("a.py", MODULE, near=False) is None
+    assert index.check("b.py", MODULE, near=False) == ("a.py", True)
+    assert calls == []
+
+
+def test_cached_files_skip_the_near_duplicate_check(monkeypatch, tmp_path):
+    cache = SummaryCache(tmp_path / "cache")
+    llm = ScriptedLLM()
+    blocks = [("a.py", MODULE)]
+    llm_util.map_file_summaries(llm, blocks, limiter=RateLimiter(), cache=cache)
+    calls = []
+    real = dedup.minhash_signature
+    monkeypatch.setattr(dedup, "minhash_signature", lambda code: calls.append(code) or real(code))
+
+    llm_util.map_file_summaries(
+        llm, blocks + [("b.py", edited(MODULE, 40))], limiter=RateLimiter(), cache=cache, dedup=DuplicateIndex(),
+    )
+
+    assert calls == [edited(MODULE, 40)]
+
+
+def test_exact_duplicates_reference_their_representative(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(llm_util, "DEDUP_ENABLED", True)
+    project_id = database.save_projects(Project(project_name="demo"))
+    near = edited(MODULE, 40)
+    blocks = [("a.py", MODULE), ("copy/a.py", MODULE), ("near.py", near)]
+
+    results = llm_util._summarize_and_save(
+        ScriptedLLM(), blocks, "demo", limiter=RateLimiter(), project_id=project_id,
+    )
+
+    assert results["copy/a.py"] == ("- summary of a.py", None, "a.py")
+    assert results["near.py"] == ("- summary of a.py", None, "a.py")
+    assert sqlite_storage.get_file_content(project_id, "copy/a.py") is None
+    assert sqlite_storage.get_file_content(project_id, "near.py") == near
+    copy_id = next(r["file_id"] for r in sqlite_storage.list_files(project_id, None, 10) if r["file_name"] == "copy/a.py")
+    assert database.get_project_file(project_id, copy_id).file_content == MODULE
+
+
+def test_search_finds_exact_duplicates_through_their_representative(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(llm_util, "DEDUP_ENABLED", True)
+    project_id = database.save_projects(Project(project_name="demo"))
+    blocks = [("a.py", MODULE), ("copy/a.py", MODULE), ("other.py", "unrelated = True\n" * 50)]
+    llm_util._summarize_and_save(ScriptedLLM(), blocks, "demo", limiter=RateLimiter(), project_id=project_id)
+
+    hits = database.search_project_files(project_id, "render").items
+
+    assert sorted(hit.file_name for hit in hits) == ["a.py", "copy/a.py"]
+    assert all("**render**" in hit.snippet for hit in hits)
+
+
+def test_like_fallback_finds_exact_duplicates_too(sqlite_storage, monkeypatch):
+    monkeypatch.setattr(llm_util, "DEDUP_ENABLED", True)
+    monkeypatch.setattr(sqlite_storage, "fts", False)
+    project_id = database.save_projects(Project(project_name="demo"))
+    blocks = [("a.py", MODULE), ("copy/a.py", MODULE)]
+    llm_util._summarize_and_save(ScriptedLLM(), blocks, "demo", limiter=RateLimiter(), project_id=project_id)
+
+    hits = database.search_project_files(project_id, "render").items
+
+    assert sorted(hit.file_name for hit in hits) == ["a.py", "copy/a.py"]
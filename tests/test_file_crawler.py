@@ -0,0 +1,41 @@
+import pytest
+
+from src.utility.file_crawler import read_code_file, sniff_file
+
+
+@pytest.mark.parametrize("name, text", [
+    ("api.pb.go", "// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n"),
+    ("api_pb2.py", "# -*- coding: utf-8 -*-\n# Generated by the protocol buffer compiler.  DO NOT EDIT!\nimport x\n"),
+    ("schema.ts", "/**\n * @generated SignedSource<<abc>>\n */\nexport type A = 1;\n"),
+    ("queries.sql", "-- Code generated by sqlc. DO NOT EDIT.\nSELECT 1;\n"),
+])
+def test_conventional_generator_headers_are_skipped(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+
+    assert sniff_file(path) == "generated"
+
+
+@pytest.mark.parametrize("name, text", [
+    ("settings.py", "# Do not edit these values by hand in production\nDEBUG = False\n"),
+    ("ids.py", "def next_id():\n    \"\"\"Return an auto-generated id.\"\"\"\n    return uuid4()\n"),
+    ("keys.py", "AUTOGENERATED_KEYS = True  # autogenerated keys are rotated nightly\n"),
+    ("codegen.go", 'package codegen\n\nconst header = "// Code generated by codegen. DO NOT EDIT."\n'),
+    ("models.java", "@Generated\npublic class Model {}\n"),
+])
+def test_mentions_of_generation_in_ordinary_code_are_kept(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+
+    assert sniff_file(path) is None
+
+
+def test_large_files_are_read_up_to_the_limit(tmp_path):
+    path = tmp_path / "big.py"
+    path.write_text("x = 'é'\n" * 1000, encoding="utf-8")
+
+    text = read_code_file(path, max_bytes=100)
+
+    assert len(text.encode("utf-8")) <= 100
+    assert text.startswith("x = 'é'\n")
+    assert read_code_file(path, max_bytes=None) == path.read_text(encoding="utf-8")
@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+from git import GitCommandError, Repo
+
+from src.utility.git import clone_repo, refresh_repo
+from src.utility.path import get_git_repo_path, get_mirror_path
+
+
+def commit(repo, files, message, delete=()):
+    root = Path(repo.working_tree_dir)
+    for name, text in files.items():
+        (root / name).write_text(text, encoding="utf-8")
+    if files:
+        repo.index.add(list(files))
+    if delete:
+        repo.index.remove(list(delete), working_tree=True)
+    repo.index.commit(message)
+
+
+def make_repo(path):
+    repo = Repo.init(path, initial_branch="main")
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", "Test")
+        cw.set_value("user", "email", "test@example.com")
+    return repo
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    repo = make_repo(tmp_path / "upstream")
+    commit(repo, {"app.py": "print('v1')\n", "util.py": "X = 1\n", "old.py": "pass\n"}, "v1")
+    repo.create_head("feature").checkout()
+    commit(repo, {"feature.py": "pass\n"}, "feature")
+    repo.heads.main.checkout()
+    return repo
+
+
+@pytest.fixture
+def upstream_url(upstream):
+    return Path(upstream.working_tree_dir).as_uri()
+
+
+def test_clone_checks_out_the_default_branch_through_a_single_branch_mirror(upstream_url):
+    clone_repo(upstream_url, "demo")
+
+    clone_dir = get_git_repo_path("demo")
+    assert (clone_dir / "app.py").read_text() == "print('v1')\n"
+    assert not (clone_dir / "feature.py").exists()
+    mirror = Repo(str(get_mirror_path(upstream_url)))
+    assert [ref.path for ref in mirror.refs] == ["refs/heads/main"]
+    assert Repo(str(clone_dir)).remotes.origin.url == get_mirror_path(upstream_url).as_uri()
+
+
+def test_clone_without_mirror_is_shallow(upstream, upstream_url):
+    commit(upstream, {"app.py": "print('v2')\n"}, "v2")
+
+    clone_repo(upstream_url, "demo", use_mirror=False)
+
+    clone = Repo(str(get_git_repo_path("demo")))
+    assert len(list(clone.iter_commits())) == 1
+    assert clone.remotes.origin.url == upstream_url
+
+
+def test_clone_errors_raise(tmp_path):
+    with pytest.raises(GitCommandError):
+        clone_repo((tmp_path / "missing").as_uri(), "demo")
+
+
+def test_refresh_clones_when_there_is_no_local_copy(upstream, upstream_url):
+    changes = refresh_repo(upstream_url, "demo")
+
+    assert changes.full
+    assert changes.new_head == upstream.head.commit.hexsha
+    assert (get_git_repo_path("demo") / "util.py").exists()
+
+
+def test_refresh_reports_changed_and_deleted_files(upstream, upstream_url):
+    clone_repo(upstream_url, "demo")
+    commit(upstream, {"app.py": "print('v2')\n", "new.py": "Y = 2\n"}, "v2", delete=["old.py"])
+
+    changes = refresh_repo(upstream_url, "demo")
+
+    assert not changes.full
+    assert changes.changed == {"app.py", "new.py"}
+    assert changes.deleted == {"old.py"}
+    assert changes.new_head == upstream.head.commit.hexsha
+    clone_dir = get_git_repo_path("demo")
+    assert (clone_dir / "app.py").read_text() == "print('v2')\n"
+    assert not (clone_dir / "old.py").exists()
+
+
+def test_refresh_without_upstream_changes_is_empty(upstream_url):
+    clone_repo(upstream_url, "demo")
+
+    changes = refresh_repo(upstream_url, "demo")
+
+    assert not changes.has_changes
+    assert changes.old_head == changes.new_head
+
+
+def test_refresh_recreates_a_clone_of_another_url(tmp_path, upstream_url):
+    other = make_repo(tmp_path / "other")
+    commit(other, {"other.py": "pass\n"}, "other")
+    clone_repo(Path(other.working_tree_dir).as_uri(), "demo")
+
+    changes = refresh_repo(upstream_url, "demo")
+
+    assert changes.full
+    clone_dir = get_git_repo_path("demo")
+    assert (clone_dir / "app.py").exists()
+    assert not (clone_dir / "other.py").exists()
+
+
+def test_refresh_replaces_leftovers_of_a_failed_clone(upstream_url):
+    clone_dir = get_git_repo_path("demo")
+    clone_dir.mkdir(parents=True)
+    (clone_dir / "partial").write_text("junk")
+
+    changes = refresh_repo(upstream_url, "demo")
+
+    assert changes.full
+    assert not (clone_dir / "partial").exists()
+    assert (clone_dir / "app.py").exists()
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "../..", "a/../.."])
+def test_names_outside_the_git_dir_are_refused_before_any_delete(output_root, upstream_url, name):
+    keep = output_root / "readme" / "other" / "readme.md"
+    keep.parent.mkdir(parents=True)
+    keep.write_text("kept")
+
+    with pytest.raises(ValueError, match="Invalid project name"):
+        refresh_repo(upstream_url, name)
+
+    assert keep.read_text() == "kept"
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from src.utility.jobs import JobConflict, JobManager
+
+
+def wait_finished(manager, job_id):
+    for _ in range(200):
+        status = manager.get(job_id)
+        if status.finished_at is not None:
+            return status
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.fixture
+def manager():
+    return JobManager(workers=4)
+
+
+def blocking(release):
+    return lambda job: release.wait(5) and None
+
+
+def test_second_job_for_a_running_project_is_refused(manager):
+    release = threading.Event()
+    first = manager.submit("demo", blocking(release))
+
+    with pytest.raises(JobConflict) as excinfo:
+        manager.submit("demo", lambda job: None, kind="refresh")
+
+    assert excinfo.value.job.job_id == first.job_id
+    assert manager.submit("other", lambda job: None).project_name == "other"
+    release.set()
+    wait_finished(manager, first.job_id)
+    assert manager.submit("demo", lambda job: None, kind="refresh").kind == "refresh"
+
+
+def test_a_failed_job_frees_its_project(manager):
+    def fail(job):
+        raise RuntimeError("boom")
+
+    first = manager.submit("demo", fail)
+    assert wait_finished(manager, first.job_id).status == "failed"
+
+    manager.submit("demo", lambda job: None)
+
+
+def test_batch_tracks_the_active_job_instead_of_starting_another(manager):
+    release = threading.Event()
+    running = manager.submit("demo", blocking(release))
+
+    batch = manager.submit_batch([("demo", lambda job: None), ("other", lambda job: None), ("other", lambda job: None)])
+
+    assert len(batch.job_ids) == 2
+    assert batch.job_ids[0] == running.job_id
+    release.set()
+
+
+def test_batch_finishes_even_after_some_of_its_jobs_are_trimmed():
+    manager = JobManager(workers=2, history_limit=3)
+    batch = manager.submit_batch([(f"p{i}", lambda job: None) for i in range(3)])
+    for job_id in batch.job_ids:
+        wait_finished(manager, job_id)
+
+    manager.submit("later", lambda job: None)   # pushes the oldest batch job out of the history
+
+    assert sum(manager.get(j) is None for j in batch.job_ids) == 1
+    assert manager.get_batch(batch.batch_id).finished_at is not None
+
+
+def test_jobs_of_a_running_batch_are_not_trimmed():
+    manager = JobManager(workers=4, history_limit=1)
+    release = threading.Event()
+    batch = manager.submit_batch([("fast", lambda job: None), ("slow", blocking(release))])
+    wait_finished(manager, batch.job_ids[0])
+
+    wait_finished(manager, manager.submit("other", lambda job: None).job_id)
+    manager.submit("another", lambda job: None)
+
+    assert manager.get(batch.job_ids[0]) is not None
+    release.set()
+    wait_finished(manager, batch.job_ids[1])
+    status = manager.get_batch(batch.batch_id)
+    assert status.jobs_succeeded == 2
+    assert status.finished_at is not None
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from src.utility import llm_util
+from src.utility.rate_limiter import RateLimiter
+
+from .conftest import ScriptedLLM
+
+# ~600 heuristic tokens each: above SMALL_FILE_TOKENS, so every file is its own request
+LARGE = "token " * 400
+
+
+def large_blocks(n):
+    return [(f"pkg/mod_{i}.py", f"# module {i}\n" + LARGE) for i in range(n)]
+
+
+def test_results_keep_block_order_when_requests_finish_out_of_order():
+    blocks = large_blocks(6)
+    # Earlier files are slower, so completion order is the reverse of block order
+    llm = ScriptedLLM(delays={path: 0.05 * (6 - i) for i, (path, _) in enumerate(blocks)})
+
+    results = llm_util.map_file_summaries(llm, blocks, max_concurrency=6, limiter=RateLimiter())
+
+    assert [r[0] for r in results] == [path for path, _ in blocks]
+    for path, code, summary, error in results:
+        assert error is None
+        assert summary == f"- summary of {path}"
+        assert code.startswith("# module")
+
+
+def test_requests_run_concurrently():
+    blocks = large_blocks(8)
+    llm = ScriptedLLM(delays={path: 0.2 for path, _ in blocks})
+
+    start = time.monotonic()
+    llm_util.map_file_summaries(llm, blocks, max_concurrency=8, limiter=RateLimiter())
+
+    assert time.monotonic() - start < 0.2 * 8 / 2
+
+
+def test_failure_is_reported_on_its_file_only():
+    blocks = large_blocks(4)
+    llm = ScriptedLLM(fail=["pkg/mod_2.py"])
+
+    results = llm_util.map_file_summaries(llm, blocks, max_concurrency=4, limiter=RateLimiter())
+
+    by_path = {path: (summary, error) for path, _, summary, error in results}
+    assert by_path["pkg/mod_2.py"][0] is None
+    assert "scripted failure" in by_path["pkg/mod_2.py"][1]
+    for path in ("pkg/mod_0.py", "pkg/mod_1.py", "pkg/mod_3.py"):
+        assert by_path[path] == (f"- summary of {path}", None)
+
+
+def test_failed_pack_falls_back_to_single_requests():
+    blocks = [(f"small_{i}.py", f"x = {i}\n") for i in range(3)]
+    llm = ScriptedLLM(fail=["small_1.py"])
+
+    results = llm_util.map_file_summaries(llm, blocks, max_concurrency=2, limiter=RateLimiter())
+
+    assert llm.requests[0] == ["small_0.py", "small_1.py", "small_2.py"]
+    assert sorted(llm.requests[1:]) == [["small_0.py"], ["small_1.py"], ["small_2.py"]]
+    assert [(r[0], r[2] is None, r[3] is None) for r in results] == [
+        ("small_0.py", False, True),
+        ("small_1.py", True, False),
+        ("small_2.py", False, True),
+    ]
+
+
+def test_progress_counts_every_file_once():
+    blocks = large_blocks(5)
+    seen = []
+    lock = threading.Lock()
+
+    def on_progress(done, total, path):
+        with lock:
+            seen.append((done, total, path))
+
+    llm_util.map_file_summaries(
+        ScriptedLLM(), blocks, max_concurrency=3, limiter=RateLimiter(), on_progress=on_progress,
+    )
+
+    assert seen[0] == (0, 5, None)
+    assert sorted(p for _, _, p in seen[1:]) == sorted(path for path, _ in blocks)
+    assert sorted(d for d, _, _ in seen[1:]) == [1, 2, 3, 4, 5]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src.utility import notebook
+from src.utility.file_crawler import read_code_file
+from src.utility.notebook import read_notebook
+
+NOTEBOOK = {
+    "nbformat": 4,
+    "metadata": {"kernelspec": {"name": "python3"}},
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Analysis\n", "Loads the data."]},
+        {
+            "cell_type": "code", "execution_count": 1, "metadata": {"tags": ["secret-tag"]},
+            "source": ["import pandas as pd\n", "df = pd.read_csv('x.csv')"],
+            "outputs": [
+                {"output_type": "stream", "name": "stdout", "text": ["printed output\n"]},
+                {"output_type": "display_data", "data": {"image/png": "iVBORw0KGgo" * 5000}, "metadata": {}},
+            ],
+        },
+        {"cell_type": "code", "execution_count": None, "metadata": {}, "source": "", "outputs": []},
+        {"cell_type": "raw", "metadata": {}, "source": "raw text"},
+        {"cell_type": "code", "execution_count": 2, "metadata": {}, "source": "df.head()", "outputs": [
+            {"output_type": "execute_result", "data": {"text/plain": ["   a  b"]}, "metadata": {}, "execution_count": 2},
+        ]},
+    ],
+}
+
+EXPECTED = (
+    "# %% [markdown]\n# # Analysis\n# Loads the data.\n\n"
+    "# %%\nimport pandas as pd\ndf = pd.read_csv('x.csv')\n\n"
+    "# %%\ndf.head()\n"
+)
+
+
+@pytest.fixture
+def nb_path(tmp_path):
+    path = tmp_path / "analysis.ipynb"
+    path.write_text(json.dumps(NOTEBOOK))
+    return path
+
+
+def test_outputs_and_metadata_are_stripped_while_streaming(nb_path, monkeypatch):
+    pytest.importorskip("ijson")
+    streamed = []
+    real = notebook._iter_cells_streaming
+    monkeypatch.setattr(notebook, "_iter_cells_streaming", lambda f, ijson: streamed.append(1) or real(f, ijson))
+
+    assert read_notebook(nb_path) == EXPECTED
+    assert streamed == [1]
+
+
+def test_json_fallback_gives_the_same_text(nb_path, monkeypatch):
+    monkeypatch.setattr(notebook, "_ijson", False)
+
+    assert read_notebook(nb_path) == EXPECTED
+
+
+def test_nbformat_3_notebooks_are_read(tmp_path):
+    path = tmp_path / "old.ipynb"
+    path.write_text(json.dumps({"nbformat": 3, "worksheets": [{"cells": [
+        {"cell_type": "code", "input": ["x = 1"], "outputs": [{"text": "1"}]},
+        {"cell_type": "markdown", "source": "Notes"},
+    ]}]}))
+
+    assert read_notebook(path) == "# %%\nx = 1\n\n# %% [markdown]\n# Notes\n"
+
+
+def test_crawler_reads_notebooks_as_cells_and_broken_ones_as_text(nb_path, tmp_path):
+    broken = tmp_path / "broken.ipynb"
+    broken.write_text('{"cells": [')
+
+    assert read_code_file(nb_path) == EXPECTED
+    assert read_code_file(broken) == '{"cells": ['
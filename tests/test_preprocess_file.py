@@ -0,0 +1,38 @@
+from src.utility.file_crawler import iter_code_blocks
+from src.utility.path import get_agg_file_path
+from src.utility.preprocess_file import parse_blocks
+
+FILES = {
+    "docs/index.md": "---\ntitle: Home\n---\n\n# Home\n\nIntro\n\n---\n\nFooter\n",
+    "config.yml": "a: 1\n---\nb: 2\n",
+    "notes.py": "# Path - not a header\nPath - also not one\nx = 1",
+    "empty.py": "",
+}
+
+
+def aggregate(tmp_path):
+    paths = []
+    for rel, text in FILES.items():
+        path = tmp_path / "repo" / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        paths.append((rel, path))
+    out = get_agg_file_path("demo")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    list(iter_code_blocks(paths, side_output=out))
+
+
+def test_separator_and_path_lines_inside_files_survive(tmp_path):
+    aggregate(tmp_path)
+
+    blocks = dict(parse_blocks("demo"))
+
+    assert blocks["docs/index.md"] == FILES["docs/index.md"].rstrip("\n")
+    assert blocks["config.yml"] == FILES["config.yml"].rstrip("\n")
+    assert blocks["notes.py"] == FILES["notes.py"]
+
+
+def test_blocks_keep_file_order_and_skip_empty_files(tmp_path):
+    aggregate(tmp_path)
+
+    assert [path for path, _ in parse_blocks("demo")] == ["docs/index.md", "config.yml", "notes.py"]
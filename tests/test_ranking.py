@@ -0,0 +1,58 @@
+from src.utility.ranking import rank_files, select_important_files
+
+# Equal padding keeps the size bonus out of the comparison
+PAD = "\n" + "#" * 200 + "\n"
+
+PY_REPO = {
+    "pkg/core.py": "VALUE = 1",
+    "pkg/a.py": "from pkg.core import VALUE",
+    "pkg/b.py": "from .core import VALUE",
+    "pkg/c.py": "import pkg.core",
+    "pkg/d.py": "from pkg import core",
+    "pkg/leaf.py": "x = 1",
+    "tests/test_core.py": "from pkg.core import VALUE\nfrom pkg.a import VALUE as A",
+}
+
+
+def make_repo(tmp_path, files):
+    out = []
+    for rel, text in sorted(files.items()):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text + PAD)
+        out.append((rel, path))
+    return out
+
+
+def test_most_imported_module_ranks_first(tmp_path):
+    ranked = [rel for rel, _ in rank_files(make_repo(tmp_path, PY_REPO))]
+
+    assert ranked[0] == "pkg/core.py"
+    assert ranked.index("pkg/a.py") < ranked.index("pkg/leaf.py")
+    assert ranked[-1] == "tests/test_core.py"
+
+
+def test_cap_keeps_the_top_files_in_path_order(tmp_path):
+    files = make_repo(tmp_path, dict(PY_REPO, **{"main.py": "from pkg.a import VALUE\nif __name__ == '__main__':\n    pass"}))
+
+    kept = select_important_files(files, 3)
+
+    assert [rel for rel, _ in kept] == ["main.py", "pkg/a.py", "pkg/core.py"]
+
+
+def test_no_cap_keeps_every_file_unranked(tmp_path):
+    files = make_repo(tmp_path, PY_REPO)
+
+    assert select_important_files(files, None) == files
+    assert select_important_files(files, len(files)) == files
+
+
+def test_relative_js_imports_form_edges(tmp_path):
+    files = make_repo(tmp_path, {
+        "web/lib/api.ts": "export const get = 1",
+        "web/pages/home.tsx": "import { get } from '../lib/api'",
+        "web/pages/about.tsx": "import { get } from '../lib/api'\nimport React from 'react'",
+        "web/util.js": "const x = 1",
+    })
+
+    assert rank_files(files)[0][0] == "web/lib/api.ts"
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from src.utility.rate_limiter import FairScheduler, RateLimiter
+
+
+def test_requests_per_minute_blocks_until_the_window_slides():
+    limiter = RateLimiter(requests_per_minute=2, window_seconds=0.3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.3
+
+
+def test_tokens_per_minute_blocks_until_tokens_expire():
+    limiter = RateLimiter(tokens_per_minute=100, window_seconds=0.3)
+
+    start = time.monotonic()
+    limiter.acquire(60)
+    limiter.acquire(30)
+    assert time.monotonic() - start < 0.1
+    limiter.acquire(30)
+
+    assert time.monotonic() - start >= 0.3
+
+
+def test_call_larger_than_the_budget_is_let_through_alone():
+    limiter = RateLimiter(tokens_per_minute=100, window_seconds=0.2)
+
+    start = time.monotonic()
+    limiter.acquire(500)
+    assert time.monotonic() - start < 0.1
+    limiter.acquire(1)
+
+    assert time.monotonic() - start >= 0.2
+
+
+def test_no_limits_never_blocks():
+    limiter = RateLimiter()
+
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire(10_000)
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_fair_scheduler_serves_tenants_round_robin():
+    limiter = RateLimiter(requests_per_minute=1, window_seconds=0.05)
+    scheduler = FairScheduler(limiter)
+    limiter.acquire()   # saturate the budget so every caller queues
+    order = []
+    lock = threading.Lock()
+
+    def worker(tenant):
+        scheduler.acquire(tenant=tenant)
+        with lock:
+            order.append(tenant)
+
+    threads = [threading.Thread(target=worker, args=("big",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.02)   # the monorepo queues first
+    small = threading.Thread(target=worker, args=("small",))
+    small.start()
+    for t in threads + [small]:
+        t.join(timeout=5)
+
+    # The later tenant is served after one request of the earlier one, not after all four
+    assert order.index("small") <= 1
+    assert order.count("big") == 4
+
+
+def test_fair_scheduler_stats_count_grants_per_tenant():
+    scheduler = FairScheduler(RateLimiter(requests_per_minute=100))
+
+    scheduler.acquire(10, tenant="a")
+    scheduler.acquire(5, tenant="a")
+    scheduler.acquire(7, tenant="b")
+
+    stats = scheduler.stats()
+    assert stats["granted"] == {"a": {"requests": 2, "tokens": 15}, "b": {"requests": 1, "tokens": 7}}
+    assert stats["waiting"] == {}
+    assert stats["requests_per_minute"] == 100
@@ -0,0 +1,72 @@
+import re
+import threading
+from typing import Any, List, Optional, Tuple
+
+from langchain_core.language_models.llms import LLM
+from pydantic import PrivateAttr
+
+from src.utility import llm_util
+from src.utility.rate_limiter import RateLimiter
+from src.utility.token_budget import count_tokens
+
+_PROMPT = re.compile(r"under `(.*?)`\.\n\n(.*)\n\nWrite a concise summary", re.DOTALL)
+
+
+class ReduceLLM(LLM):
+    """Records (scope, summaries) of every directory prompt and answers with `answer`."""
+
+    answer: str = "- reduced"
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _prompts: List[Tuple[str, str]] = PrivateAttr(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "reduce"
+
+    @property
+    def prompts(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._prompts)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        m = _PROMPT.search(prompt)
+        with self._lock:
+            self._prompts.append((m.group(1), m.group(2)))
+        return self.answer
+
+
+def section(path, words=50):
+    return path, f"### {path}\n" + "word " * words
+
+
+def test_reduce_prompts_stay_within_the_budget():
+    sections = [section(f"pkg/sub{i}/mod{j}.py") for i in range(4) for j in range(5)]
+    llm = ReduceLLM()
+
+    out = llm_util.reduce_file_summaries(llm, sections, budget=200, limiter=RateLimiter())
+
+    assert llm.prompts
+    assert all(count_tokens(summaries) <= 200 for _, summaries in llm.prompts)
+    assert count_tokens(out) <= 200
+
+
+def test_deepest_directories_are_reduced_first():
+    sections = [section("a/b/x.py"), section("a/b/y.py"), section("a/z.py"), section("top.py", 100)]
+    llm = ReduceLLM()
+
+    llm_util.reduce_file_summaries(llm, sections, budget=150, limiter=RateLimiter())
+
+    scopes = [scope for scope, _ in llm.prompts]
+    assert scopes[0] == "a/b"
+    assert scopes.index("a/b") < scopes.index("a")
+    first = llm.prompts[0][1]
+    assert "### a/b/x.py" in first and "### a/b/y.py" in first and "a/z.py" not in first
+
+
+def test_an_oversized_summary_still_terminates():
+    llm = ReduceLLM(answer="word " * 1000)   # every reduction comes back larger than the budget
+
+    out = llm_util.reduce_file_summaries(llm, [section("a/x.py", 500)], budget=50, limiter=RateLimiter())
+
+    assert count_tokens(out) <= 50
+    assert len(llm.prompts) <= 2
@@ -0,0 +1,68 @@
+import pytest
+
+from src.utility import llm_util
+from src.utility.git import RepoChanges
+from src.utility.path import get_git_repo_path
+from src.utility.supabase import database
+from src.utility.supabase.models import Project
+
+from .conftest import ScriptedLLM
+
+
+def write(repo, name, body):
+    (repo / name).write_text(f"def {body}():\n    return 1\n")
+
+
+@pytest.fixture
+def project(sqlite_storage, monkeypatch):
+    repo = get_git_repo_path("demo")
+    repo.mkdir(parents=True)
+    for name in ("a.py", "b.py", "c.py"):
+        write(repo, name, name[0])
+    project_id = database.save_projects(Project(project_name="demo"))
+    monkeypatch.setattr(llm_util, "get_llm_model", lambda: ScriptedLLM())
+    llm_util.generate_readme_file("demo", project_id=project_id)
+    return repo, project_id
+
+
+def use_llm(monkeypatch):
+    llm = ScriptedLLM(answer="# Updated README")
+    monkeypatch.setattr(llm_util, "get_llm_model", lambda: llm)
+    return llm
+
+
+def stored_files(sqlite_storage, project_id):
+    return sorted(row["file_name"] for row in sqlite_storage.list_files(project_id, None, 100))
+
+
+def test_only_changed_files_are_summarized_again(project, sqlite_storage, monkeypatch):
+    repo, project_id = project
+    write(repo, "b.py", "b_changed")
+    (repo / "c.py").unlink()
+    llm = use_llm(monkeypatch)
+
+    readme = llm_util.refresh_readme_file("demo", RepoChanges(changed={"b.py"}, deleted={"c.py"}), project_id)
+
+    assert {p for request in llm.requests for p in request} == {"b.py"}
+    assert stored_files(sqlite_storage, project_id) == ["a.py", "b.py"]
+    assert database.get_readme(project_id) == "# Updated README"
+    assert open(readme, encoding="utf-8").read() == "# Updated README"
+
+
+def test_no_changes_skips_compose(project, sqlite_storage, monkeypatch):
+    _, project_id = project
+    llm = use_llm(monkeypatch)
+
+    assert llm_util.refresh_readme_file("demo", RepoChanges(), project_id) is None
+    assert llm.requests == []
+    assert database.get_readme(project_id) == "# README"
+
+
+def test_non_code_changes_keep_the_readme(project, sqlite_storage, monkeypatch):
+    repo, project_id = project
+    (repo / "notes.txt").write_text("just notes\n")
+    llm = use_llm(monkeypatch)
+
+    assert llm_util.refresh_readme_file("demo", RepoChanges(changed={"notes.txt"}), project_id) is None
+    assert llm.requests == []
+    assert stored_files(sqlite_storage, project_id) == ["a.py", "b.py", "c.py"]
@@ -0,0 +1,94 @@
+import sys
+import types
+
+import pytest
+
+from src.utility import response_cache as rc
+from src.utility.supabase.models import ProjectFilePage, ProjectFileSummary
+
+
+class FakeRedisError(Exception):
+    pass
+
+
+class FakeRedis:
+    def __init__(self, up=True):
+        self.up = up
+        self.data = {}
+
+    def _check(self):
+        if not self.up:
+            raise FakeRedisError("connection refused")
+
+    def ping(self):
+        self._check()
+        return True
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def incr(self, key):
+        self._check()
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    module = types.ModuleType("redis")
+    module.RedisError = FakeRedisError
+    module.Redis = types.SimpleNamespace(from_url=lambda url: client)
+    monkeypatch.setitem(sys.modules, "redis", module)
+    return client
+
+
+def _page():
+    return ProjectFilePage(items=[ProjectFileSummary(file_id="1", file_name="a.py", file_summary="s")], next_cursor="x")
+
+
+def test_models_round_trip_through_json(fake_redis):
+    cache = rc.ResponseCache(rc.RedisBackend("redis://cache"))
+    loads = []
+    load = lambda: loads.append(1) or _page()
+
+    first = cache.get_or_load("project:p", "files", load, model=ProjectFilePage)
+    second = cache.get_or_load("project:p", "files", load, model=ProjectFilePage)
+
+    assert len(loads) == 1
+    assert second == first and isinstance(second, ProjectFilePage)
+    assert all(not raw.startswith(b"\x80") for raw in fake_redis.data.values())  # no pickles
+
+
+def test_unreachable_redis_falls_back_to_memory(fake_redis, monkeypatch):
+    fake_redis.up = False
+    monkeypatch.setenv("RESPONSE_CACHE_URL", "redis://cache")
+
+    assert isinstance(rc._build_backend(), rc.MemoryBackend)
+
+
+def test_redis_outage_degrades_to_misses(fake_redis):
+    cache = rc.ResponseCache(rc.RedisBackend("redis://cache"))
+    fake_redis.up = False
+    loads = []
+
+    for _ in range(2):
+        assert cache.get_or_load("projects", "list", lambda: loads.append(1) or ["p"]) == ["p"]
+    cache.invalidate("projects")
+
+    assert len(loads) == 2
+    assert cache.stats()["projects"]["misses"] == 2
+
+
+def test_backend_is_built_on_first_use():
+    built = []
+    cache = rc.ResponseCache(backend_factory=lambda: built.append(1) or rc.MemoryBackend())
+
+    assert built == []
+    cache.get_or_load("projects", "list", lambda: [])
+    cache.get_or_load("projects", "list", lambda: [])
+    assert built == [1]
@@ -0,0 +1,135 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.request import RepoRequest
+from src.utility import llm_util, pipeline, retry
+from src.utility.checkpoint import read_state
+from src.utility.jobs import JobManager
+from src.utility.path import get_git_repo_path
+from src.utility.retry import CircuitBreaker, call_with_retry
+
+from .conftest import ScriptedLLM
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code=429, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(retry.time, "sleep", slept.append)
+    return slept
+
+
+def flaky(failures, error=ProviderError):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error()
+        return "ok"
+    return fn, calls
+
+
+def test_retryable_errors_are_retried_until_success(sleeps):
+    fn, calls = flaky(2)
+
+    assert call_with_retry(fn, max_retries=5, breaker=CircuitBreaker(failures=10)) == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_retries_stop_at_the_limit(sleeps):
+    fn, calls = flaky(10)
+
+    with pytest.raises(ProviderError):
+        call_with_retry(fn, max_retries=2, breaker=CircuitBreaker(failures=10))
+    assert len(calls) == 3
+
+
+def test_other_errors_are_not_retried(sleeps):
+    fn, calls = flaky(1, error=lambda: ProviderError(status_code=400))
+
+    with pytest.raises(ProviderError):
+        call_with_retry(fn, breaker=CircuitBreaker(failures=10))
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_retry_after_sets_the_minimum_wait(sleeps, monkeypatch):
+    monkeypatch.setattr(retry.random, "uniform", lambda a, b: a)
+    fn, _ = flaky(1, error=lambda: ProviderError(headers={"retry-after": "7"}))
+
+    call_with_retry(fn, breaker=CircuitBreaker(failures=10))
+
+    assert sleeps == [7.0]
+
+
+def test_breaker_opens_then_half_opens_then_closes():
+    breaker = CircuitBreaker(failures=2, cooldown=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    breaker.wait()   # the trial call goes through
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["times_opened"] == 1
+
+
+def test_failed_trial_reopens_with_a_longer_cooldown():
+    breaker = CircuitBreaker(failures=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.wait()
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.stats()["cooldown_seconds"] == pytest.approx(0.1)
+
+
+def run_job(body):
+    manager = JobManager(workers=1)
+    job = manager.submit(body.project_name, lambda job: pipeline.resume_project(job, body))
+    for _ in range(500):
+        status = manager.get(job.job_id)
+        if status.finished_at is not None:
+            return status
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_resume_skips_files_recorded_in_the_checkpoint(sqlite_storage, monkeypatch):
+    repo = get_git_repo_path("demo")
+    repo.mkdir(parents=True)
+    for name in ("a.py", "b.py", "c.py"):
+        (repo / name).write_text(f"def {name[0]}():\n    return 1\n")
+    body = RepoRequest(git_url="https://example.com/demo.git", project_name="demo")
+
+    # First run: b.py fails and the README step dies, so the run is interrupted
+    first = ScriptedLLM(fail=["b.py"], fail_compose=True)
+    monkeypatch.setattr(llm_util, "get_llm_model", lambda: first)
+    assert run_job(body).status == "failed"
+    assert read_state("demo")["status"] == "interrupted"
+
+    second = ScriptedLLM()
+    monkeypatch.setattr(llm_util, "get_llm_model", lambda: second)
+    status = run_job(body)
+
+    assert status.status == "succeeded", status.error
+    assert status.result["resumed_files"] == 2
+    summarized = {p for request in second.requests for p in request}
+    assert summarized == {"b.py"}
+    assert read_state("demo") is None
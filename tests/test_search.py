@@ -0,0 +1,73 @@
+import pytest
+
+from src.utility.supabase import database
+from src.utility.supabase.models import Project, ProjectFile
+
+
+@pytest.fixture
+def project_id(sqlite_storage):
+    if not sqlite_storage.fts:
+        pytest.skip("SQLite build without FTS5")
+    project_id = database.save_projects(Project(project_name="demo"))
+    database.save_files_data("demo", [
+        ProjectFile(file_name="billing/invoice.py", file_summary="Builds PDFs.", file_content="def render(): pass"),
+        ProjectFile(file_name="api/routes.py", file_summary="HTTP routes; creates an invoice per order.",
+                    file_content="router = Router()"),
+        ProjectFile(file_name="jobs/nightly.py", file_summary="Nightly jobs.",
+                    file_content="def run():\n    send(invoice_totals())"),
+        ProjectFile(file_name="docs/readme.py", file_summary="Unrelated notes.", file_content="x = 1"),
+    ], project_id=project_id)
+    return project_id
+
+
+def names(page):
+    return [hit.file_name for hit in page.items]
+
+
+def test_name_matches_outrank_summary_and_content_matches(project_id):
+    page = database.search_project_files(project_id, "invoice")
+
+    assert names(page) == ["billing/invoice.py", "api/routes.py", "jobs/nightly.py"]
+    scores = [hit.score for hit in page.items]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+
+
+def test_terms_match_as_prefixes_and_all_must_match(project_id):
+    assert names(database.search_project_files(project_id, "nigh")) == ["jobs/nightly.py"]
+    assert names(database.search_project_files(project_id, "invoice routes")) == ["api/routes.py"]
+    assert names(database.search_project_files(project_id, "invoice missingword")) == []
+
+
+def test_snippets_highlight_the_matched_terms(project_id):
+    hit = database.search_project_files(project_id, "order").items[0]
+
+    assert hit.file_name == "api/routes.py"
+    assert "**order**" in hit.snippet
+
+
+def test_offset_pages_cover_every_hit_once(project_id):
+    full = names(database.search_project_files(project_id, "invoice"))
+
+    seen, offset, pages = [], 0, 0
+    while offset is not None:
+        page = database.search_project_files(project_id, "invoice", offset=offset, limit=2)
+        seen += names(page)
+        offset = page.next_offset
+        pages += 1
+
+    assert pages == 2
+    assert seen == full
+
+
+def test_search_is_scoped_to_the_project(project_id):
+    other = database.save_projects(Project(project_name="other"))
+    database.save_files_data("other", [
+        ProjectFile(file_name="invoice.py", file_summary="Other invoice.", file_content="pass"),
+    ], project_id=other)
+
+    assert "invoice.py" not in names(database.search_project_files(project_id, "invoice"))
+    assert names(database.search_project_files(other, "invoice")) == ["invoice.py"]
+
+
+def test_fts_syntax_in_queries_is_treated_as_text(project_id):
+    assert names(database.search_project_files(project_id, '"nightly*" (')) == ["jobs/nightly.py"]
@@ -0,0 +1,85 @@
+from src.utility import llm_util
+from src.utility.skeleton import extract_skeleton
+
+BODY = "\n".join(f"    total += {i} * value" for i in range(30))
+
+PY_MODULE = f'''"""Billing helpers."""
+import os
+from typing import List
+
+RATE = 0.2
+
+
+class Invoice:
+    """One customer invoice."""
+    currency: str = "EUR"
+
+    def total(self, lines: List[int]) -> int:
+        """Sum of the invoice lines."""
+        total = 0
+{BODY.replace("    ", "        ")}
+        return total
+
+
+async def send(invoice: Invoice, to: str) -> None:
+    total = 0
+{BODY}
+    os.system(to)
+
+
+if __name__ == "__main__":
+    send(Invoice(), "me")
+'''
+
+TS_MODULE = "\n".join([
+    "import { db } from './db'",
+    "/** Load a user. */",
+    "export async function getUser(id: string): Promise<User> {",
+    *[f"  const row{i} = await db.query({i})" for i in range(30)],
+    "  return row0",
+    "}",
+    "router.get('/users/:id', handler)",
+])
+
+
+def test_python_skeleton_keeps_signatures_and_drops_bodies():
+    skeleton = extract_skeleton("billing.py", PY_MODULE)
+
+    for kept in ('"""Billing helpers."""', "import os", "RATE = 0.2", "class Invoice:", "currency: str = 'EUR'",
+                 "def total(self, lines: List[int]) -> int:", "Sum of the invoice lines.",
+                 "async def send(invoice: Invoice, to: str) -> None:", "if __name__ == '__main__':"):
+        assert kept in skeleton
+    assert "total += 1 * value" not in skeleton
+    assert "os.system" not in skeleton
+    assert len(skeleton) < len(PY_MODULE)
+
+
+def test_brace_skeleton_keeps_declarations_and_routes():
+    skeleton = extract_skeleton("users.ts", TS_MODULE)
+
+    assert skeleton.splitlines() == [
+        "import { db } from './db'",
+        "/** Load a user. */",
+        "export async function getUser(id: string): Promise<User> {",
+        "  ...",
+        "router.get('/users/:id', handler)",
+    ]
+
+
+def test_unparseable_python_has_no_skeleton():
+    assert extract_skeleton("broken.py", "def broken(:\n" + BODY) is None
+
+
+def test_unsupported_languages_have_no_skeleton():
+    assert extract_skeleton("notes.rb", "def x\n  1\nend\n" * 50) is None
+
+
+def test_summary_falls_back_to_the_code_on_a_syntax_error(monkeypatch):
+    monkeypatch.setattr(llm_util, "SKELETON_ENABLED", True)
+    broken = "def broken(:\n" + BODY
+
+    assert llm_util._summary_view("broken.py", broken, llm_util.SKELETON_MIN_TOKENS + 1) == broken
+    assert llm_util._summary_view("billing.py", PY_MODULE, llm_util.SKELETON_MIN_TOKENS + 1) == (
+        extract_skeleton("billing.py", PY_MODULE)
+    )
+    assert llm_util._summary_view("billing.py", PY_MODULE, llm_util.SKELETON_MIN_TOKENS) == PY_MODULE
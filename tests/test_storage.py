@@ -0,0 +1,150 @@
+import threading
+
+import pytest
+
+from src.utility.config import PROJECT_FILES_TABLE
+from src.utility.supabase import database
+from src.utility.supabase.models import Project, ProjectFile
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeUpsert:
+    def __init__(self, client, table, records, on_conflict):
+        self.client, self.table, self.records, self.on_conflict = client, table, records, on_conflict
+
+    def execute(self):
+        with self.client.lock:
+            self.client.upserts.append((self.table, list(self.records), self.on_conflict))
+        if any(r["file_name"] in self.client.fail_on for r in self.records):
+            raise RuntimeError("write rejected")
+        return FakeResponse(self.records)
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+
+    def upsert(self, records, on_conflict=None):
+        return FakeUpsert(self.client, self.name, records, on_conflict)
+
+
+class FakeSupabase:
+    """Records upsert requests the way the Supabase client would send them."""
+
+    def __init__(self, fail_on=()):
+        self.lock = threading.Lock()
+        self.upserts = []
+        self.fail_on = set(fail_on)
+
+    def table(self, name):
+        return FakeTable(self, name)
+
+
+def files(n, size=10):
+    return [ProjectFile(file_name=f"f{i:03d}.py", file_content="x" * size, file_summary=f"s{i}") for i in range(n)]
+
+
+@pytest.fixture
+def fake_client():
+    client = FakeSupabase()
+    database.set_client(client)
+    yield client
+    database.set_storage(None)
+
+
+def test_upserts_are_split_by_row_count(fake_client):
+    database.save_files_data("demo", files(25), project_id="p1", max_rows=10, concurrency=1)
+
+    assert [len(records) for _, records, _ in fake_client.upserts] == [10, 10, 5]
+    table, records, on_conflict = fake_client.upserts[0]
+    assert table == PROJECT_FILES_TABLE
+    assert on_conflict == "project_id,file_name"
+    assert records[0] == {
+        "project_id": "p1", "file_name": "f000.py", "file_content": "x" * 10,
+        "file_summary": "s0", "duplicate_of": None,
+    }
+
+
+def test_upserts_are_split_by_payload_size(fake_client):
+    # Each row is 1,000 content bytes plus a 6-byte file name and 2-byte summary
+    database.save_files_data("demo", files(10, size=1000), project_id="p1", max_bytes=3100, concurrency=1)
+
+    assert [len(records) for _, records, _ in fake_client.upserts] == [3, 3, 3, 1]
+
+
+def test_concurrent_chunks_write_every_row_once(fake_client):
+    database.save_files_data("demo", files(100), project_id="p1", max_rows=7, concurrency=4)
+
+    names = [r["file_name"] for _, records, _ in fake_client.upserts for r in records]
+    assert sorted(names) == [f"f{i:03d}.py" for i in range(100)]
+    assert len(fake_client.upserts) == 15
+
+
+def test_a_failed_chunk_raises():
+    database.set_client(FakeSupabase(fail_on={"f042.py"}))
+    try:
+        with pytest.raises(RuntimeError, match="write rejected"):
+            database.save_files_data("demo", files(100), project_id="p1", max_rows=10, concurrency=4)
+    finally:
+        database.set_storage(None)
+
+
+def test_sqlite_upsert_replaces_rows_on_file_name(sqlite_storage):
+    project_id = database.save_projects(Project(project_name="demo"))
+    database.save_files_data("demo", files(30), project_id=project_id, max_rows=8)
+    updated = [ProjectFile(file_name="f005.py", file_content="new", file_summary="changed")]
+    database.save_files_data("demo", updated, project_id=project_id)
+
+    summaries = database.get_file_summaries("demo")
+    assert len(summaries) == 30
+    assert summaries["f005.py"] == "changed"
+    assert database.save_projects(Project(project_name="demo")) == project_id
+
+
+def test_cursor_pagination_walks_every_file_once(sqlite_storage):
+    project_id = database.save_projects(Project(project_name="demo"))
+    database.save_files_data("demo", files(23), project_id=project_id)
+
+    names, cursor, pages = [], None, 0
+    while True:
+        page = database.list_project_files(project_id, cursor=cursor, limit=10)
+        names += [item.file_name for item in page.items]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == [f"f{i:03d}.py" for i in range(23)]
+
+
+def test_last_full_page_has_no_next_cursor(sqlite_storage):
+    project_id = database.save_projects(Project(project_name="demo"))
+    database.save_files_data("demo", files(10), project_id=project_id)
+
+    page = database.list_project_files(project_id, limit=10)
+
+    assert len(page.items) == 10
+    assert page.next_cursor is None
+
+
+def test_writes_invalidate_cached_pages(sqlite_storage):
+    project_id = database.save_projects(Project(project_name="demo"))
+    database.save_files_data("demo", files(3), project_id=project_id)
+    assert len(database.list_project_files(project_id).items) == 3
+
+    database.save_files_data("demo", [ProjectFile(file_name="z.py", file_summary="z")], project_id=project_id)
+
+    assert [i.file_name for i in database.list_project_files(project_id).items][-1] == "z.py"
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "é", "_w"])
+def test_malformed_cursor_is_rejected(sqlite_storage, cursor):
+    project_id = database.save_projects(Project(project_name="demo"))
+
+    with pytest.raises(ValueError):
+        database.list_project_files(project_id, cursor=cursor)
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.utility.workspace import KEPT_AREAS, WorkspaceManager
+
+KB = 1000
+
+
+def fill(path, size=KB):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "data.bin").write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "workspace"
+    # Least recently used first: a, mirrors/m, b, c
+    for name in ("a", "b", "c"):
+        fill(root / "git" / name)
+    fill(root / "mirrors" / "m")
+    for area in KEPT_AREAS:
+        fill(root / area / "a", 100)
+    (root / "workspace.json").write_text(json.dumps({"a": 1.0, "mirrors/m": 2.0, "b": 3.0, "c": 4.0}))
+    return root
+
+
+def test_least_recently_used_clones_go_first(root):
+    manager = WorkspaceManager(root, max_bytes=3500, target_ratio=0.7)
+
+    manager.reclaim()
+
+    assert not (root / "git" / "a").exists()
+    assert not (root / "mirrors" / "m").exists()
+    assert (root / "git" / "b").exists() and (root / "git" / "c").exists()
+
+
+def test_usage_drops_to_the_target_ratio(root):
+    manager = WorkspaceManager(root, max_bytes=3500, target_ratio=0.7)
+
+    freed = manager.reclaim()
+
+    assert freed == 2 * KB
+    assert manager.scan() <= 3500 * 0.7
+    assert manager.stats()["evictions"] == 2
+
+
+def test_nothing_is_evicted_under_quota(root):
+    manager = WorkspaceManager(root, max_bytes=10 * KB)
+
+    assert manager.reclaim() == 0
+    assert (root / "git" / "a").exists()
+
+
+def test_kept_areas_survive_eviction(root):
+    manager = WorkspaceManager(root, max_bytes=3500, target_ratio=0.7)
+
+    manager.reclaim()
+
+    for area in KEPT_AREAS:
+        assert (root / area / "a" / "data.bin").exists()
+
+
+def test_leased_projects_and_their_mirrors_are_skipped(root):
+    manager = WorkspaceManager(root, max_bytes=3500, target_ratio=0.7)
+
+    with manager.lease("a"):
+        manager.use_mirror(root / "mirrors" / "m")
+        manager.reclaim()
+
+    assert (root / "git" / "a").exists()
+    assert (root / "mirrors" / "m").exists()
+    assert not (root / "git" / "b").exists()
+    assert not (root / "git" / "c").exists()
+
+
+def test_mirror_is_released_with_the_lease(root):
+    manager = WorkspaceManager(root, max_bytes=3500, target_ratio=0.7)
+    with manager.lease("c"):
+        manager.use_mirror(root / "mirrors" / "m")
+        manager.reclaim()
+        assert (root / "mirrors" / "m").exists()
+
+    fill(root / "git" / "d", 2 * KB)
+    manager.reclaim()
+
+    assert not (root / "mirrors" / "m").exists()